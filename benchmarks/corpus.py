@@ -0,0 +1,181 @@
+import json
+import os
+import random
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from pydantic import BaseModel
+
+# Realistic building blocks, so retrieval and the lexicon see plausible names
+TABLE_STEMS = [
+    "users", "customers", "accounts", "members", "employees", "authors", "contacts",
+    "orders", "order_items", "invoices", "payments", "products", "categories", "inventory",
+    "posts", "comments", "articles", "pages", "events", "bookings", "reservations",
+    "flights", "hotels", "reviews", "organizations", "addresses", "messages", "sessions",
+]
+CLASS_STEMS = [
+    "Person", "Organization", "Order", "Invoice", "Product", "Offer", "BlogPosting", "Comment",
+    "Article", "WebPage", "Event", "Reservation", "Flight", "Hotel", "Review", "PostalAddress",
+    "Message", "Place", "CreativeWork", "Action", "PaymentMethod", "ContactPoint",
+]
+TABLE_PREFIXES = ["", "", "app_", "tbl_", "legacy_", "core_", "shop_", "cms_"]
+COLUMN_POOL: List[Tuple[str, str]] = [
+    ("email", "text"), ("first_name", "text"), ("last_name", "text"), ("full_name", "text"),
+    ("phone", "text"), ("birth_date", "date"), ("title", "text"), ("body", "longtext"),
+    ("description", "longtext"), ("price", "decimal"), ("sku", "text"), ("name", "text"),
+    ("url", "text"), ("status", "text"), ("quantity", "int"), ("total_amount", "decimal"),
+    ("currency", "text"), ("street_address", "text"), ("city", "text"), ("postal_code", "text"),
+    ("country", "text"), ("start_date", "timestamp"), ("end_date", "timestamp"),
+    ("rating", "int"), ("slug", "text"), ("is_active", "bool"), ("user_id", "int"),
+    ("product_id", "int"), ("author_id", "int"), ("created_at", "timestamp"),
+    ("updated_at", "timestamp"), ("deleted_at", "timestamp"), ("ip_address", "text"),
+    ("latitude", "decimal"), ("longitude", "decimal"), ("notes", "longtext"),
+]
+
+# Per-dialect type names, identifier quoting, key syntax and table options
+DIALECTS: Dict[str, Dict[str, Any]] = {
+    "postgres": {
+        "quote": '"{}"', "pk": "id SERIAL PRIMARY KEY", "suffix": "",
+        "types": {"text": "VARCHAR(255)", "longtext": "TEXT", "int": "INTEGER", "decimal": "NUMERIC(10,2)",
+                  "date": "DATE", "timestamp": "TIMESTAMP WITH TIME ZONE", "bool": "BOOLEAN"},
+    },
+    "mysql": {
+        "quote": "`{}`", "pk": "`id` INT UNSIGNED NOT NULL AUTO_INCREMENT", "suffix": " ENGINE=InnoDB DEFAULT CHARSET=utf8mb4",
+        "types": {"text": "VARCHAR(255)", "longtext": "LONGTEXT", "int": "INT(11)", "decimal": "DECIMAL(10,2)",
+                  "date": "DATE", "timestamp": "DATETIME", "bool": "TINYINT(1)"},
+        "pk_constraint": "PRIMARY KEY (`id`)",
+    },
+    "sqlite": {
+        "quote": "{}", "pk": "id INTEGER PRIMARY KEY AUTOINCREMENT", "suffix": "",
+        "types": {"text": "TEXT", "longtext": "TEXT", "int": "INTEGER", "decimal": "REAL",
+                  "date": "TEXT", "timestamp": "TEXT", "bool": "INTEGER"},
+    },
+    "mssql": {
+        "quote": "[{}]", "pk": "[id] INT IDENTITY(1,1) PRIMARY KEY", "suffix": "",
+        "types": {"text": "NVARCHAR(255)", "longtext": "NVARCHAR(MAX)", "int": "INT", "decimal": "DECIMAL(10,2)",
+                  "date": "DATE", "timestamp": "DATETIME2", "bool": "BIT"},
+    },
+}
+
+
+class CorpusConfig(BaseModel):
+    """Shape of a synthetic corpus. The same config and seed always produce the same files."""
+    repos: int = 4
+    files_per_repo: int = 3
+    tables_per_file: int = 8
+    min_columns: int = 4
+    max_columns: int = 14
+    dialects: List[str] = list(DIALECTS)
+    dump_rows: int = 0               # INSERT rows per table, to mimic data dumps
+    ontology_classes: int = 300      # Synthetic Schema.org graph size
+    ontology_properties: int = 900
+    seed: int = 42
+
+
+PRESETS: Dict[str, CorpusConfig] = {
+    "tiny": CorpusConfig(repos=1, files_per_repo=2, tables_per_file=4, ontology_classes=40, ontology_properties=120),
+    "small": CorpusConfig(),
+    "medium": CorpusConfig(repos=20, files_per_repo=5, tables_per_file=12, dump_rows=20,
+                           ontology_classes=800, ontology_properties=1500),
+    "large": CorpusConfig(repos=100, files_per_repo=8, tables_per_file=15, dump_rows=200,
+                          ontology_classes=1500, ontology_properties=3000),
+}
+
+
+class CorpusManifest(BaseModel):
+    root: str
+    repos: List[str]
+    files: int
+    tables: int
+    columns: int
+    bytes: int
+    schema_graph: str
+
+
+def _literal(kind: str, rng: random.Random) -> str:
+    if kind in ("int", "bool"):
+        return str(rng.randint(0, 1 if kind == "bool" else 10_000))
+    if kind == "decimal":
+        return f"{rng.uniform(0, 1000):.2f}"
+    if kind in ("date", "timestamp"):
+        return f"'20{rng.randint(10, 25)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}'"
+    return "'" + "".join(rng.choice("abcdefghijklmnopqrstuvwxyz ") for _ in range(rng.randint(5, 40))) + "'"
+
+
+def render_table(name: str, columns: List[Tuple[str, str]], dialect: str, rng: random.Random, dump_rows: int = 0) -> str:
+    """CREATE TABLE (plus optional INSERT dump) for one table in the given dialect."""
+    spec = DIALECTS[dialect]
+    quote = spec["quote"].format
+    lines = [f"    {spec['pk']}"]
+    lines += [f"    {quote(col)} {spec['types'][kind]}{' NOT NULL' if rng.random() < 0.3 else ''}"
+              for col, kind in columns]
+    if "pk_constraint" in spec:
+        lines.append(f"    {spec['pk_constraint']}")
+    sql = f"CREATE TABLE {quote(name)} (\n" + ",\n".join(lines) + f"\n){spec['suffix']};\n\n"
+    if dump_rows:
+        names = ", ".join(quote(col) for col, _ in columns)
+        values = ",\n".join(
+            "    (" + ", ".join(_literal(kind, rng) for _, kind in columns) + ")" for _ in range(dump_rows)
+        )
+        sql += f"INSERT INTO {quote(name)} ({names}) VALUES\n{values};\n\n"
+    return sql
+
+
+def synthetic_schema_graph(config: CorpusConfig) -> List[Dict[str, Any]]:
+    """A Schema.org-shaped JSON-LD graph: a class tree plus properties with domains and ranges."""
+    rng = random.Random(config.seed)
+    classes = [{"@id": "schema:Thing", "@type": "rdfs:Class", "rdfs:label": "Thing",
+                "rdfs:comment": "The most generic type of item."}]
+    for i in range(1, config.ontology_classes):
+        stem, round_ = CLASS_STEMS[(i - 1) % len(CLASS_STEMS)], (i - 1) // len(CLASS_STEMS)
+        label = stem + (str(round_) if round_ else "")
+        parent = classes[rng.randrange(len(classes))]["rdfs:label"]
+        classes.append({
+            "@id": f"schema:{label}", "@type": "rdfs:Class", "rdfs:label": label,
+            "rdfs:comment": f"A {label.lower()} record, a more specific kind of {parent}.",
+            "rdfs:subClassOf": {"@id": f"schema:{parent}"},
+        })
+    properties = []
+    for i in range(config.ontology_properties):
+        base, round_ = COLUMN_POOL[i % len(COLUMN_POOL)][0], i // len(COLUMN_POOL)
+        words = base.split("_")
+        label = words[0] + "".join(w.title() for w in words[1:]) + (str(round_) if round_ else "")
+        domains = rng.sample(classes, k=min(len(classes), rng.randint(1, 3)))
+        properties.append({
+            "@id": f"schema:{label}", "@type": "rdf:Property", "rdfs:label": label,
+            "rdfs:comment": f"The {base.replace('_', ' ')} of the item.",
+            "schema:domainIncludes": [{"@id": d["@id"]} for d in domains],
+            "schema:rangeIncludes": {"@id": "schema:Text"},
+        })
+    return classes + properties
+
+
+def generate_corpus(root: str, config: CorpusConfig) -> CorpusManifest:
+    """Writes `config.repos` repo directories of .sql files (and a JSON-LD graph) under `root`."""
+    rng = random.Random(config.seed)
+    root_path = Path(root)
+    repos, files, tables, columns, size = [], 0, 0, 0, 0
+    for r in range(config.repos):
+        repo = f"repo{r:04d}"
+        repos.append(repo)
+        repo_dir = root_path / repo / "db"
+        os.makedirs(repo_dir, exist_ok=True)
+        for f in range(config.files_per_repo):
+            dialect = config.dialects[(r + f) % len(config.dialects)]
+            parts = [f"-- {dialect} schema {f} for {repo}\n\n"]
+            for t in range(config.tables_per_file):
+                name = rng.choice(TABLE_PREFIXES) + rng.choice(TABLE_STEMS) + f"_{f}_{t}"
+                count = rng.randint(config.min_columns, config.max_columns)
+                cols = rng.sample(COLUMN_POOL, k=min(count, len(COLUMN_POOL)))
+                parts.append(render_table(name, cols, dialect, rng, config.dump_rows))
+                tables += 1
+                columns += len(cols) + 1
+            text = "".join(parts)
+            (repo_dir / f"schema_{f}_{dialect}.sql").write_text(text, encoding="utf-8")
+            files += 1
+            size += len(text.encode("utf-8"))
+
+    graph_path = root_path / "schemaorg-synthetic.jsonld"
+    graph_path.write_text(json.dumps({"@graph": synthetic_schema_graph(config)}), encoding="utf-8")
+    return CorpusManifest(root=str(root_path), repos=repos, files=files, tables=tables,
+                          columns=columns, bytes=size, schema_graph=str(graph_path))
@@ -0,0 +1,150 @@
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import warnings
+from typing import Any, Callable, Dict, List, Optional
+
+from pydantic import BaseModel
+
+
+class BenchmarkResult(BaseModel):
+    name: str
+    kind: str                       # "micro" or "macro"
+    items: int                      # Work units per run (tables, queries, ...)
+    runs: List[float]               # Wall seconds per run
+    min: float
+    median: float
+    mean: float
+    p95: float
+    stdev: float
+    items_per_second: float         # At the median run
+    extra: Dict[str, Any] = {}
+
+
+class Comparison(BaseModel):
+    name: str
+    baseline: Optional[float]       # Median seconds
+    current: float
+    change: Optional[float]         # current / baseline - 1
+    status: str                     # "regression", "improvement", "ok" or "new"
+
+
+def summarize(name: str, kind: str, runs: List[float], items: int, extra: Optional[Dict[str, Any]] = None) -> BenchmarkResult:
+    ordered = sorted(runs)
+    median = statistics.median(ordered)
+    return BenchmarkResult(
+        name=name, kind=kind, items=items, runs=runs,
+        min=ordered[0], median=median, mean=statistics.fmean(ordered),
+        p95=ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))],
+        stdev=statistics.stdev(ordered) if len(ordered) > 1 else 0.0,
+        items_per_second=items / median if median > 0 else 0.0,
+        extra=extra or {},
+    )
+
+
+def measure(
+    fn: Callable[[], Any],
+    repeat: int = 5,
+    warmup: int = 1,
+    setup: Optional[Callable[[], Any]] = None,
+    quiet: bool = True,
+) -> List[float]:
+    """
+    Times `fn` `repeat` times after `warmup` untimed runs. `setup` runs
+    (untimed) before every run. With `quiet`, stdout and warnings are
+    swallowed so the components' progress output doesn't add noise.
+    """
+    runs = []
+    for i in range(warmup + repeat):
+        with contextlib.ExitStack() as stack:
+            if quiet:
+                stack.enter_context(contextlib.redirect_stdout(io.StringIO()))
+                stack.enter_context(warnings.catch_warnings())
+                warnings.simplefilter("ignore")
+            if setup is not None:
+                setup()
+            start = time.perf_counter()
+            fn()
+            elapsed = time.perf_counter() - start
+        if i >= warmup:
+            runs.append(elapsed)
+    return runs
+
+
+def environment() -> Dict[str, Any]:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)), timeout=5).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        commit = ""
+    return {
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def compare(
+    results: List[BenchmarkResult],
+    baseline: Dict[str, Any],
+    threshold: float = 0.15,
+    min_delta: float = 0.001,
+) -> List[Comparison]:
+    """
+    Compares median times against a baseline report. A benchmark regresses
+    when it is more than `threshold` slower AND at least `min_delta` seconds
+    slower (so sub-millisecond jitter on micro benchmarks isn't flagged).
+    """
+    previous = {r["name"]: r["median"] for r in baseline.get("results", [])}
+    comparisons = []
+    for result in results:
+        before = previous.get(result.name)
+        if before is None:
+            comparisons.append(Comparison(name=result.name, baseline=None, current=result.median,
+                                          change=None, status="new"))
+            continue
+        change = result.median / before - 1 if before > 0 else 0.0
+        delta = result.median - before
+        if change > threshold and delta >= min_delta:
+            status = "regression"
+        elif change < -threshold and -delta >= min_delta:
+            status = "improvement"
+        else:
+            status = "ok"
+        comparisons.append(Comparison(name=result.name, baseline=before, current=result.median,
+                                      change=change, status=status))
+    return comparisons
+
+
+def build_report(results: List[BenchmarkResult], config: Dict[str, Any], corpus: Dict[str, Any],
+                 comparisons: Optional[List[Comparison]] = None) -> Dict[str, Any]:
+    report = {
+        "environment": environment(),
+        "config": config,
+        "corpus": corpus,
+        "results": [r.model_dump() for r in results],
+    }
+    if comparisons is not None:
+        report["comparison"] = [c.model_dump() for c in comparisons]
+        report["regressions"] = [c.name for c in comparisons if c.status == "regression"]
+    return report
+
+
+def load_report(path: str) -> Dict[str, Any]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_report(report: Dict[str, Any], path: str):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
@@ -0,0 +1,256 @@
+import asyncio
+import contextlib
+import io
+import random
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+from ontologymirror.config.settings import settings
+from ontologymirror.core.domain import RawTable
+from ontologymirror.core.llm_client import LLMClient
+from ontologymirror.core.vector_store import SchemaVectorStore
+from ontologymirror.extractors.sql_parser import SqlExtractor
+from ontologymirror.mappers.schema_loader import SchemaOrgLoader
+from ontologymirror.mappers.semantic_mapper import SemanticMapper
+
+from .corpus import COLUMN_POOL, CorpusConfig, CorpusManifest, DIALECTS, generate_corpus
+from .harness import BenchmarkResult, measure, summarize
+
+QUERIES = [
+    "user email address", "customer account", "blog post headline", "product price",
+    "flight reservation", "hotel booking", "order total amount", "postal code city country",
+    "event start date", "review rating", "organization contact point", "message body",
+]
+
+
+class Case(NamedTuple):
+    run: Callable[[], Any]
+    items: int
+    setup: Optional[Callable[[], Any]] = None
+    extra: Dict[str, Any] = {}
+
+
+class BenchContext:
+    """
+    A generated corpus plus the components under test, built lazily and
+    shared between benchmarks. Everything runs offline: a synthetic JSON-LD
+    graph stands in for Schema.org, embeddings are deterministic fakes and
+    the LLM is the mock provider. The on-disk mapping cache is switched off
+    so every run does the real work.
+    """
+
+    def __init__(self, config: CorpusConfig, workdir: Optional[str] = None, max_tables: int = 200):
+        self.config = config
+        self._own_workdir = workdir is None
+        self.workdir = Path(workdir or tempfile.mkdtemp(prefix="om-bench-"))
+        self.max_tables = max_tables
+        self.manifest: CorpusManifest = generate_corpus(str(self.workdir / "corpus"), config)
+        self._cache_enabled = settings.LLM_CACHE_ENABLED
+        settings.LLM_CACHE_ENABLED = False
+        self._stores = 0
+        self._loader: Optional[SchemaOrgLoader] = None
+        self._store: Optional[SchemaVectorStore] = None
+        self._mapper: Optional[SemanticMapper] = None
+        self._tables: Optional[List[RawTable]] = None
+
+    @staticmethod
+    def embeddings():
+        from langchain_community.embeddings import DeterministicFakeEmbedding
+        return DeterministicFakeEmbedding(size=128)
+
+    def new_loader(self) -> SchemaOrgLoader:
+        loader = SchemaOrgLoader()
+        loader.file_path = Path(self.manifest.schema_graph)
+        return loader
+
+    @property
+    def loader(self) -> SchemaOrgLoader:
+        if self._loader is None:
+            self._loader = self.new_loader()
+            with contextlib.redirect_stdout(io.StringIO()):
+                self._loader.ensure_schema_loaded()
+        return self._loader
+
+    def new_store(self) -> SchemaVectorStore:
+        """An empty store in a fresh directory (Chroma keeps one client per path)."""
+        self._stores += 1
+        with contextlib.redirect_stdout(io.StringIO()):
+            return SchemaVectorStore(
+                persist_directory=str(self.workdir / f"vector_store_{self._stores}"),
+                embedding_fn=self.embeddings(), loader=self.loader,
+            )
+
+    @property
+    def store(self) -> SchemaVectorStore:
+        if self._store is None:
+            self._store = self.new_store()
+            with contextlib.redirect_stdout(io.StringIO()):
+                self._store.build_index()
+        return self._store
+
+    @property
+    def mapper(self) -> SemanticMapper:
+        if self._mapper is None:
+            with contextlib.redirect_stdout(io.StringIO()):
+                self._mapper = SemanticMapper(vector_store=self.store, llm=LLMClient(provider="mock"))
+                self._mapper.warm_up()
+        return self._mapper
+
+    @property
+    def tables(self) -> List[RawTable]:
+        if self._tables is None:
+            with contextlib.redirect_stdout(io.StringIO()):
+                self._tables = SqlExtractor().extract(self.manifest.root)[: self.max_tables]
+        return self._tables
+
+    def close(self):
+        settings.LLM_CACHE_ENABLED = self._cache_enabled
+        if self._own_workdir:
+            shutil.rmtree(self.workdir, ignore_errors=True)
+
+
+BENCHMARKS: Dict[str, tuple] = {}
+
+
+def benchmark(name: str, kind: str):
+    """Registers `fn(ctx) -> Case` as a benchmark."""
+    def register(fn: Callable[[BenchContext], Case]):
+        BENCHMARKS[name] = (kind, fn)
+        return fn
+    return register
+
+
+# ----------------------------------------------------------------------
+# Extraction
+# ----------------------------------------------------------------------
+
+@benchmark("extract.parse_file", "micro")
+def _bench_parse_file(ctx: BenchContext) -> Case:
+    files = sorted(Path(ctx.manifest.root).rglob("*.sql"), key=lambda p: p.stat().st_size)
+    path = str(files[-1])
+    extractor = SqlExtractor()
+    tables = len(extractor._parse_sql_file(path))
+    return Case(lambda: extractor._parse_sql_file(path), tables, extra={"bytes": files[-1].stat().st_size})
+
+
+@benchmark("extract.column_definitions", "micro")
+def _bench_column_definitions(ctx: BenchContext) -> Case:
+    rng = random.Random(ctx.config.seed)
+    definitions = []
+    for _ in range(1000):
+        col, kind = rng.choice(COLUMN_POOL)
+        spec = DIALECTS[rng.choice(ctx.config.dialects)]
+        definitions.append(f"{spec['quote'].format(col)} {spec['types'][kind]} NOT NULL")
+    extractor = SqlExtractor()
+    return Case(lambda: [extractor._process_column_definition(d) for d in definitions], len(definitions))
+
+
+@benchmark("extract.corpus", "macro")
+def _bench_extract_corpus(ctx: BenchContext) -> Case:
+    extractor = SqlExtractor()
+    return Case(lambda: extractor.extract(ctx.manifest.root), ctx.manifest.tables,
+                extra={"files": ctx.manifest.files, "bytes": ctx.manifest.bytes})
+
+
+# ----------------------------------------------------------------------
+# Schema.org loading
+# ----------------------------------------------------------------------
+
+@benchmark("loader.load_graph", "micro")
+def _bench_load_graph(ctx: BenchContext) -> Case:
+    nodes = len(ctx.loader.graph)
+
+    def run():
+        loader = ctx.new_loader()
+        loader.ensure_schema_loaded()
+        loader.get_classes()
+        loader.get_properties()
+
+    return Case(run, nodes)
+
+
+@benchmark("loader.properties_for_classes", "micro")
+def _bench_properties_for_classes(ctx: BenchContext) -> Case:
+    loader = ctx.loader
+    labels = [loader.node_text(c.get("rdfs:label")) for c in loader.get_classes()][:50]
+
+    return Case(lambda: [loader.get_properties_for_classes([label]) for label in labels], len(labels),
+                setup=loader.clear_caches)
+
+
+# ----------------------------------------------------------------------
+# Vector store
+# ----------------------------------------------------------------------
+
+@benchmark("vector.build_index", "macro")
+def _bench_build_index(ctx: BenchContext) -> Case:
+    stores: List[SchemaVectorStore] = []
+    nodes = len(ctx.loader.get_classes()) + len(ctx.loader.get_properties())
+    return Case(lambda: stores[-1].build_index(), nodes, setup=lambda: stores.append(ctx.new_store()))
+
+
+@benchmark("vector.search", "micro")
+def _bench_search(ctx: BenchContext) -> Case:
+    store = ctx.store
+    return Case(lambda: [store.search(q, k=5) for q in QUERIES], len(QUERIES))
+
+
+@benchmark("vector.search_properties", "micro")
+def _bench_search_properties(ctx: BenchContext) -> Case:
+    store = ctx.store
+    queries = [col for col, _ in COLUMN_POOL]
+    store.search_properties(queries[:1])  # Builds the lexical index outside the timing
+    return Case(lambda: store.search_properties(queries, k=5), len(queries))
+
+
+# ----------------------------------------------------------------------
+# Mapping (mock LLM)
+# ----------------------------------------------------------------------
+
+@benchmark("mapper.map_table", "micro")
+def _bench_map_table(ctx: BenchContext) -> Case:
+    mapper, tables = ctx.mapper, ctx.tables[:10]
+    return Case(lambda: [mapper.map_table(t) for t in tables], len(tables))
+
+
+@benchmark("mapper.map_corpus", "macro")
+def _bench_map_corpus(ctx: BenchContext) -> Case:
+    mapper, tables = ctx.mapper, ctx.tables
+    return Case(lambda: [mapper.map_table(t) for t in tables], len(tables))
+
+
+@benchmark("mapper.map_corpus_concurrent", "macro")
+def _bench_map_corpus_concurrent(ctx: BenchContext) -> Case:
+    mapper, tables = ctx.mapper, ctx.tables
+
+    async def run():
+        return [r async for r in mapper.map_tables(tables)]
+
+    return Case(lambda: asyncio.run(run()), len(tables))
+
+
+def run_suite(
+    ctx: BenchContext,
+    names: Optional[List[str]] = None,
+    kinds: Optional[List[str]] = None,
+    repeat: int = 5,
+    warmup: int = 1,
+    progress: Callable[[str], None] = lambda message: None,
+) -> List[BenchmarkResult]:
+    """Runs the selected benchmarks (all by default) and returns their results."""
+    results = []
+    for name, (kind, factory) in BENCHMARKS.items():
+        if names and not any(name == n or name.startswith(n.rstrip(".") + ".") for n in names):
+            continue
+        if kinds and kind not in kinds:
+            continue
+        progress(f"⏱️ {name} ({kind})")
+        case = factory(ctx)
+        runs = measure(case.run, repeat=repeat, warmup=warmup, setup=case.setup)
+        result = summarize(name, kind, runs, case.items, case.extra)
+        progress(f"   median {result.median * 1000:.2f} ms, {result.items_per_second:,.1f} items/s")
+        results.append(result)
+    return results
+
@@ -0,0 +1,119 @@
+import argparse
+import json
+import os
+import sys
+
+from ontologymirror.config.settings import settings
+from ontologymirror.core.telemetry import configure_logging, telemetry
+from ontologymirror.mappers.semantic_mapper import SemanticMapper
+from ontologymirror.mappers.bulk_runner import BulkMappingRunner, read_results, table_key
+from ontologymirror.mappers.results_store import ResultsStore
+from ontologymirror.pipeline import build_repo_pipeline
+from ontologymirror.generators.sql_generator import SqlGenerator
+from ontologymirror.generators.json_generator import JsonLdGenerator
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="ontologymirror",
+        description="Map the database schemas of git repositories to Schema.org.",
+    )
+    parser.add_argument("--url", action="append", default=[],
+                        help="Repository URL (or local git path). Repeat for several repos.")
+    parser.add_argument("--urls-file", help="File with one repository URL per line")
+    parser.add_argument("--output", default=str(settings.DATA_DIR / "output" / "mappings.jsonl"),
+                        help="JSONL results file (re-running resumes where it stopped)")
+    parser.add_argument("--clone-workers", type=int, help="Parallel git clones")
+    parser.add_argument("--extract-workers", type=int, help="Parser processes")
+    parser.add_argument("--map-workers", type=int, help="Concurrent LLM calls")
+    parser.add_argument("--queue-size", type=int, help="Items buffered between stages")
+    parser.add_argument("--sql", action="store_true", help="Also write standardized SQL DDL")
+    parser.add_argument("--jsonld", action="store_true", help="Also write JSON-LD mapping reports")
+    parser.add_argument("--shard-by-repo", action="store_true", help="One SQL / JSON-LD file per repo")
+    parser.add_argument("--compress", choices=["gzip", "zstd"], help="Compress SQL / JSON-LD output")
+    parser.add_argument("--results-store", action="store_true",
+                        help="Also index results in the sqlite results store (see scripts/query_results.py)")
+    parser.add_argument("--trace", help="Write a JSON trace of stage / LLM / search spans here")
+    parser.add_argument("--metrics", help="Write Prometheus textfile metrics here")
+    parser.add_argument("--profile", action="store_true", help="Run the sampling profiler (folded stacks)")
+    return parser.parse_args(argv)
+
+
+def iter_urls(args):
+    yield from args.url
+    if args.urls_file:
+        with open(args.urls_file, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith("#"):
+                    yield line
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if not args.url and not args.urls_file:
+        print("❌ Nothing to do: pass --url and/or --urls-file")
+        return 2
+
+    if args.clone_workers:
+        settings.PIPELINE_CLONE_WORKERS = args.clone_workers
+    if args.extract_workers:
+        settings.PIPELINE_EXTRACT_WORKERS = args.extract_workers
+    if args.map_workers:
+        settings.LLM_MAX_CONCURRENCY = args.map_workers
+    if args.results_store:
+        settings.RESULTS_STORE_ENABLED = True
+    if args.trace:
+        settings.TELEMETRY_TRACE_PATH = args.trace
+    if args.metrics:
+        settings.TELEMETRY_PROMETHEUS_PATH = args.metrics
+    if args.trace or args.metrics or args.profile:
+        telemetry.enabled = True
+    configure_logging()
+    telemetry.start(profile=args.profile or None)
+
+    print("🪞 OntologyMirror")
+    mapper = SemanticMapper()
+    store = ResultsStore.from_settings()
+    with BulkMappingRunner(mapper, args.output, results_store=store) as runner:
+        def sink(item):
+            if item.result.schema_class == "Error":
+                return  # Not checkpointed: retried on the next run
+            runner.write(table_key(item.table, item.table.repo), item.table, item.result, item.table.repo)
+
+        pipeline = build_repo_pipeline(
+            mapper,
+            sink,
+            skip=lambda table: runner.is_completed(table_key(table, table.repo)),
+            queue_size=args.queue_size,
+        )
+        mapped = 0
+        try:
+            for item in pipeline.run(iter_urls(args)):
+                mapped += 1
+                print(f"   ✅ {item.table.repo}:{item.table.name} -> {item.result.schema_class}")
+        except KeyboardInterrupt:
+            print("\n🛑 Interrupted, finishing in-flight work...")
+            pipeline.cancel()
+
+    print(f"\n📦 {mapped} tables mapped -> {args.output}")
+    if store is not None:
+        print(f"🗄️ Results store: {store.path} {store.stats()}")
+        store.close()
+
+    # Generated from the results file, so tables completed by earlier runs are included
+    output_dir = os.path.dirname(os.path.abspath(args.output))
+    for cls, wanted in ((SqlGenerator, args.sql), (JsonLdGenerator, args.jsonld)):
+        if wanted:
+            generator = cls(output_dir, shard_by_repo=args.shard_by_repo, compression=args.compress)
+            for path in generator.write_all(read_results(args.output)):
+                print(f"📝 Wrote {path}")
+    print(json.dumps(pipeline.stats, indent=2))
+    for stage, _, error in pipeline.errors:
+        print(f"⚠️ [{stage}] {error}")
+    telemetry.shutdown()
+    return 1 if pipeline.errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
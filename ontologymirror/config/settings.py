@@ -16,6 +16,108 @@ class Settings(BaseSettings):
     OPENAI_API_KEY: str | None = None
     GEMINI_API_KEY: str | None = None
     
+    # Retrieval Settings
+    # Lexical (BM25 + trigram) hits are accepted without dense retrieval when the
+    # top score clears LEXICAL_ACCEPT_SCORE and leads the runner-up by LEXICAL_MARGIN.
+    LEXICAL_ACCEPT_SCORE: float = 0.9
+    LEXICAL_MARGIN: float = 0.15
+    # Weight of the lexical score when fusing with dense similarity (0..1)
+    HYBRID_LEXICAL_WEIGHT: float = 0.5
+    
+    # LLM Bypass Policy
+    # Skip the LLM when retrieval alone is confident enough (see mappers/bypass_policy.py)
+    LLM_BYPASS_ENABLED: bool = True
+    BYPASS_MIN_CLASS_SCORE: float = 0.6
+    BYPASS_MIN_CLASS_MARGIN: float = 0.15
+    BYPASS_MIN_COLUMN_SCORE: float = 0.9
+    BYPASS_MIN_COLUMN_COVERAGE: float = 1.0
+    
+    # Concurrent LLM Calls (SemanticMapper.map_tables)
+    LLM_MAX_CONCURRENCY: int = 8
+    LLM_REQUESTS_PER_MINUTE: int | None = None  # None = unlimited
+    LLM_TOKENS_PER_MINUTE: int | None = None    # None = unlimited
+    LLM_OUTPUT_TOKENS_ESTIMATE: int = 512       # Reserved per call before the answer is known
+    LLM_MAX_RETRIES: int = 5
+    LLM_RETRY_BASE_DELAY: float = 1.0           # Seconds
+    LLM_RETRY_MAX_DELAY: float = 30.0           # Seconds
+    
+    # Packed (multi-table) prompts: max tokens per prompt
+    PACKED_PROMPT_TOKEN_BUDGET: int = 6000
+    
+    # Mapping Cache (persistent, keyed by normalized table signature)
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_BYPASS: bool = False               # Skip lookups, still write fresh results
+    LLM_CACHE_PATH: Path | None = None           # Default: DATA_DIR/cache/mapping_cache.sqlite
+    LLM_CACHE_TTL_SECONDS: int | None = 30 * 24 * 3600
+    LLM_CACHE_MAX_ENTRIES: int | None = 100_000
+    
+    # Near-duplicate table clustering (Jaccard similarity of column sets)
+    DEDUP_SIMILARITY_THRESHOLD: float = 0.8
+    
+    # Deterministic lexicon pre-mapping (exact / normalized / synonym column matches)
+    LEXICON_ENABLED: bool = True
+    
+    # Streaming: attempts per table when the streamed JSON is structurally broken
+    LLM_STREAM_MAX_ATTEMPTS: int = 3
+
+    # Hedged requests / failover: comma-separated providers in priority order
+    # (e.g. "openai,gemini"). Unset = single provider from LLM_PROVIDER.
+    LLM_HEDGE_PROVIDERS: str | None = None
+    LLM_HEDGE_PERCENTILE: float = 95.0      # Hedge after this latency percentile of the provider
+    LLM_HEDGE_DEFAULT_DELAY: float = 2.0    # Seconds, until enough latencies are recorded
+    LLM_HEDGE_MIN_DELAY: float = 0.05
+    LLM_REQUEST_TIMEOUT: float | None = None      # Seconds per provider attempt
+
+    # Circuit breaker: stop calling a provider whose recent error rate spikes
+    CIRCUIT_BREAKER_ERROR_RATE: float = 0.5
+    CIRCUIT_BREAKER_MIN_CALLS: int = 5
+    CIRCUIT_BREAKER_COOLDOWN_SECONDS: float = 30.0
+
+    # Bulk runs: results are fsynced and checkpointed every N tables or T seconds
+    BULK_FSYNC_EVERY: int = 50
+    BULK_FSYNC_INTERVAL_SECONDS: float = 2.0
+
+    # Pipeline (main.py): bounded queues between stages, workers per stage
+    # (the map stage uses LLM_MAX_CONCURRENCY threads)
+    PIPELINE_QUEUE_SIZE: int = 64
+    PIPELINE_CLONE_WORKERS: int = 4
+    PIPELINE_EXTRACT_WORKERS: int = 2      # Processes
+    PIPELINE_RETRIEVE_WORKERS: int = 4
+
+    # Mapping daemon: warm SemanticMapper served over a Unix socket
+    DAEMON_SOCKET_PATH: Path | None = None       # Default: DATA_DIR/ontologymirror.sock
+    DAEMON_BATCH_SIZE: int = 8                   # Tables mapped concurrently per batch
+    DAEMON_BATCH_WAIT_MS: float = 20.0           # How long a batch waits to fill up
+    DAEMON_MAX_BATCHES_IN_FLIGHT: int = 4        # Batches mapped at once; more wait to start
+
+    # Generators (SQL DDL / JSON-LD output)
+    GENERATOR_BUFFER_SIZE: int = 1 << 20         # Write buffer per open output file
+    GENERATOR_MAX_OPEN_FILES: int = 64           # Shard files kept open at once (LRU)
+
+    # Results store: queryable sqlite copy of bulk mapping results (opt-in: it
+    # duplicates the JSONL output)
+    RESULTS_STORE_ENABLED: bool = False
+    RESULTS_STORE_PATH: Path | None = None       # Default: DATA_DIR/results.sqlite
+    RESULTS_STORE_BATCH_SIZE: int = 500          # Results per insert transaction
+
+    # Job queue: lease-based sqlite queue for distributed workers
+    JOB_QUEUE_PATH: Path | None = None           # Default: DATA_DIR/jobs.sqlite
+    JOB_LEASE_SECONDS: float = 300.0             # Unrenewed leases expire and the job is retried
+    JOB_HEARTBEAT_SECONDS: float = 30.0          # How often workers renew their lease
+    JOB_MAX_ATTEMPTS: int = 3                    # Then the job is dead-lettered
+    JOB_RETRY_BASE_DELAY: float = 5.0            # Backoff: base * 2^(attempt-1) ...
+    JOB_RETRY_MAX_DELAY: float = 300.0           # ... capped at this
+    JOB_POLL_SECONDS: float = 1.0                # Idle workers poll this often
+    
+    # Telemetry: spans, counters and histograms (no-op unless enabled)
+    TELEMETRY_ENABLED: bool = False
+    TELEMETRY_TRACE_PATH: Path | None = None     # JSON trace (chrome://tracing / Perfetto)
+    TELEMETRY_PROMETHEUS_PATH: Path | None = None  # Prometheus textfile collector output
+    TELEMETRY_MAX_SPANS: int = 100_000           # Spans kept for the trace (metrics keep counting)
+    TELEMETRY_PROFILE: bool = False              # Sampling profiler (needs TELEMETRY_ENABLED)
+    TELEMETRY_PROFILE_INTERVAL_MS: float = 10.0
+    TELEMETRY_PROFILE_PATH: Path | None = None   # Default: DATA_DIR/profile.folded
+
     # Tool Settings
     LOG_LEVEL: str = "INFO"
 
@@ -25,6 +25,8 @@ class RawTable(BaseModel):
     columns: List[RawColumn]
     source_file: str = Field(..., description="Where this table was found (e.g., 'src/models.py')")
     raw_content: Optional[str] = Field(None, description="The full original code block for context")
+    repo: Optional[str] = Field(None, description="Repository the table came from (e.g., 'django-realworld-example-app')")
+    commit: Optional[str] = Field(None, description="Commit SHA the table was extracted at")
 
 # ==========================================
 # Phase 2: Semantic Schema (From Mapper)
@@ -0,0 +1,352 @@
+import asyncio
+import json
+import math
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Iterator, List, Optional, Sequence
+
+from ..config.settings import settings
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised when every provider's circuit breaker is open."""
+
+
+class InvalidAnswerError(ValueError):
+    """Raised when a provider answers with something the validator rejects."""
+
+
+def is_json_answer(text: str) -> bool:
+    """True if the answer contains a JSON object (markdown fences and preamble allowed)."""
+    start, end = text.find("{"), text.rfind("}")
+    if start == -1 or end < start:
+        return False
+    try:
+        json.loads(text[start:end + 1])
+    except json.JSONDecodeError:
+        return False
+    return True
+
+
+class LatencyTracker:
+    """Rolling window of recent successful latencies (seconds) with percentile lookup."""
+
+    def __init__(self, window: int = 200):
+        self.samples: Deque[float] = deque(maxlen=window)
+
+    def record(self, seconds: float):
+        self.samples.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self.samples)
+
+    def percentile(self, p: float) -> Optional[float]:
+        """Nearest-rank percentile of the window, or None if empty."""
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        rank = min(len(ordered), max(1, math.ceil(p / 100.0 * len(ordered))))
+        return ordered[rank - 1]
+
+
+class CircuitBreaker:
+    """
+    Error-rate circuit breaker over the last `window` calls.
+
+    - closed:    calls flow; trips open once >= min_calls are recorded and the
+                 failure ratio reaches `error_rate`.
+    - open:      calls are refused until `cooldown` seconds have passed.
+    - half_open: a single probe call is let through; success closes the
+                 breaker, failure re-opens it.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(
+        self,
+        error_rate: float = 0.5,
+        min_calls: int = 5,
+        window: int = 20,
+        cooldown: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.error_rate = error_rate
+        self.min_calls = min_calls
+        self.cooldown = cooldown
+        self.clock = clock
+        self.state = self.CLOSED
+        self._outcomes: Deque[bool] = deque(maxlen=window)  # True = failure
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+    def allow(self) -> bool:
+        """True if a call may be made now (in half_open, reserves the probe)."""
+        if self.state == self.OPEN:
+            if self.clock() - self._opened_at < self.cooldown:
+                return False
+            self.state = self.HALF_OPEN
+            self._probe_in_flight = False
+        if self.state == self.HALF_OPEN:
+            if self._probe_in_flight:
+                return False
+            self._probe_in_flight = True
+        return True
+
+    def record_success(self):
+        if self.state == self.HALF_OPEN:
+            self.state = self.CLOSED
+            self._outcomes.clear()
+            self._probe_in_flight = False
+        self._outcomes.append(False)
+
+    def record_failure(self):
+        if self.state == self.HALF_OPEN:
+            self._trip()
+            return
+        self._outcomes.append(True)
+        if len(self._outcomes) >= self.min_calls and sum(self._outcomes) / len(self._outcomes) >= self.error_rate:
+            self._trip()
+
+    def release(self):
+        """The call was cancelled before it finished: it counts as neither outcome."""
+        self._probe_in_flight = False
+
+    def _trip(self):
+        self.state = self.OPEN
+        self._opened_at = self.clock()
+        self._outcomes.clear()
+        self._probe_in_flight = False
+
+
+class _ProviderSlot:
+    """One provider plus its latency window, breaker and counters."""
+
+    def __init__(self, name: str, client, breaker: CircuitBreaker, window: int):
+        self.name = name
+        self.client = client
+        self.breaker = breaker
+        self.latency = LatencyTracker(window)
+        self.stats: Dict[str, int] = {"calls": 0, "errors": 0, "wins": 0, "cancelled": 0}
+
+
+def _run_loop(loop: asyncio.AbstractEventLoop):
+    try:
+        loop.run_forever()
+    finally:
+        loop.close()
+
+
+class HedgedLLMClient:
+    """
+    Multi-provider client with hedged requests and failover.
+
+    `providers` are clients exposing `agenerate(system, user)` (e.g. LLMClient),
+    in priority order. A request goes to the first available provider; if it has
+    not answered after that provider's p`hedge_percentile` latency, the same
+    request is sent to the next provider. The first valid answer wins and the
+    other attempts are cancelled. Errors and invalid answers fail over to the
+    next provider immediately and feed that provider's circuit breaker.
+
+    Exposes the same generate / agenerate / stream / model_name surface as
+    LLMClient, so SemanticMapper can use it unchanged.
+    """
+
+    def __init__(
+        self,
+        providers: Sequence,
+        hedge_percentile: float = 95.0,
+        default_delay: float = 2.0,
+        min_delay: float = 0.05,
+        min_samples: int = 10,
+        timeout: Optional[float] = None,
+        validator: Optional[Callable[[str], bool]] = None,
+        breaker_factory: Optional[Callable[[], CircuitBreaker]] = None,
+        latency_window: int = 200,
+    ):
+        if not providers:
+            raise ValueError("HedgedLLMClient needs at least one provider")
+        breaker_factory = breaker_factory or CircuitBreaker
+        self.slots: List[_ProviderSlot] = []
+        for i, client in enumerate(providers):
+            name = getattr(client, "model_name", None) or f"provider{i}"
+            if any(s.name == name for s in self.slots):
+                name = f"{name}#{i}"
+            self.slots.append(_ProviderSlot(name, client, breaker_factory(), latency_window))
+
+        self.hedge_percentile = hedge_percentile
+        self.default_delay = default_delay
+        self.min_delay = min_delay
+        self.min_samples = min_samples
+        self.timeout = timeout
+        self.validator = validator or (lambda text: bool(text and text.strip()))
+        self.stats: Dict[str, int] = {"requests": 0, "hedged": 0, "hedge_wins": 0, "failovers": 0, "short_circuited": 0}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls) -> "HedgedLLMClient":
+        from .llm_client import LLMClient
+
+        names = [p.strip() for p in (settings.LLM_HEDGE_PROVIDERS or "").split(",") if p.strip()]
+        return cls(
+            [LLMClient(provider=name) for name in names],
+            hedge_percentile=settings.LLM_HEDGE_PERCENTILE,
+            default_delay=settings.LLM_HEDGE_DEFAULT_DELAY,
+            min_delay=settings.LLM_HEDGE_MIN_DELAY,
+            timeout=settings.LLM_REQUEST_TIMEOUT,
+            validator=is_json_answer,
+            breaker_factory=lambda: CircuitBreaker(
+                error_rate=settings.CIRCUIT_BREAKER_ERROR_RATE,
+                min_calls=settings.CIRCUIT_BREAKER_MIN_CALLS,
+                cooldown=settings.CIRCUIT_BREAKER_COOLDOWN_SECONDS,
+            ),
+        )
+
+    @property
+    def model_name(self) -> Optional[str]:
+        """Primary provider's model (used for token counting and cache keys)."""
+        return getattr(self.slots[0].client, "model_name", None)
+
+    def hedge_delay(self, slot: _ProviderSlot) -> float:
+        """Seconds to wait on `slot` before hedging to the next provider."""
+        if len(slot.latency) < self.min_samples:
+            return self.default_delay
+        return max(self.min_delay, slot.latency.percentile(self.hedge_percentile))
+
+    def provider_stats(self) -> Dict[str, Dict]:
+        return {
+            s.name: {
+                **s.stats,
+                "p50": s.latency.percentile(50),
+                "p95": s.latency.percentile(95),
+                "state": s.breaker.state,
+            }
+            for s in self.slots
+        }
+
+    async def _attempt(self, slot: _ProviderSlot, system_prompt: str, user_prompt: str) -> str:
+        slot.stats["calls"] += 1
+        start = time.monotonic()
+        try:
+            call = slot.client.agenerate(system_prompt, user_prompt)
+            answer = await (asyncio.wait_for(call, self.timeout) if self.timeout else call)
+        except asyncio.CancelledError:
+            slot.stats["cancelled"] += 1
+            slot.breaker.release()
+            raise
+        except Exception:
+            slot.stats["errors"] += 1
+            slot.breaker.record_failure()
+            raise
+        if not self.validator(answer):
+            slot.stats["errors"] += 1
+            slot.breaker.record_failure()
+            raise InvalidAnswerError(f"{slot.name} returned an invalid answer")
+        slot.latency.record(time.monotonic() - start)
+        slot.breaker.record_success()
+        return answer
+
+    async def agenerate(self, system_prompt: str, user_prompt: str) -> str:
+        self.stats["requests"] += 1
+        pending = list(self.slots)
+        running: Dict[asyncio.Task, _ProviderSlot] = {}
+        last_launched: List[_ProviderSlot] = []
+        hedges: List[_ProviderSlot] = []
+
+        def launch() -> bool:
+            while pending:
+                slot = pending.pop(0)
+                if slot.breaker.allow():
+                    task = asyncio.ensure_future(self._attempt(slot, system_prompt, user_prompt))
+                    running[task] = slot
+                    last_launched.append(slot)
+                    return True
+                self.stats["short_circuited"] += 1
+            return False
+
+        if not launch():
+            raise CircuitOpenError("All LLM providers are unavailable (circuit open)")
+
+        last_error: Optional[BaseException] = None
+        try:
+            while running:
+                # Hedge timer runs on the most recently launched attempt
+                timeout = self.hedge_delay(last_launched[-1]) if pending else None
+                done, _ = await asyncio.wait(running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    if launch():
+                        self.stats["hedged"] += 1
+                        hedges.append(last_launched[-1])
+                    continue
+
+                for task in done:
+                    slot = running.pop(task)
+                    try:
+                        answer = task.result()
+                    except Exception as e:
+                        last_error = e
+                        continue
+                    slot.stats["wins"] += 1
+                    if slot in hedges:
+                        self.stats["hedge_wins"] += 1
+                    return answer
+
+                # Every finished attempt failed: fail over straight away
+                if pending and launch():
+                    self.stats["failovers"] += 1
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+
+        raise last_error or CircuitOpenError("All LLM providers are unavailable (circuit open)")
+
+    def generate(self, system_prompt: str, user_prompt: str) -> str:
+        """
+        Blocking wrapper around agenerate (for the synchronous mapping paths).
+        Every call runs on the same background loop: the providers' async HTTP
+        clients are bound to the loop they were first used on, so a fresh loop
+        per call would break them from the second call on. Also safe from a
+        thread that already runs an event loop (the daemon, an async caller).
+        """
+        future = asyncio.run_coroutine_threadsafe(self.agenerate(system_prompt, user_prompt), self._background_loop())
+        return future.result()
+
+    def _background_loop(self) -> asyncio.AbstractEventLoop:
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=_run_loop, args=(self._loop,), name="hedged-generate", daemon=True).start()
+            return self._loop
+
+    def close(self):
+        """Stops the background loop used by generate (a later call starts a new one)."""
+        with self._loop_lock:
+            loop, self._loop = self._loop, None
+        if loop is not None:
+            loop.call_soon_threadsafe(loop.stop)
+
+    def stream(self, system_prompt: str, user_prompt: str) -> Iterator[str]:
+        """
+        Streams from the first available provider. Streams are not hedged:
+        the caller (map_table_streaming) already retries broken streams.
+        """
+        for slot in self.slots:
+            if slot.breaker.allow():
+                break
+        else:
+            raise CircuitOpenError("All LLM providers are unavailable (circuit open)")
+
+        slot.stats["calls"] += 1
+        try:
+            yield from slot.client.stream(system_prompt, user_prompt)
+        except GeneratorExit:
+            slot.breaker.release()
+            raise
+        except Exception:
+            slot.stats["errors"] += 1
+            slot.breaker.record_failure()
+            raise
+        slot.breaker.record_success()
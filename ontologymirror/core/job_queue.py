@@ -0,0 +1,235 @@
+import json
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from pydantic import BaseModel
+
+from ..config.settings import settings
+
+QUEUED, LEASED, DONE, DEAD = "queued", "leased", "done", "dead"
+
+
+class Job(BaseModel):
+    """A claimed job. `attempts` includes the current one."""
+    id: int
+    kind: str
+    payload: Dict[str, Any]
+    attempts: int
+    max_attempts: int
+    lease_owner: str
+
+
+class JobQueue:
+    """
+    Durable multi-process job queue in a sqlite (WAL) file, no broker needed.
+
+    - Jobs are claimed with a visibility lease: a claimed job is invisible to
+      other workers until `lease_seconds` pass without a heartbeat, after which
+      any worker may reclaim it (the crashed worker's attempt counts as failed).
+    - Failed jobs are retried with exponential backoff up to `max_attempts`,
+      then dead-lettered (status "dead") for inspection or requeue.
+    - Claims run in a BEGIN IMMEDIATE transaction, so concurrent workers never
+      claim the same job. Every JobQueue instance owns its own connection;
+      create one per process/thread.
+
+    The file may live on a shared filesystem for multi-host use, provided that
+    filesystem implements POSIX locks correctly (local disks and most NFSv4 do).
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        lease_seconds: Optional[float] = None,
+        max_attempts: Optional[int] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.path = Path(path) if path else Path(settings.JOB_QUEUE_PATH or settings.DATA_DIR / "jobs.sqlite")
+        os.makedirs(self.path.parent, exist_ok=True)
+        self.lease_seconds = lease_seconds or settings.JOB_LEASE_SECONDS
+        self.max_attempts = max_attempts or settings.JOB_MAX_ATTEMPTS
+        self.clock = clock
+
+        self._conn = sqlite3.connect(str(self.path), timeout=30, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            " id INTEGER PRIMARY KEY,"
+            " kind TEXT NOT NULL,"
+            " dedup_key TEXT UNIQUE,"
+            " payload TEXT NOT NULL,"
+            " status TEXT NOT NULL,"
+            " attempts INTEGER NOT NULL DEFAULT 0,"
+            " max_attempts INTEGER NOT NULL,"
+            " available_at REAL NOT NULL,"
+            " lease_owner TEXT,"
+            " lease_expires REAL,"
+            " last_error TEXT,"
+            " result TEXT,"
+            " created_at REAL NOT NULL,"
+            " updated_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_ready ON jobs(status, available_at)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_leases ON jobs(status, lease_expires)")
+
+    # ------------------------------------------------------------------
+    # Producing
+    # ------------------------------------------------------------------
+
+    def enqueue(self, kind: str, payload: Dict[str, Any], key: Optional[str] = None,
+                max_attempts: Optional[int] = None, requeue_done: bool = False) -> Optional[int]:
+        """Adds a job; returns its id, or None if a job with the same `key` already exists."""
+        ids = self.enqueue_many(kind, [(payload, key)], max_attempts, requeue_done)
+        return ids[0] if ids else None
+
+    def enqueue_many(self, kind: str, items: Iterable[tuple], max_attempts: Optional[int] = None,
+                     requeue_done: bool = False) -> List[int]:
+        """
+        Adds (payload, key) pairs in one transaction; returns the ids of the jobs queued.
+        A key that already exists is skipped, unless `requeue_done` is set and
+        that job has finished: it is then queued again (fresh attempts, new payload),
+        e.g. to pick up a repo's new commits.
+        """
+        now = self.clock()
+        max_attempts = max_attempts or self.max_attempts
+        ids = []
+        with self._transaction():
+            for payload, key in items:
+                cursor = self._conn.execute(
+                    "INSERT OR IGNORE INTO jobs (kind, dedup_key, payload, status, max_attempts, available_at,"
+                    " created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (kind, key, json.dumps(payload), QUEUED, max_attempts, now, now, now),
+                )
+                if cursor.rowcount:
+                    ids.append(cursor.lastrowid)
+                    continue
+                if not requeue_done:
+                    continue
+                row = self._conn.execute(
+                    "SELECT id FROM jobs WHERE dedup_key = ? AND status = ?", (key, DONE)
+                ).fetchone()
+                if row:
+                    self._conn.execute(
+                        "UPDATE jobs SET payload = ?, status = ?, attempts = 0, max_attempts = ?, available_at = ?,"
+                        " lease_owner = NULL, lease_expires = NULL, last_error = NULL, result = NULL,"
+                        " updated_at = ? WHERE id = ?",
+                        (json.dumps(payload), QUEUED, max_attempts, now, now, row["id"]),
+                    )
+                    ids.append(row["id"])
+        return ids
+
+    # ------------------------------------------------------------------
+    # Consuming
+    # ------------------------------------------------------------------
+
+    def _transaction(self):
+        conn = self._conn
+
+        class _Tx:
+            def __enter__(self):
+                conn.execute("BEGIN IMMEDIATE")
+
+            def __exit__(self, exc_type, *exc):
+                conn.execute("ROLLBACK" if exc_type else "COMMIT")
+
+        return _Tx()
+
+    def _reclaim_expired(self, now: float):
+        """Expired leases count as failed attempts: requeue, or dead-letter when out of attempts."""
+        self._conn.execute(
+            "UPDATE jobs SET status = CASE WHEN attempts >= max_attempts THEN ? ELSE ? END,"
+            " last_error = 'lease expired (worker ' || lease_owner || ' lost)',"
+            " lease_owner = NULL, lease_expires = NULL, updated_at = ?"
+            " WHERE status = ? AND lease_expires < ?",
+            (DEAD, QUEUED, now, LEASED, now),
+        )
+
+    def claim(self, worker_id: str, kinds: Optional[List[str]] = None) -> Optional[Job]:
+        """Leases the oldest ready job (optionally of the given kinds), or returns None."""
+        now = self.clock()
+        with self._transaction():
+            self._reclaim_expired(now)
+            sql = "SELECT id FROM jobs WHERE status = ? AND available_at <= ?"
+            params: list = [QUEUED, now]
+            if kinds:
+                sql += f" AND kind IN ({','.join('?' * len(kinds))})"
+                params.extend(kinds)
+            row = self._conn.execute(sql + " ORDER BY available_at, id LIMIT 1", params).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, lease_owner = ?, lease_expires = ?, attempts = attempts + 1,"
+                " updated_at = ? WHERE id = ?",
+                (LEASED, worker_id, now + self.lease_seconds, now, row["id"]),
+            )
+            job = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (row["id"],)).fetchone()
+        return Job(id=job["id"], kind=job["kind"], payload=json.loads(job["payload"]),
+                   attempts=job["attempts"], max_attempts=job["max_attempts"], lease_owner=worker_id)
+
+    def _update_owned(self, job: Job, sql: str, params: tuple) -> bool:
+        """Runs an UPDATE only if `job` is still leased by its owner (the lease may have been lost)."""
+        cursor = self._conn.execute(
+            f"UPDATE jobs SET {sql}, updated_at = ? WHERE id = ? AND status = ? AND lease_owner = ?",
+            (*params, self.clock(), job.id, LEASED, job.lease_owner),
+        )
+        return cursor.rowcount == 1
+
+    def heartbeat(self, job: Job) -> bool:
+        """Extends the lease. False means the lease was lost and the job may be running elsewhere."""
+        return self._update_owned(job, "lease_expires = ?", (self.clock() + self.lease_seconds,))
+
+    def complete(self, job: Job, result: Any = None) -> bool:
+        return self._update_owned(
+            job, "status = ?, result = ?, lease_owner = NULL, lease_expires = NULL",
+            (DONE, json.dumps(result) if result is not None else None),
+        )
+
+    def fail(self, job: Job, error: str, retry_delay: Optional[float] = None) -> bool:
+        """Requeues the job with backoff, or dead-letters it once out of attempts."""
+        if job.attempts >= job.max_attempts:
+            return self._update_owned(
+                job, "status = ?, last_error = ?, lease_owner = NULL, lease_expires = NULL", (DEAD, error))
+        if retry_delay is None:
+            retry_delay = min(settings.JOB_RETRY_MAX_DELAY, settings.JOB_RETRY_BASE_DELAY * 2 ** (job.attempts - 1))
+        return self._update_owned(
+            job, "status = ?, last_error = ?, available_at = ?, lease_owner = NULL, lease_expires = NULL",
+            (QUEUED, error, self.clock() + retry_delay),
+        )
+
+    # ------------------------------------------------------------------
+    # Inspection
+    # ------------------------------------------------------------------
+
+    def counts(self, kinds: Optional[List[str]] = None) -> Dict[str, int]:
+        """Job counts by status (optionally only of the given kinds)."""
+        counts = {QUEUED: 0, LEASED: 0, DONE: 0, DEAD: 0}
+        sql, params = "SELECT status, COUNT(*) FROM jobs", []
+        if kinds:
+            sql += f" WHERE kind IN ({','.join('?' * len(kinds))})"
+            params.extend(kinds)
+        for row in self._conn.execute(sql + " GROUP BY status", params):
+            counts[row[0]] = row[1]
+        return counts
+
+    def dead_letters(self, limit: int = 100) -> List[Dict[str, Any]]:
+        rows = self._conn.execute(
+            "SELECT id, kind, dedup_key, payload, attempts, last_error FROM jobs WHERE status = ? ORDER BY id LIMIT ?",
+            (DEAD, limit),
+        )
+        return [{**dict(row), "payload": json.loads(row["payload"])} for row in rows]
+
+    def requeue_dead(self, ids: Optional[List[int]] = None) -> int:
+        """Gives dead-lettered jobs a fresh set of attempts."""
+        sql = "UPDATE jobs SET status = ?, attempts = 0, available_at = ?, updated_at = ? WHERE status = ?"
+        params: list = [QUEUED, self.clock(), self.clock(), DEAD]
+        if ids:
+            sql += f" AND id IN ({','.join('?' * len(ids))})"
+            params.extend(ids)
+        return self._conn.execute(sql, params).rowcount
+
+    def close(self):
+        self._conn.close()
@@ -0,0 +1,137 @@
+import json
+from typing import Any, Dict, List, Optional
+
+
+class StreamParseError(ValueError):
+    """Raised as soon as a streamed JSON answer is structurally broken."""
+
+
+# Characters that may appear outside strings in valid JSON (besides brackets and quotes)
+_BARE_CHARS = set(" \t\r\n:,-+.0123456789eEtrufalsn")
+
+
+class IncrementalMappingParser:
+    """
+    Incremental parser for the mapper's JSON answer:
+
+        {"schema_class": ..., "rationale": ..., "mappings": [{...}, {...}]}
+
+    Feed it chunks as they arrive; every object inside the top-level "mappings"
+    array is decoded and returned the moment its closing brace arrives.
+    Structural errors (mismatched brackets, stray characters, trailing garbage,
+    malformed mapping objects) raise StreamParseError immediately, so the caller
+    can abort the stream and retry without waiting for the rest.
+
+    Text before the first '{' (e.g. a ```json fence) and backticks after the
+    final '}' are ignored.
+    """
+
+    ITEMS_KEY = "mappings"
+    REQUIRED_KEYS = ("original_name", "schema_property")
+
+    def __init__(self):
+        self.text = ""
+        self._pos = 0
+        self._start: Optional[int] = None   # Index of the top-level '{'
+        self._end: Optional[int] = None     # Index just after the top-level '}'
+        # Stack of (bracket, key it is the value of, start index)
+        self._stack: List[tuple] = []
+        self._in_string = False
+        self._escaped = False
+        self._string_start = 0
+        self._pending_key: Optional[str] = None
+        self._last_string: Optional[str] = None
+
+    def _fail(self, message: str):
+        snippet = self.text[max(0, self._pos - 20):self._pos + 1]
+        raise StreamParseError(f"{message} at offset {self._pos}: ...{snippet!r}")
+
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        """Consumes a chunk and returns the mapping objects completed by it."""
+        self.text += chunk
+        completed = []
+        text = self.text
+
+        while self._pos < len(text):
+            ch = text[self._pos]
+
+            if self._end is not None:
+                if not ch.isspace() and ch != "`":
+                    self._fail("Unexpected content after JSON document")
+            elif self._start is None:
+                if ch == "{":
+                    self._start = self._pos
+                    self._stack.append(("{", None, self._pos))
+            elif self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif ch == "\\":
+                    self._escaped = True
+                elif ch == '"':
+                    self._in_string = False
+                    self._last_string = text[self._string_start + 1:self._pos]
+            elif ch == '"':
+                self._in_string = True
+                self._string_start = self._pos
+            elif ch == ":":
+                if self._stack[-1][0] != "{" or self._last_string is None:
+                    self._fail("Unexpected ':'")
+                self._pending_key = self._last_string
+                self._last_string = None
+            elif ch in "{[":
+                key = self._pending_key if self._stack[-1][0] == "{" else None
+                self._stack.append((ch, key, self._pos))
+                self._pending_key = None
+                self._last_string = None
+            elif ch in "}]":
+                opener = "{" if ch == "}" else "["
+                if self._stack[-1][0] != opener:
+                    self._fail(f"Mismatched '{ch}'")
+                _, _, start = self._stack.pop()
+                if not self._stack:
+                    self._end = self._pos + 1
+                elif self._is_item(ch):
+                    completed.append(self._decode_item(text[start:self._pos + 1]))
+                self._pending_key = None
+                self._last_string = None
+            elif ch == ",":
+                self._pending_key = None
+                self._last_string = None
+            elif ch not in _BARE_CHARS:
+                self._fail(f"Unexpected character {ch!r}")
+
+            self._pos += 1
+
+        return completed
+
+    def _is_item(self, closed: str) -> bool:
+        """True if the object just closed was a direct element of the top-level "mappings" array."""
+        return (
+            closed == "}"
+            and len(self._stack) == 2
+            and self._stack[-1][0] == "["
+            and self._stack[-1][1] == self.ITEMS_KEY
+        )
+
+    def _decode_item(self, raw: str) -> Dict[str, Any]:
+        try:
+            item = json.loads(raw)
+        except json.JSONDecodeError as e:
+            self._fail(f"Malformed mapping object ({e.msg})")
+        missing = [k for k in self.REQUIRED_KEYS if k not in item]
+        if missing:
+            self._fail(f"Mapping object missing {missing}")
+        return item
+
+    @property
+    def done(self) -> bool:
+        return self._end is not None
+
+    def finish(self) -> Dict[str, Any]:
+        """Returns the whole decoded document; raises if the stream ended early."""
+        if self._end is None:
+            raise StreamParseError("Stream ended before the JSON document was complete")
+        try:
+            return json.loads(self.text[self._start:self._end])
+        except json.JSONDecodeError as e:
+            raise StreamParseError(f"Invalid JSON document ({e.msg})") from e
@@ -0,0 +1,152 @@
+import math
+import re
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple, Iterable
+
+from langchain_core.documents import Document
+
+from ..mappers.schema_loader import SchemaOrgLoader
+
+_CAMEL_BOUNDARY = re.compile(r"(?<=[a-z0-9])(?=[A-Z])|(?<=[A-Z])(?=[A-Z][a-z])")
+_NON_ALNUM = re.compile(r"[^A-Za-z0-9]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Splits identifiers and free text into lowercase word tokens.
+    e.g. "first_name" -> ["first", "name"], "dateCreated" -> ["date", "created"]
+    """
+    tokens = []
+    for chunk in _NON_ALNUM.split(text):
+        if chunk:
+            tokens.extend(part.lower() for part in _CAMEL_BOUNDARY.split(chunk) if part)
+    return tokens
+
+
+def trigrams(tokens: List[str]) -> Set[str]:
+    """
+    Character trigrams of the joined tokens, padded so short words still get grams.
+    "first_name" and "firstName" yield the same set.
+    """
+    text = "$$" + "".join(tokens) + "$"
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class LexicalIndex:
+    """
+    In-memory inverted index over Schema.org labels.
+    Combines BM25 over word tokens with character-trigram (Dice) similarity,
+    so near-exact column names like `email` or `created_at` resolve without embeddings.
+    """
+
+    # Weights of the two signals in the final lexical score (sum to 1.0)
+    TRIGRAM_WEIGHT = 0.6
+    BM25_WEIGHT = 0.4
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.documents: List[Document] = []
+        self._labels: List[str] = []
+        self._doc_lengths: List[int] = []
+        self._doc_grams: List[int] = []
+        self._exact: Dict[str, List[int]] = defaultdict(list)
+        self._postings: Dict[str, Dict[int, int]] = defaultdict(dict)
+        self._gram_postings: Dict[str, List[int]] = defaultdict(list)
+        self._total_length = 0
+        self._avg_length = 0.0
+
+    def add(self, label: str, document: Document):
+        """Adds one labelled document to the index."""
+        idx = len(self.documents)
+        tokens = tokenize(label)
+        self.documents.append(document)
+        self._labels.append(label)
+        self._doc_lengths.append(len(tokens))
+        self._total_length += len(tokens)
+        self._exact["".join(tokens)].append(idx)
+
+        for token in tokens:
+            self._postings[token][idx] = self._postings[token].get(idx, 0) + 1
+        grams = trigrams(tokens)
+        self._doc_grams.append(len(grams))
+        for gram in grams:
+            self._gram_postings[gram].append(idx)
+
+        self._avg_length = self._total_length / len(self._doc_lengths)
+
+    @classmethod
+    def from_schema(cls, loader: SchemaOrgLoader, kind: str = "class") -> "LexicalIndex":
+        """
+        Builds an index over Schema.org class labels (kind="class")
+        or property labels (kind="property").
+        """
+        index = cls()
+        nodes = loader.get_classes() if kind == "class" else loader.get_properties()
+        for node in nodes:
+            label = loader.node_text(node.get("rdfs:label"))
+            if not label:
+                continue
+            comment = loader.node_text(node.get("rdfs:comment"))
+            prefix = "Class" if kind == "class" else "Property"
+            index.add(label, Document(
+                page_content=f"{prefix}: {label}\nDescription: {comment}",
+                metadata={"source": "schema.org", "id": str(node.get("@id", "")), "label": label},
+            ))
+        return index
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def _idf(self, token: str) -> float:
+        n = len(self.documents)
+        df = len(self._postings.get(token, ()))
+        return math.log(1 + (n - df + 0.5) / (df + 0.5))
+
+    def search(
+        self,
+        query: str,
+        k: int = 3,
+        allowed_labels: Optional[Iterable[str]] = None,
+    ) -> List[Tuple[Document, float]]:
+        """
+        Returns up to k (Document, score) pairs with scores in [0, 1].
+        A normalized exact label match always scores 1.0.
+        """
+        tokens = tokenize(query)
+        if not tokens or not self.documents:
+            return []
+        allowed = set(allowed_labels) if allowed_labels is not None else None
+
+        # BM25 over word tokens
+        bm25: Dict[int, float] = defaultdict(float)
+        ideal = 0.0
+        for token in set(tokens):
+            idf = self._idf(token)
+            ideal += idf
+            for idx, tf in self._postings.get(token, {}).items():
+                norm = 1 - self.b + self.b * self._doc_lengths[idx] / self._avg_length
+                bm25[idx] += idf * tf * (self.k1 + 1) / (tf + self.k1 * norm)
+
+        # Character trigram overlap
+        query_grams = trigrams(tokens)
+        shared: Dict[int, int] = defaultdict(int)
+        for gram in query_grams:
+            for idx in self._gram_postings.get(gram, ()):
+                shared[idx] += 1
+
+        exact = set(self._exact.get("".join(tokens), ()))
+        scored = []
+        for idx in set(bm25) | set(shared):
+            if allowed is not None and self._labels[idx] not in allowed:
+                continue
+            if idx in exact:
+                score = 1.0
+            else:
+                dice = 2 * shared.get(idx, 0) / (len(query_grams) + self._doc_grams[idx])
+                bm25_norm = min(bm25.get(idx, 0.0) / ideal, 1.0) if ideal else 0.0
+                score = self.TRIGRAM_WEIGHT * dice + self.BM25_WEIGHT * bm25_norm
+            scored.append((score, idx))
+
+        scored.sort(key=lambda item: (-item[0], self._labels[item[1]]))
+        return [(self.documents[idx], score) for score, idx in scored[:k]]
@@ -0,0 +1,197 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Iterable, Optional, Dict
+
+from .domain import RawTable
+from .lexical_index import tokenize
+from ..config.settings import settings
+
+
+def normalize_table_name(name: str) -> str:
+    """
+    Canonical table name: drops schema/db prefixes and quoting, unifies case style.
+    e.g. '"public"."AuthUser"' -> 'auth_user', 'auth_user' -> 'auth_user'
+    """
+    name = name.strip('`"[] ').split(".")[-1].strip('`"[] ')
+    return "_".join(tokenize(name))
+
+
+def normalize_type(original_type: str) -> str:
+    """Lowercases and collapses whitespace so 'VARCHAR(254)  NOT NULL' == 'varchar(254) not null'."""
+    return " ".join(original_type.lower().split())
+
+
+def table_signature(
+    table: RawTable,
+    candidate_classes: Iterable[str],
+    prompt_version: str,
+    model_id: Optional[str],
+) -> str:
+    """
+    Canonical cache key for a mapping request: normalized table name, sorted
+    (column, type) pairs, candidate class set, prompt template version and model id.
+    """
+    payload = {
+        "table": normalize_table_name(table.name),
+        "columns": sorted((normalize_table_name(c.name), normalize_type(c.original_type)) for c in table.columns),
+        "candidates": sorted(set(candidate_classes)),
+        "prompt_version": prompt_version,
+        "model": model_id or "",
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class MappingCache:
+    """
+    Persistent sqlite-backed cache of LLM mapping results.
+
+    - TTL: entries older than `ttl_seconds` are treated as misses and removed.
+    - LRU: when more than `max_entries` are stored, the least recently used are evicted.
+      The entry count is read inside the writing transaction, so several
+      processes can share one cache file.
+    - Hits don't write: their access times are buffered and flushed in one
+      batch every `TOUCH_BATCH` hits, before each write, and on close.
+    - `bypass=True` skips lookups but still writes fresh results (forces a refresh).
+    """
+
+    TOUCH_BATCH = 256
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        ttl_seconds: Optional[int] = None,
+        max_entries: Optional[int] = None,
+        bypass: bool = False,
+    ):
+        self.path = Path(path) if path else settings.DATA_DIR / "cache" / "mapping_cache.sqlite"
+        os.makedirs(self.path.parent, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.bypass = bypass
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0, "expired": 0}
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS mapping_cache ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " last_access REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_mapping_cache_lru ON mapping_cache(last_access)")
+        self._conn.commit()
+        # key -> last access time, not yet written
+        self._touched: Dict[str, float] = {}
+
+    @classmethod
+    def from_settings(cls) -> Optional["MappingCache"]:
+        """Returns the configured cache, or None if caching is disabled."""
+        if not settings.LLM_CACHE_ENABLED:
+            return None
+        return cls(
+            path=settings.LLM_CACHE_PATH,
+            ttl_seconds=settings.LLM_CACHE_TTL_SECONDS,
+            max_entries=settings.LLM_CACHE_MAX_ENTRIES,
+            bypass=settings.LLM_CACHE_BYPASS,
+        )
+
+    def get(self, key: str) -> Optional[str]:
+        """Returns the cached value, or None on miss / expiry / bypass."""
+        if self.bypass:
+            self.stats["misses"] += 1
+            return None
+
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM mapping_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.stats["misses"] += 1
+                return None
+
+            value, created_at = row
+            if self.ttl_seconds is not None and now - created_at > self.ttl_seconds:
+                self._conn.execute("DELETE FROM mapping_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                self._touched.pop(key, None)
+                self.stats["expired"] += 1
+                self.stats["misses"] += 1
+                return None
+
+            self._touched[key] = now
+            if len(self._touched) >= self.TOUCH_BATCH:
+                self._write_touches()
+                self._conn.commit()
+            self.stats["hits"] += 1
+            return value
+
+    def _write_touches(self):
+        """Writes buffered access times (caller holds the lock and commits)."""
+        if self._touched:
+            self._conn.executemany(
+                "UPDATE mapping_cache SET last_access = ? WHERE key = ? AND last_access < ?",
+                [(ts, key, ts) for key, ts in self._touched.items()],
+            )
+            self._touched.clear()
+
+    def flush(self):
+        """Writes buffered access times now."""
+        with self._lock:
+            self._write_touches()
+            self._conn.commit()
+
+    def put(self, key: str, value: str):
+        """Stores a value, evicting least-recently-used entries beyond max_entries."""
+        now = time.time()
+        with self._lock:
+            # The INSERT takes sqlite's write lock, so the count below can't
+            # change under us even when other processes share the file
+            self._conn.execute(
+                "INSERT OR REPLACE INTO mapping_cache (key, value, created_at, last_access) VALUES (?, ?, ?, ?)",
+                (key, value, now, now),
+            )
+            self._touched.pop(key, None)
+            self._write_touches()
+            self.stats["writes"] += 1
+
+            if self.max_entries is not None:
+                count = self._conn.execute("SELECT COUNT(*) FROM mapping_cache").fetchone()[0]
+                if count > self.max_entries:
+                    excess = count - self.max_entries
+                    self._conn.execute(
+                        "DELETE FROM mapping_cache WHERE key IN ("
+                        " SELECT key FROM mapping_cache ORDER BY last_access ASC LIMIT ?)",
+                        (excess,),
+                    )
+                    self.stats["evictions"] += excess
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM mapping_cache").fetchone()[0]
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return self.stats["hits"] / lookups if lookups else 0.0
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM mapping_cache")
+            self._conn.commit()
+            self._touched.clear()
+
+    def close(self):
+        with self._lock:
+            self._write_touches()
+            self._conn.commit()
+            self._conn.close()
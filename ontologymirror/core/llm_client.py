@@ -1,11 +1,15 @@
 import os
 from enum import Enum
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterator
 from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_openai import ChatOpenAI
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_community.chat_models import FakeListChatModel
 
+from ..config.settings import settings
+from .telemetry import telemetry
+from .tokens import count_tokens
+
 class LLMProvider(str, Enum):
     OPENAI = "openai"
     GEMINI = "gemini"
@@ -15,12 +19,14 @@ class LLMClient:
     """
     Unified client for interacting with different LLM providers.
     Reads configuration from environment variables.
+    `provider` overrides LLM_PROVIDER (used to build one client per provider for failover).
     """
     
-    def __init__(self):
+    def __init__(self, provider: Optional[str] = None):
         # Allow override via env vars, default to MOCK for safety
-        self.provider = os.getenv("LLM_PROVIDER", LLMProvider.MOCK)
+        self.provider = provider or os.getenv("LLM_PROVIDER", LLMProvider.MOCK)
         self.model = None
+        self.model_name = None
         self._setup_client()
         
     def _setup_client(self):
@@ -28,26 +34,33 @@ class LLMClient:
             api_key = os.getenv("OPENAI_API_KEY")
             if not api_key:
                 raise ValueError("OPENAI_API_KEY is not set")
+            self.model_name = os.getenv("OPENAI_MODEL", "gpt-4o")
             self.model = ChatOpenAI(
-                model=os.getenv("OPENAI_MODEL", "gpt-4o"),
+                model=self.model_name,
                 api_key=api_key,
-                temperature=0
+                # Any OpenAI-compatible endpoint, e.g. the local stub server
+                base_url=os.getenv("OPENAI_BASE_URL") or None,
+                temperature=0,
+                timeout=settings.LLM_REQUEST_TIMEOUT
             )
             
         elif self.provider == LLMProvider.GEMINI:
             api_key = os.getenv("GOOGLE_API_KEY")
             if not api_key:
                 raise ValueError("GOOGLE_API_KEY is not set")
+            self.model_name = os.getenv("GEMINI_MODEL", "gemini-1.5-pro")
             self.model = ChatGoogleGenerativeAI(
-                model=os.getenv("GEMINI_MODEL", "gemini-1.5-pro"),
+                model=self.model_name,
                 google_api_key=api_key,
-                temperature=0
+                temperature=0,
+                timeout=settings.LLM_REQUEST_TIMEOUT
             )
             
         else: # MOCK
             print("🤖 Using MOCK LLM (Logic-Based)")
             from .mock_llm import LogicBasedMockLLM
             self.model = LogicBasedMockLLM()
+            self.model_name = "logic_mock"
 
     def bind_json_output(self):
         """
@@ -58,6 +71,17 @@ class LLMClient:
         # Gemini handling for JSON mode varies, usually handled in prompt
         return self.model
 
+    @property
+    def provider_name(self) -> str:
+        return getattr(self.provider, "value", self.provider)
+
+    def _record_usage(self, prompt: str, completion: str):
+        """Token counters for telemetry (counting is skipped entirely while it's disabled)."""
+        if telemetry.enabled:
+            telemetry.count("llm_calls", provider=self.provider_name)
+            telemetry.count("llm_tokens_in", count_tokens(prompt, self.model_name), provider=self.provider_name)
+            telemetry.count("llm_tokens_out", count_tokens(completion, self.model_name), provider=self.provider_name)
+
     def generate(self, system_prompt: str, user_prompt: str) -> str:
         """
         Simple generation method.
@@ -66,5 +90,48 @@ class LLMClient:
             SystemMessage(content=system_prompt),
             HumanMessage(content=user_prompt)
         ]
-        response = self.model.invoke(messages)
+        with telemetry.span("llm_call", provider=self.provider_name, model=self.model_name):
+            response = self.model.invoke(messages)
+        self._record_usage(system_prompt + user_prompt, response.content)
+        return response.content
+
+    async def agenerate(self, system_prompt: str, user_prompt: str) -> str:
+        """
+        Async generation method (non-blocking, for concurrent mapping).
+        """
+        messages = [
+            SystemMessage(content=system_prompt),
+            HumanMessage(content=user_prompt)
+        ]
+        with telemetry.span("llm_call", provider=self.provider_name, model=self.model_name):
+            response = await self.model.ainvoke(messages)
+        self._record_usage(system_prompt + user_prompt, response.content)
         return response.content
+
+    def stream(self, system_prompt: str, user_prompt: str) -> Iterator[str]:
+        """
+        Streaming generation: yields text chunks as the provider produces them.
+        Closing the iterator early (e.g. after a parse error) abandons the request.
+        """
+        messages = [
+            SystemMessage(content=system_prompt),
+            HumanMessage(content=user_prompt)
+        ]
+        parts = []
+        with telemetry.span("llm_call", provider=self.provider_name, model=self.model_name, stream=True):
+            for chunk in self.model.stream(messages):
+                if chunk.content:
+                    parts.append(chunk.content)
+                    yield chunk.content
+        self._record_usage(system_prompt + user_prompt, "".join(parts))
+
+
+def create_llm_client():
+    """
+    Returns the configured client: a HedgedLLMClient over LLM_HEDGE_PROVIDERS
+    when set, otherwise a single-provider LLMClient.
+    """
+    if settings.LLM_HEDGE_PROVIDERS:
+        from .hedging import HedgedLLMClient
+        return HedgedLLMClient.from_settings()
+    return LLMClient()
@@ -1,22 +1,24 @@
-from typing import List, Optional
+import json
+from typing import List, Optional, Iterator
 from langchain_core.language_models.chat_models import BaseChatModel
-from langchain_core.messages import BaseMessage, AIMessage
-from langchain_core.outputs import ChatResult, ChatGeneration
+from langchain_core.messages import BaseMessage, AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatResult, ChatGeneration, ChatGenerationChunk
 
 class LogicBasedMockLLM(BaseChatModel):
     """
     A Mock LLM that returns different responses based on input content.
+    Understands both single-table prompts and packed multi-table prompts,
+    and supports streaming (the answer is emitted in small chunks).
     """
-    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, **kwargs) -> ChatResult:
-        last_message = messages[-1].content.lower()
-        
-        response_content = "{}"
-        
+    stream_chunk_size: int = 16
+
+    @staticmethod
+    def _respond_for(text: str) -> dict:
+        """Keyword-matched answer for one table (text is lowercased)."""
         # Simple keyword matching to simulate "intelligence"
         # Prioritize Blog detection first
-        if "blog" in last_message or "post" in last_message:
-             response_content = """
-            {
+        if "blog" in text or "post" in text:
+            return {
                 "schema_class": "BlogPosting",
                 "rationale": "Detected blog-related keywords.",
                 "mappings": [
@@ -24,10 +26,8 @@ class LogicBasedMockLLM(BaseChatModel):
                     {"original_name": "content", "schema_property": "articleBody", "reason": "Mock logic"}
                 ]
             }
-            """
-        elif "user" in last_message or "auth" in last_message:
-            response_content = """
-            {
+        elif "user" in text or "auth" in text:
+            return {
                 "schema_class": "Person",
                 "rationale": "Detected user-related fields.",
                 "mappings": [
@@ -35,19 +35,58 @@ class LogicBasedMockLLM(BaseChatModel):
                     {"original_name": "email", "schema_property": "email", "reason": "Mock logic"}
                 ]
             }
-            """
+        return {
+            "schema_class": "Thing",
+            "rationale": "No specific context detected by Mock.",
+            "mappings": []
+        }
+
+    @classmethod
+    def _packed_tables(cls, content: str) -> Optional[list]:
+        """Extracts the table list from a packed prompt, or None for single-table prompts."""
+        marker = "INPUT TABLES"
+        if marker not in content:
+            return None
+        start = content.index("[", content.index(marker))
+        end = content.index("INSTRUCTIONS:", start)
+        return json.loads(content[start:end].strip())
+
+    @staticmethod
+    def _input_table_text(content: str) -> str:
+        """
+        The INPUT TABLE part of a single-table prompt, so retrieved candidates
+        (e.g. "BlogPosting") don't trigger the keyword rules.
+        """
+        start = content.find("INPUT TABLE:")
+        end = content.find("CANDIDATE", start)
+        if start == -1 or end == -1:
+            return content
+        return content[start:end]
+
+    def _respond(self, messages: List[BaseMessage]) -> str:
+        content = messages[-1].content
+
+        packed = self._packed_tables(content)
+        if packed is not None:
+            answers = []
+            for section in packed:
+                table_text = json.dumps({"table_name": section["table_name"], "columns": section.get("columns", [])})
+                answer = self._respond_for(table_text.lower())
+                answers.append({"table_name": section["table_name"], **answer})
+            response_content = json.dumps({"tables": answers}, indent=2)
         else:
-            response_content = """
-            {
-                "schema_class": "Thing",
-                "rationale": "No specific context detected by Mock.",
-                "mappings": []
-            }
-            """
-            
-        message = AIMessage(content=response_content)
+            response_content = json.dumps(self._respond_for(self._input_table_text(content).lower()), indent=2)
+        return response_content
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager=None, **kwargs) -> ChatResult:
+        message = AIMessage(content=self._respond(messages))
         return ChatResult(generations=[ChatGeneration(message=message)])
 
+    def _stream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager=None, **kwargs) -> Iterator[ChatGenerationChunk]:
+        content = self._respond(messages)
+        for i in range(0, len(content), self.stream_chunk_size):
+            yield ChatGenerationChunk(message=AIMessageChunk(content=content[i:i + self.stream_chunk_size]))
+
     @property
     def _llm_type(self) -> str:
         return "logic_mock"
@@ -0,0 +1,91 @@
+import asyncio
+import random
+import time
+from typing import Optional
+
+from ..config.settings import settings
+
+
+class TokenBucket:
+    """
+    Async token bucket refilled continuously at `rate_per_minute`.
+    Waiters are served in FIFO order (the lock is held while sleeping).
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self.level = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, amount: float = 1.0):
+        """Waits until `amount` units are available, then takes them."""
+        # A single request larger than the bucket would otherwise wait forever
+        amount = min(amount, self.capacity)
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.level >= amount:
+                    self.level -= amount
+                    return
+                await asyncio.sleep((amount - self.level) / self.rate)
+
+    def charge(self, amount: float):
+        """Takes units without waiting (the level may go negative, delaying later callers)."""
+        self._refill()
+        self.level -= amount
+
+
+class RateLimiter:
+    """
+    Requests-per-minute + tokens-per-minute limiter for LLM calls.
+    A limit of None disables that bucket.
+    """
+
+    def __init__(self, requests_per_minute: Optional[float] = None, tokens_per_minute: Optional[float] = None):
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+
+    @classmethod
+    def from_settings(cls) -> "RateLimiter":
+        return cls(settings.LLM_REQUESTS_PER_MINUTE, settings.LLM_TOKENS_PER_MINUTE)
+
+    async def acquire(self, tokens: int):
+        if self.requests:
+            await self.requests.acquire(1)
+        if self.tokens:
+            await self.tokens.acquire(tokens)
+
+    def charge_tokens(self, tokens: int):
+        """Accounts for tokens used beyond the up-front estimate."""
+        if self.tokens and tokens > 0:
+            self.tokens.charge(tokens)
+
+
+def error_status(exc: BaseException) -> Optional[int]:
+    """Best-effort HTTP status code of a provider exception (OpenAI, Gemini, httpx...)."""
+    for candidate in (exc, getattr(exc, "response", None)):
+        for attr in ("status_code", "status", "code"):
+            value = getattr(candidate, attr, None)
+            if isinstance(value, int):
+                return value
+    return None
+
+
+def is_retryable_error(exc: BaseException) -> bool:
+    """Rate limits (429) and server errors (5xx) are worth retrying; timeouts too."""
+    if isinstance(exc, (asyncio.TimeoutError, TimeoutError, ConnectionError)):
+        return True
+    status = error_status(exc)
+    return status is not None and (status == 429 or 500 <= status < 600)
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Exponential backoff with full jitter: uniform(0, min(cap, base * 2^attempt))."""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
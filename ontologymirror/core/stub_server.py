@@ -0,0 +1,275 @@
+import json
+import random
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+from langchain_core.messages import HumanMessage, SystemMessage
+from pydantic import BaseModel
+
+from .mock_llm import LogicBasedMockLLM
+from .tokens import count_tokens
+
+
+class StubServerConfig(BaseModel):
+    """Behaviour of the stub LLM server (all randomness is seeded)."""
+    host: str = "127.0.0.1"
+    port: int = 0                               # 0 = pick a free port
+    model_name: str = "stub-gpt"
+
+    # Latency before the first byte: "fixed", "uniform" or "lognormal"
+    latency_distribution: str = "fixed"
+    latency_ms: float = 0.0                     # fixed value / uniform low / lognormal median
+    latency_max_ms: float = 0.0                 # uniform high
+    latency_sigma: float = 0.5                  # lognormal shape (bigger = heavier tail)
+
+    # Rate limits, answered with 429 + Retry-After. None = unlimited
+    requests_per_minute: Optional[float] = None
+    tokens_per_minute: Optional[float] = None
+
+    # Fault injection (probabilities per request)
+    error_rate: float = 0.0                     # Random 500/502/503
+    malformed_rate: float = 0.0                 # Answer content is truncated, invalid JSON
+
+    # Streaming
+    stream_chunk_chars: int = 16
+    stream_chunk_delay_ms: float = 0.0
+
+    seed: int = 0
+
+
+class _Bucket:
+    """Thread-safe token bucket that answers 'how long until `amount` fits' instead of waiting."""
+
+    def __init__(self, rate_per_minute: float):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = rate_per_minute
+        self.level = rate_per_minute
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def take(self, amount: float) -> float:
+        """Takes `amount` and returns 0, or returns the seconds to wait (nothing taken)."""
+        amount = min(amount, self.capacity)
+        with self.lock:
+            now = time.monotonic()
+            self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.level >= amount:
+                self.level -= amount
+                return 0.0
+            return (amount - self.level) / self.rate
+
+
+class StubLLMServer:
+    """
+    Local OpenAI-compatible chat completions server for offline load tests.
+
+    Answers POST /v1/chat/completions (plain and `stream: true` SSE) with the
+    schema-aware answers of LogicBasedMockLLM, after injecting the configured
+    latency, rate limits and faults. Point LLMClient at it with
+    LLM_PROVIDER=openai and OPENAI_BASE_URL=<server.base_url>.
+
+        with StubLLMServer(StubServerConfig(latency_ms=200, error_rate=0.05)) as server:
+            ...
+    """
+
+    def __init__(self, config: Optional[StubServerConfig] = None):
+        self.config = config or StubServerConfig()
+        self.stats: Dict[str, int] = {"requests": 0, "ok": 0, "rate_limited": 0, "errors": 0, "malformed": 0, "streams": 0}
+        self._mock = LogicBasedMockLLM()
+        self._rng = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self._requests = _Bucket(self.config.requests_per_minute) if self.config.requests_per_minute else None
+        self._tokens = _Bucket(self.config.tokens_per_minute) if self.config.tokens_per_minute else None
+        self._httpd: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "StubLLMServer":
+        server = self
+
+        class Handler(_StubHandler):
+            stub = server
+
+        self._httpd = ThreadingHTTPServer((self.config.host, self.config.port), Handler)
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def __enter__(self) -> "StubLLMServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def serve_forever(self):
+        """Blocking mode for the CLI."""
+        self.start()
+        print(f"🧪 Stub LLM server listening on {self.base_url}")
+        try:
+            self._thread.join()
+        except KeyboardInterrupt:
+            self.stop()
+
+    def _count(self, key: str):
+        with self._lock:
+            self.stats[key] += 1
+
+    def draw(self) -> Tuple[float, bool, bool]:
+        """Seeded per-request draws: (latency seconds, inject 5xx, inject malformed)."""
+        cfg = self.config
+        with self._lock:
+            if cfg.latency_distribution == "uniform":
+                latency = self._rng.uniform(cfg.latency_ms, max(cfg.latency_ms, cfg.latency_max_ms))
+            elif cfg.latency_distribution == "lognormal":
+                latency = cfg.latency_ms * self._rng.lognormvariate(0.0, cfg.latency_sigma)
+            else:
+                latency = cfg.latency_ms
+            error = self._rng.random() < cfg.error_rate
+            malformed = self._rng.random() < cfg.malformed_rate
+        return latency / 1000.0, error, malformed
+
+    def check_limits(self, tokens: int) -> float:
+        """Seconds the client must wait (0 if the request is admitted)."""
+        if self._requests:
+            wait = self._requests.take(1)
+            if wait:
+                return wait
+        if self._tokens:
+            return self._tokens.take(tokens)
+        return 0.0
+
+    def answer(self, messages: List[dict]) -> str:
+        lc_messages = [
+            SystemMessage(content=m.get("content", "")) if m.get("role") == "system"
+            else HumanMessage(content=m.get("content", ""))
+            for m in messages
+        ]
+        return self._mock._respond(lc_messages)
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    stub: StubLLMServer
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass  # Keep load tests quiet
+
+    def _send_json(self, status: int, payload: dict, headers: Optional[Dict[str, str]] = None):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _error(self, status: int, message: str, kind: str, headers: Optional[Dict[str, str]] = None):
+        self._send_json(status, {"error": {"message": message, "type": kind, "code": status}}, headers)
+
+    def do_POST(self):
+        stub = self.stub
+        if self.path.rstrip("/") not in ("/v1/chat/completions", "/chat/completions"):
+            self._error(404, f"Unknown path {self.path}", "not_found")
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length) or b"{}")
+            messages = request["messages"]
+        except (ValueError, KeyError) as e:
+            self._error(400, f"Invalid request: {e}", "invalid_request_error")
+            return
+
+        stub._count("requests")
+        prompt_tokens = count_tokens("".join(m.get("content", "") for m in messages), stub.config.model_name)
+        wait = stub.check_limits(prompt_tokens)
+        if wait:
+            stub._count("rate_limited")
+            self._error(429, "Rate limit reached", "rate_limit_exceeded",
+                        {"Retry-After": f"{wait:.3f}", "retry-after-ms": str(int(wait * 1000))})
+            return
+
+        latency, error, malformed = stub.draw()
+        time.sleep(latency)
+        if error:
+            stub._count("errors")
+            status = stub._rng.choice((500, 502, 503))
+            self._error(status, "Injected server error", "server_error")
+            return
+
+        content = stub.answer(messages)
+        if malformed:
+            stub._count("malformed")
+            content = content[: max(1, len(content) // 2)]
+        completion_tokens = count_tokens(content, stub.config.model_name)
+
+        if request.get("stream"):
+            stub._count("streams")
+            self._stream(request, content)
+        else:
+            self._send_json(200, {
+                "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": request.get("model", stub.config.model_name),
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": "stop",
+                }],
+                "usage": {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": completion_tokens,
+                    "total_tokens": prompt_tokens + completion_tokens,
+                },
+            })
+        stub._count("ok")
+
+    def _stream(self, request: dict, content: str):
+        """Server-sent events in the OpenAI chunk format, ending with [DONE]."""
+        cfg = self.stub.config
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+        base = {
+            "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": request.get("model", cfg.model_name),
+        }
+
+        def event(delta: dict, finish_reason=None):
+            chunk = {**base, "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}]}
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+
+        try:
+            event({"role": "assistant", "content": ""})
+            for i in range(0, len(content), cfg.stream_chunk_chars):
+                if cfg.stream_chunk_delay_ms:
+                    time.sleep(cfg.stream_chunk_delay_ms / 1000.0)
+                event({"content": content[i:i + cfg.stream_chunk_chars]})
+            event({}, "stop")
+            self.wfile.write(b"data: [DONE]\n\n")
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # The client aborted the stream
@@ -0,0 +1,422 @@
+import atexit
+import bisect
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ..config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+METRIC_PREFIX = "ontologymirror"
+# Seconds; covers a sub-millisecond parse up to a slow LLM call
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def configure_logging(level: Optional[str] = None):
+    """Routes the package's log records to stderr at LOG_LEVEL, as bare messages like the prints they replace."""
+    root = logging.getLogger("ontologymirror")
+    root.setLevel((level or settings.LOG_LEVEL).upper())
+    if not root.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        root.addHandler(handler)
+        root.propagate = False
+
+
+class _NoopSpan:
+    """Returned by Telemetry.span while disabled: one shared object, nothing recorded."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **attrs):
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class Span:
+    __slots__ = ("telemetry", "name", "attrs", "start", "end")
+
+    def __init__(self, telemetry: "Telemetry", name: str, attrs: Dict[str, Any]):
+        self.telemetry = telemetry
+        self.name = name
+        self.attrs = attrs
+        self.start = 0.0
+        self.end = 0.0
+
+    def set(self, **attrs):
+        """Adds attributes once they're known (e.g. the number of tables parsed)."""
+        self.attrs.update(attrs)
+
+    def __enter__(self) -> "Span":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.end = time.perf_counter()
+        if exc_type is not None:
+            self.attrs["error"] = exc_type.__name__
+        self.telemetry._finish(self)
+        return False
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+
+class Histogram:
+    """Cumulative-bucket histogram, Prometheus style."""
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # Last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-quantile (inf if beyond the last bucket)."""
+        if not self.count:
+            return 0.0
+        target, seen = q * self.count, 0
+        for bound, n in zip(self.buckets, self.counts):
+            seen += n
+            if seen >= target:
+                return bound
+        return float("inf")
+
+
+class SamplingProfiler:
+    """
+    Statistical profiler: a background thread snapshots every thread's stack
+    each `interval` seconds and counts the collapsed stacks. Output is the
+    "folded" format read by flamegraph.pl, speedscope and inferno.
+    """
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "SamplingProfiler":
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="telemetry-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        own = threading.get_ident()
+        names = {}
+        while not self._stop.wait(self.interval):
+            for tid, frame in sys._current_frames().items():
+                if tid == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                    frame = frame.f_back
+                if tid not in names:
+                    names = {t.ident: t.name for t in threading.enumerate()}
+                stack.append(names.get(tid, str(tid)))
+                self.samples[";".join(reversed(stack))] += 1
+
+    def top(self, n: int = 20) -> List[Tuple[str, int]]:
+        """Functions with the most samples on top of the stack (self time)."""
+        leaves: Counter = Counter()
+        for stack, count in self.samples.items():
+            leaves[stack.rsplit(";", 1)[-1]] += count
+        return leaves.most_common(n)
+
+    def write_folded(self, path: str):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self.samples.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+class Telemetry:
+    """
+    In-process spans, counters and histograms.
+
+    While disabled, `span()` hands back a shared no-op object and `count()` /
+    `observe()` return after one attribute check, so instrumented hot paths
+    cost next to nothing. While enabled:
+      - every span is kept (up to `max_spans`) for the JSON trace and its
+        duration is observed in the `span_seconds{span=...}` histogram;
+      - counters and histograms are exported as a Prometheus textfile.
+    Metrics are per process: work run in a process pool goes through
+    `run_collected`, which ships the worker's spans and metrics back to be
+    `merge`d into the parent's instance.
+    """
+
+    def __init__(self, enabled: bool = False, max_spans: Optional[int] = None):
+        self.enabled = enabled
+        self.max_spans = max_spans or settings.TELEMETRY_MAX_SPANS
+        self.profiler: Optional[SamplingProfiler] = None
+        self._lock = threading.Lock()
+        self._exit_registered = False
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            # (name, start, end, pid, tid, attrs); start/end on this process's perf_counter
+            self.spans: List[Tuple[str, float, float, int, int, Dict[str, Any]]] = []
+            self.dropped_spans = 0
+            self.counters: Dict[str, Dict[LabelKey, float]] = {}
+            self.histograms: Dict[str, Dict[LabelKey, Histogram]] = {}
+            self.started_at = time.time()
+            self._origin = time.perf_counter()
+
+    @classmethod
+    def from_settings(cls) -> "Telemetry":
+        return cls(enabled=settings.TELEMETRY_ENABLED)
+
+    # ------------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------------
+
+    def span(self, name: str, **attrs):
+        """Context manager timing a block: `with telemetry.span("parse_file", file=path): ...`"""
+        if not self.enabled:
+            return _NOOP_SPAN
+        return Span(self, name, attrs)
+
+    def _finish(self, span: Span):
+        with self._lock:
+            if len(self.spans) < self.max_spans:
+                self.spans.append((span.name, span.start, span.end, os.getpid(), threading.get_ident(), span.attrs))
+            else:
+                self.dropped_spans += 1
+            self._histogram("span_seconds", (("span", span.name),)).observe(span.duration)
+
+    def count(self, name: str, value: float = 1, **labels):
+        if not self.enabled:
+            return
+        key = tuple(sorted((k, str(v)) for k, v in labels.items()))
+        with self._lock:
+            series = self.counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels):
+        if not self.enabled:
+            return
+        key = tuple(sorted((k, str(v)) for k, v in labels.items()))
+        with self._lock:
+            self._histogram(name, key).observe(value)
+
+    def _histogram(self, name: str, key: LabelKey) -> Histogram:
+        series = self.histograms.setdefault(name, {})
+        histogram = series.get(key)
+        if histogram is None:
+            histogram = series[key] = Histogram()
+        return histogram
+
+    def counter_value(self, name: str, **labels) -> float:
+        """Sum of a counter over all series matching `labels`."""
+        wanted = {(k, str(v)) for k, v in labels.items()}
+        with self._lock:
+            return sum(v for key, v in self.counters.get(name, {}).items() if wanted <= set(key))
+
+    # ------------------------------------------------------------------
+    # Cross-process
+    # ------------------------------------------------------------------
+
+    def collect(self) -> Dict[str, Any]:
+        """
+        Hands over (and clears) everything recorded so far as a picklable dict,
+        with span times converted to wall-clock seconds for `merge`.
+        """
+        offset = time.time() - time.perf_counter()
+        with self._lock:
+            data = {
+                "spans": [(name, start + offset, end + offset, pid, tid, attrs)
+                          for name, start, end, pid, tid, attrs in self.spans],
+                "dropped_spans": self.dropped_spans,
+                "counters": self.counters,
+                "histograms": {name: {key: (h.buckets, h.counts, h.sum, h.count) for key, h in series.items()}
+                               for name, series in self.histograms.items()},
+            }
+            self.spans, self.dropped_spans, self.counters, self.histograms = [], 0, {}, {}
+        return data
+
+    def merge(self, data: Dict[str, Any]):
+        """Adds what another process's `collect()` returned to this instance."""
+        offset = time.perf_counter() - time.time()
+        with self._lock:
+            room = max(self.max_spans - len(self.spans), 0)
+            self.spans.extend((name, start + offset, end + offset, pid, tid, attrs)
+                              for name, start, end, pid, tid, attrs in data["spans"][:room])
+            self.dropped_spans += data["dropped_spans"] + max(len(data["spans"]) - room, 0)
+            for name, series in data["counters"].items():
+                mine = self.counters.setdefault(name, {})
+                for key, value in series.items():
+                    mine[key] = mine.get(key, 0) + value
+            for name, series in data["histograms"].items():
+                for key, (buckets, counts, total, count) in series.items():
+                    h = self.histograms.setdefault(name, {}).get(key)
+                    if h is None:
+                        h = self.histograms[name][key] = Histogram(buckets)
+                    h.counts = [a + b for a, b in zip(h.counts, counts)]
+                    h.sum += total
+                    h.count += count
+
+    # ------------------------------------------------------------------
+    # Export
+    # ------------------------------------------------------------------
+
+    def trace(self) -> Dict[str, Any]:
+        """Chrome trace-event JSON (load in chrome://tracing or ui.perfetto.dev)."""
+        with self._lock:
+            events = [
+                {"name": name, "ph": "X", "pid": pid, "tid": tid,
+                 "ts": round((start - self._origin) * 1e6, 1), "dur": round((end - start) * 1e6, 1),
+                 "args": {k: v if isinstance(v, (int, float, bool, str)) or v is None else str(v)
+                          for k, v in attrs.items()}}
+                for name, start, end, pid, tid, attrs in self.spans
+            ]
+            dropped = self.dropped_spans
+        return {"traceEvents": events, "displayTimeUnit": "ms",
+                "otherData": {"started_at": self.started_at, "dropped_spans": dropped}}
+
+    @staticmethod
+    def _labels(key: LabelKey, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+        pairs = key + extra
+        if not pairs:
+            return ""
+        escaped = (v.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n") for _, v in pairs)
+        return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+    def prometheus_text(self) -> str:
+        """Counters, histograms and per-second rates in the Prometheus text exposition format."""
+        lines = []
+        uptime = max(time.time() - self.started_at, 1e-9)
+        with self._lock:
+            for name in sorted(self.counters):
+                metric = f"{METRIC_PREFIX}_{name}_total"
+                lines += [f"# TYPE {metric} counter"]
+                lines += [f"{metric}{self._labels(key)} {value:g}" for key, value in sorted(self.counters[name].items())]
+                rate = f"{METRIC_PREFIX}_{name}_per_second"
+                lines += [f"# TYPE {rate} gauge"]
+                lines += [f"{rate}{self._labels(key)} {value / uptime:.6g}"
+                          for key, value in sorted(self.counters[name].items())]
+            for name in sorted(self.histograms):
+                metric = f"{METRIC_PREFIX}_{name}"
+                lines.append(f"# TYPE {metric} histogram")
+                for key, h in sorted(self.histograms[name].items()):
+                    cumulative = 0
+                    for bound, n in zip(h.buckets + (float("inf"),), h.counts):
+                        cumulative += n
+                        le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                        lines.append(f"{metric}_bucket{self._labels(key, (('le', le),))} {cumulative}")
+                    lines.append(f"{metric}_sum{self._labels(key)} {h.sum:.6g}")
+                    lines.append(f"{metric}_count{self._labels(key)} {h.count}")
+        lines.append(f"# TYPE {METRIC_PREFIX}_uptime_seconds gauge")
+        lines.append(f"{METRIC_PREFIX}_uptime_seconds {uptime:.3f}")
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _write_atomic(path: str, text: str):
+        # The textfile collector may read at any time: never expose a half-written file
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp, path)
+
+    def write_trace(self, path: str):
+        self._write_atomic(str(path), json.dumps(self.trace()))
+
+    def write_prometheus(self, path: str):
+        self._write_atomic(str(path), self.prometheus_text())
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self, profile: Optional[bool] = None) -> "Telemetry":
+        """
+        Starts the sampling profiler if asked to (TELEMETRY_PROFILE) and
+        registers `shutdown` to run at exit. No-op while disabled.
+        """
+        if not self.enabled:
+            return self
+        if (settings.TELEMETRY_PROFILE if profile is None else profile) and self.profiler is None:
+            self.profiler = SamplingProfiler(settings.TELEMETRY_PROFILE_INTERVAL_MS / 1000.0).start()
+        if not self._exit_registered:
+            atexit.register(self.shutdown)
+            self._exit_registered = True
+        return self
+
+    def shutdown(self):
+        """Stops the profiler and writes the configured trace / metrics / profile files."""
+        if not self.enabled:
+            return
+        if self._exit_registered:
+            atexit.unregister(self.shutdown)
+            self._exit_registered = False
+        if self.profiler is not None:
+            self.profiler.stop()
+            path = settings.TELEMETRY_PROFILE_PATH or settings.DATA_DIR / "profile.folded"
+            self.profiler.write_folded(str(path))
+            logger.info("🔬 Profile written to %s", path)
+            self.profiler = None
+        if settings.TELEMETRY_TRACE_PATH:
+            self.write_trace(str(settings.TELEMETRY_TRACE_PATH))
+            logger.info("🧭 Trace written to %s", settings.TELEMETRY_TRACE_PATH)
+        if settings.TELEMETRY_PROMETHEUS_PATH:
+            self.write_prometheus(str(settings.TELEMETRY_PROMETHEUS_PATH))
+            logger.info("📈 Metrics written to %s", settings.TELEMETRY_PROMETHEUS_PATH)
+
+
+# Process-wide instance used by the instrumented modules
+telemetry = Telemetry.from_settings()
+
+
+def run_collected(enabled: bool, fn: Callable[..., Any], *args) -> Tuple[Any, Optional[Dict[str, Any]]]:
+    """
+    Runs `fn(*args)` inside a pool worker process with telemetry switched to
+    the parent's `enabled` state (spawned workers re-read TELEMETRY_ENABLED,
+    not the parent's runtime flag). Returns (result, collected metrics or
+    None) so the parent can `telemetry.merge()` them. If `fn` raises, the
+    metrics recorded up to the failure are attached to the exception as
+    `telemetry`.
+    """
+    telemetry.enabled = enabled
+    error: Optional[BaseException] = None
+    try:
+        result = fn(*args)
+    except BaseException as e:
+        error = e
+        raise
+    finally:
+        # Always collect, so a failed call's spans don't end up in the next task's
+        collected = telemetry.collect() if enabled else None
+        if error is not None:
+            error.telemetry = collected  # Pickled back to the parent with the exception
+    return result, collected
@@ -0,0 +1,37 @@
+from functools import lru_cache
+from typing import Optional
+
+# Fallback ratio when no tiktoken encoding is available (e.g. offline, mock model)
+CHARS_PER_TOKEN = 4
+
+
+@lru_cache(maxsize=None)
+def _encoding_for(model_name: Optional[str]):
+    """
+    Resolves (and caches) the tiktoken encoding for a model.
+    Returns None if tiktoken or its encoding files are unavailable.
+    """
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model_name or "")
+    except KeyError:
+        pass
+    except Exception:
+        return None
+    try:
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        return None
+
+
+def count_tokens(text: str, model_name: Optional[str] = None) -> int:
+    """
+    Counts tokens with tiktoken, falling back to a character-based estimate.
+    """
+    encoding = _encoding_for(model_name)
+    if encoding is None:
+        return max(1, len(text) // CHARS_PER_TOKEN)
+    return len(encoding.encode(text, disallowed_special=()))
@@ -1,5 +1,6 @@
 import os
-from typing import List, Dict, Any, Optional
+import logging
+from typing import List, Dict, Any, Optional, Iterable, Tuple
 from pathlib import Path
 
 # LangChain imports
@@ -7,9 +8,30 @@ from langchain_community.vectorstores import Chroma
 from langchain_community.embeddings import FakeEmbeddings  # For testing without API keys, replace later
 # from langchain_openai import OpenAIEmbeddings # For production
 from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
 
 from ..mappers.schema_loader import SchemaOrgLoader
+from .lexical_index import LexicalIndex
 from ..config.settings import settings
+from .telemetry import telemetry
+
+logger = logging.getLogger(__name__)
+
+
+class _TracedEmbeddings(Embeddings):
+    """Wraps an embedding function so every embedding call, including those Chroma makes, gets an "embed" span."""
+
+    def __init__(self, inner: Embeddings):
+        self.inner = inner
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        with telemetry.span("embed", texts=len(texts)):
+            return self.inner.embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        with telemetry.span("embed", texts=1):
+            return self.inner.embed_query(text)
+
 
 class SchemaVectorStore:
     """
@@ -18,8 +40,14 @@ class SchemaVectorStore:
     """
     
     COLLECTION_NAME = "schema_org_classes"
+    PROPERTY_COLLECTION_NAME = "schema_org_properties"
+    # How many lexical hits to keep around for fusion with dense results
+    LEXICAL_POOL = 10
+    # Cosine distance keeps relevance (1 - distance) meaningful for embeddings that
+    # aren't unit-normalized. Only applies to newly created collections.
+    COLLECTION_METADATA = {"hnsw:space": "cosine"}
     
-    def __init__(self, persist_directory: Optional[str] = None):
+    def __init__(self, persist_directory: Optional[str] = None, embedding_fn=None, loader: Optional[SchemaOrgLoader] = None):
         if persist_directory:
             self.persist_dir = persist_directory
         else:
@@ -32,25 +60,95 @@ class SchemaVectorStore:
         # For Stage 1 demo, we can use a SentenceTransformer locally if installed,
         # or FakeEmbeddings to just test the flow (but Fake won't give semantic results).
         # Let's try to load a real local model if possible, or fallback to Fake for now.
-        try:
-            from langchain_community.embeddings import HuggingFaceEmbeddings
-            print("🧠 Loading local embedding model (all-MiniLM-L6-v2)...")
-            self.embedding_fn = HuggingFaceEmbeddings(model_name="all-MiniLM-L6-v2")
-        except ImportError:
-            print("⚠️ sentence-transformers not found, using FakeEmbeddings (Results will be random!)")
-            self.embedding_fn = FakeEmbeddings(size=384)
+        if embedding_fn is not None:
+            self.embedding_fn = embedding_fn
+        else:
+            try:
+                from langchain_community.embeddings import HuggingFaceEmbeddings
+                print("🧠 Loading local embedding model (all-MiniLM-L6-v2)...")
+                self.embedding_fn = HuggingFaceEmbeddings(model_name="all-MiniLM-L6-v2")
+            except ImportError:
+                print("⚠️ sentence-transformers not found, using FakeEmbeddings (Results will be random!)")
+                self.embedding_fn = FakeEmbeddings(size=384)
+        if telemetry.enabled:
+            # Only wrapped when tracing, so disabled telemetry adds no call layer
+            self.embedding_fn = _TracedEmbeddings(self.embedding_fn)
 
         self.vector_db = Chroma(
             collection_name=self.COLLECTION_NAME,
             embedding_function=self.embedding_fn,
-            persist_directory=self.persist_dir
+            persist_directory=self.persist_dir,
+            collection_metadata=self.COLLECTION_METADATA,
+        )
+        # Second collection: one document per Schema.org property, used for
+        # per-column candidate lookup.
+        self.property_db = Chroma(
+            collection_name=self.PROPERTY_COLLECTION_NAME,
+            embedding_function=self.embedding_fn,
+            persist_directory=self.persist_dir,
+            collection_metadata=self.COLLECTION_METADATA,
         )
-        self.loader = SchemaOrgLoader()
+        self.loader = loader or SchemaOrgLoader()
+        # Lazily built BM25/trigram indexes, keyed by "class" / "property"
+        self._lexical: Dict[str, LexicalIndex] = {}
+
+    def lexical_index(self, kind: str) -> LexicalIndex:
+        """
+        Returns the in-memory lexical index over class or property labels,
+        building it from the Schema.org graph on first use.
+        """
+        if kind not in self._lexical:
+            self._lexical[kind] = LexicalIndex.from_schema(self.loader, kind=kind)
+        return self._lexical[kind]
+
+    @staticmethod
+    def _relevance_fn(db: Chroma):
+        """
+        Distance -> relevance in [0, 1] for a collection. Collections persisted
+        before the switch to cosine still use L2, whose relevance can fall far
+        outside that range; scores are clamped so the bypass thresholds hold.
+        """
+        relevance = db._select_relevance_score_fn()
+        return lambda distance: min(max(relevance(distance), 0.0), 1.0)
+
+    @staticmethod
+    def _is_lexically_confident(hits: List[Tuple[Document, float]]) -> bool:
+        """True if the lexical top hit is strong and clearly ahead of the runner-up."""
+        if not hits:
+            return False
+        top = hits[0][1]
+        runner_up = hits[1][1] if len(hits) > 1 else 0.0
+        return top >= settings.LEXICAL_ACCEPT_SCORE and top - runner_up >= settings.LEXICAL_MARGIN
+
+    @staticmethod
+    def _fuse(
+        lexical_hits: List[Tuple[Document, float]],
+        dense_hits: List[Tuple[Document, float]],
+        k: int,
+    ) -> List[Tuple[Document, float]]:
+        """
+        Weighted score fusion of lexical and dense hits (both scaled to [0, 1]),
+        merged by label.
+        """
+        weight = settings.HYBRID_LEXICAL_WEIGHT
+        fused: Dict[str, List[Any]] = {}
+        for doc, score in dense_hits:
+            fused[doc.metadata.get("label")] = [doc, (1 - weight) * score]
+        for doc, score in lexical_hits:
+            label = doc.metadata.get("label")
+            if label in fused:
+                fused[label][1] += weight * score
+            else:
+                fused[label] = [doc, weight * score]
+        ranked = sorted(fused.values(), key=lambda item: -item[1])
+        return [(doc, score) for doc, score in ranked[:k]]
 
     def build_index(self, force_rebuild: bool = False):
         """
         Loads Schema.org data, converts to Documents, and indexes them.
         """
+        self.build_property_index(force_rebuild=force_rebuild)
+
         # Check if already indexed
         if not force_rebuild and self.vector_db._collection.count() > 0:
             count = self.vector_db._collection.count()
@@ -61,10 +159,6 @@ class SchemaVectorStore:
         
         # 1. Get raw classes
         classes = self.loader.get_classes()
-        properties = self.loader.get_properties()
-        
-        # Organize properties by domain for faster lookup (optional optimization)
-        # For now, we just index classes and include their description
         
         docs = []
         print(f"   Processing {len(classes)} classes...")
@@ -102,10 +196,153 @@ class SchemaVectorStore:
         # Chroma automatically persists in newer versions, but explicitly calling it logic if needed
         print(f"✅ Indexed {len(docs)} classes successfully.")
 
+    def build_property_index(self, force_rebuild: bool = False):
+        """
+        Indexes Schema.org properties (label, comment, domainIncludes, rangeIncludes)
+        into the property collection.
+        """
+        if not force_rebuild and self.property_db._collection.count() > 0:
+            count = self.property_db._collection.count()
+            print(f"✅ Property index already contains {count} documents. Skipping build.")
+            return
+
+        print("🚀 Building Property Index from Schema.org...")
+        properties = self.loader.get_properties()
+
+        docs = []
+        for prop in properties:
+            label = self.loader.node_text(prop.get("rdfs:label"))
+            comment = self.loader.node_text(prop.get("rdfs:comment"))
+            domains = self.loader.node_refs(prop.get("schema:domainIncludes"))
+            ranges = self.loader.node_refs(prop.get("schema:rangeIncludes"))
+
+            page_content = (
+                f"Property: {label}\nDescription: {comment}\n"
+                f"Used on: {', '.join(domains)}\nExpects: {', '.join(ranges)}"
+            )
+            metadata = {
+                "source": "schema.org",
+                "id": str(prop.get("@id", "")),
+                "label": label,
+                "domains": ",".join(domains),
+                "ranges": ",".join(ranges),
+            }
+            docs.append(Document(page_content=page_content, metadata=metadata))
+
+        if docs:
+            self.property_db.add_documents(docs)
+        print(f"✅ Indexed {len(docs)} properties successfully.")
+
     def search(self, query: str, k: int = 3) -> List[Document]:
         """
         Retrieves top-k most relevant Schema.org classes.
         """
-        print(f"🔎 Searching for: '{query}'")
-        results = self.vector_db.similarity_search(query, k=k)
+        return [doc for doc, _ in self.search_with_scores(query, k)]
+
+    def search_with_scores(
+        self,
+        query: str,
+        k: int = 3,
+        lexical_query: Optional[str] = None,
+    ) -> List[Tuple[Document, float]]:
+        """
+        Retrieves top-k Schema.org classes with relevance scores in [0, 1].
+        Lexical first; dense retrieval only runs when the lexical ranking is ambiguous.
+
+        `lexical_query` (e.g. the bare table name) is matched against class labels
+        instead of `query`, so wording in a descriptive query ("Table ... with
+        columns") doesn't hit classes such as `Table`.
+        """
+        logger.debug("🔎 Searching for: '%s'", query)
+        with telemetry.span("vector_search", kind="class") as span:
+            lexical_hits = self.lexical_index("class").search(
+                query if lexical_query is None else lexical_query, k=max(k, self.LEXICAL_POOL)
+            )
+            if self._is_lexically_confident(lexical_hits):
+                span.set(dense=False)
+                telemetry.count("vector_searches", kind="class", route="lexical")
+                return lexical_hits[:k]
+            span.set(dense=True)
+            telemetry.count("vector_searches", kind="class", route="dense")
+            relevance = self._relevance_fn(self.vector_db)
+            dense_hits = [(doc, relevance(distance))
+                          for doc, distance in self.vector_db.similarity_search_with_score(query, k=k)]
+            return self._fuse(lexical_hits, dense_hits, k)
+
+    def search_properties(
+        self,
+        queries: List[str],
+        k: int = 3,
+        class_labels: Optional[Iterable[str]] = None,
+    ) -> List[List[Tuple[Document, float]]]:
+        """
+        Retrieves top-k Schema.org properties for each query in ONE vectorized call.
+
+        Each query is first answered from the lexical index. Only queries whose
+        lexical ranking is ambiguous are embedded (in a single batch) and sent to
+        Chroma as one multi-vector query; their results are fused with the lexical
+        hits. If `class_labels` is given, results are restricted to properties
+        valid for those classes (including inherited ones).
+
+        Returns:
+            One list of (Document, relevance_score) per query, in query order.
+        """
+        if not queries:
+            return []
+
+        allowed = None
+        if class_labels is not None:
+            allowed = self.loader.get_properties_for_classes(class_labels)
+            if not allowed:
+                return [[] for _ in queries]
+
+        lexical = self.lexical_index("property")
+        results: List[List[Tuple[Document, float]]] = []
+        lexical_hits = []
+        pending = []
+        for i, query in enumerate(queries):
+            hits = lexical.search(query, k=max(k, self.LEXICAL_POOL), allowed_labels=allowed)
+            lexical_hits.append(hits)
+            if self._is_lexically_confident(hits):
+                results.append(hits[:k])
+            else:
+                results.append([])
+                pending.append(i)
+
+        telemetry.count("vector_searches", len(queries) - len(pending), kind="property", route="lexical")
+        if pending:
+            telemetry.count("vector_searches", len(pending), kind="property", route="dense")
+            with telemetry.span("vector_search", kind="property", queries=len(pending)):
+                dense = self._dense_search_properties([queries[i] for i in pending], k, allowed)
+            for i, dense_hits in zip(pending, dense):
+                results[i] = self._fuse(lexical_hits[i], dense_hits, k)
+        return results
+
+    def _dense_search_properties(
+        self,
+        queries: List[str],
+        k: int,
+        allowed: Optional[set] = None,
+    ) -> List[List[Tuple[Document, float]]]:
+        """Batched embedding + single multi-vector Chroma query over the property collection."""
+        where = None
+        if allowed is not None:
+            where = {"label": {"$in": sorted(allowed)}}
+            k = min(k, len(allowed))
+
+        embeddings = self.embedding_fn.embed_documents(queries)
+        raw = self.property_db._collection.query(
+            query_embeddings=embeddings,
+            n_results=k,
+            where=where,
+            include=["documents", "metadatas", "distances"],
+        )
+
+        relevance_fn = self._relevance_fn(self.property_db)
+        results = []
+        for texts, metas, dists in zip(raw["documents"], raw["metadatas"], raw["distances"]):
+            hits = []
+            for text, meta, dist in zip(texts, metas, dists):
+                hits.append((Document(page_content=text, metadata=meta), relevance_fn(dist)))
+            results.append(hits)
         return results
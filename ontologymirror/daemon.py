@@ -0,0 +1,367 @@
+import asyncio
+import json
+import os
+import queue
+import socket
+import socketserver
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .config.settings import settings
+from .core.domain import RawTable
+from .core.rate_limit import RateLimiter
+from .extractors.sql_parser import SqlExtractor
+from .mappers.semantic_mapper import SemanticMapper, MappedTable
+
+
+def default_socket_path() -> Path:
+    return Path(settings.DAEMON_SOCKET_PATH or settings.DATA_DIR / "ontologymirror.sock")
+
+
+class DaemonStoppedError(RuntimeError):
+    """The daemon stopped before a submitted table was mapped."""
+
+
+async def _cancel_tasks():
+    """Cancels every other task on the running loop and waits until they unwind."""
+    tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def _fail_stopped(items: List[Tuple[RawTable, Future]]):
+    for _, future in items:
+        if not future.done():
+            future.set_exception(DaemonStoppedError("Mapping daemon stopped"))
+
+
+class MappingDaemon:
+    """
+    Long-lived mapping service over a Unix socket.
+
+    Keeps one SemanticMapper (embedding model, Chroma, Schema.org graph,
+    lexical indexes, lexicon, mapping cache, LLM client) warm across requests.
+
+    Protocol: one JSON object per line in each direction.
+        {"op": "ping"}
+        {"op": "map", "tables": [RawTable, ...]}      -> {"ok": true, "results": [MappedTable, ...]}
+        {"op": "extract", "path": "...", "map": bool} -> {"ok": true, "tables": [...], "results": [...]}
+        {"op": "stats"}
+        {"op": "shutdown"}
+    Errors come back as {"ok": false, "error": "..."}.
+
+    Tables from all connections go through one queue and are mapped in
+    batches of up to `batch_size` (waiting at most `batch_wait_ms` for a batch
+    to fill), concurrently on a single event loop under a shared rate limiter.
+    Up to `max_in_flight` batches run at once, so a slow batch doesn't hold
+    up the tables queued behind it. Tables still queued or mapping when the
+    daemon stops fail with DaemonStoppedError.
+    """
+
+    def __init__(
+        self,
+        mapper: Optional[SemanticMapper] = None,
+        socket_path: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        batch_wait_ms: Optional[float] = None,
+        max_in_flight: Optional[int] = None,
+    ):
+        self.mapper = mapper or SemanticMapper()
+        self.socket_path = Path(socket_path) if socket_path else default_socket_path()
+        self.batch_size = batch_size or settings.DAEMON_BATCH_SIZE
+        self.batch_wait = (batch_wait_ms if batch_wait_ms is not None else settings.DAEMON_BATCH_WAIT_MS) / 1000.0
+        self.max_in_flight = max(1, max_in_flight or settings.DAEMON_MAX_BATCHES_IN_FLIGHT)
+        self.extractor = SqlExtractor()
+        self.stats: Dict[str, int] = {"requests": 0, "tables": 0, "batches": 0, "errors": 0}
+        self._stats_lock = threading.Lock()
+        self.started_at = time.time()
+
+        self._queue: "queue.Queue[Optional[Tuple[RawTable, Future]]]" = queue.Queue()
+        self._loop = asyncio.new_event_loop()
+        self._limiter = RateLimiter.from_settings()
+        self._in_flight = threading.BoundedSemaphore(self.max_in_flight)
+        self._running: Dict[Future, List[Tuple[RawTable, Future]]] = {}  # Batch run -> its tables
+        self._submit_lock = threading.Lock()
+        self._server: Optional[socketserver.ThreadingUnixStreamServer] = None
+        self._threads: List[threading.Thread] = []
+        self._stopped = threading.Event()
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self) -> "MappingDaemon":
+        if self.socket_path.exists():
+            if MappingClient(self.socket_path).daemon_available():
+                raise RuntimeError(f"A daemon is already listening on {self.socket_path}")
+            self.socket_path.unlink()  # Stale socket from a crashed daemon
+        os.makedirs(self.socket_path.parent, exist_ok=True)
+
+        print("🔥 Warming up mapper...")
+        self.mapper.warm_up()
+
+        daemon = self
+
+        class Handler(_DaemonHandler):
+            service = daemon
+
+        self._server = socketserver.ThreadingUnixStreamServer(str(self.socket_path), Handler)
+        self._server.daemon_threads = True
+        self._threads = [
+            threading.Thread(target=self._loop.run_forever, name="daemon-loop", daemon=True),
+            threading.Thread(target=self._batcher, name="daemon-batcher", daemon=True),
+            threading.Thread(target=self._server.serve_forever, name="daemon-server", daemon=True),
+        ]
+        for t in self._threads:
+            t.start()
+        print(f"🛰️ Mapping daemon listening on {self.socket_path}")
+        return self
+
+    def stop(self):
+        with self._submit_lock:
+            if self._stopped.is_set():
+                return
+            self._stopped.set()
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+        self._queue.put(None)
+        with self._submit_lock:
+            running = dict(self._running)
+        if self._loop.is_running():
+            try:
+                asyncio.run_coroutine_threadsafe(_cancel_tasks(), self._loop).result(timeout=5)
+            except FutureTimeoutError:
+                pass  # Stuck tables are failed below all the same
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        for t in self._threads:
+            if t is not threading.current_thread():
+                t.join(timeout=5)
+
+        # Nothing maps anymore: fail whatever is still waiting so clients don't hang
+        pending = [item for batch in running.values() for item in batch]
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                pending.append(item)
+        _fail_stopped(pending)
+
+        if self.socket_path.exists():
+            self.socket_path.unlink()
+
+    def serve_forever(self):
+        self.start()
+        try:
+            self._stopped.wait()
+        except KeyboardInterrupt:
+            pass
+        self.stop()
+
+    def __enter__(self) -> "MappingDaemon":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # ------------------------------------------------------------------
+    # Batched mapping
+    # ------------------------------------------------------------------
+
+    def _bump(self, stat: str, amount: int = 1):
+        with self._stats_lock:
+            self.stats[stat] += amount
+
+    def submit(self, table: RawTable) -> Future:
+        future: Future = Future()
+        with self._submit_lock:
+            if self._stopped.is_set():
+                _fail_stopped([(table, future)])
+            else:
+                self._queue.put((table, future))
+        return future
+
+    def _batcher(self):
+        while not self._stopped.is_set():
+            first = self._queue.get()
+            if first is None:
+                return
+            batch = [first]
+            deadline = time.monotonic() + self.batch_wait
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    self._queue.put(None)
+                    break
+                batch.append(item)
+            # Wait for a free slot, not for earlier batches to finish
+            while not self._in_flight.acquire(timeout=0.1):
+                if self._stopped.is_set():
+                    _fail_stopped(batch)
+                    return
+            with self._submit_lock:
+                if self._stopped.is_set():
+                    self._in_flight.release()
+                    _fail_stopped(batch)
+                    return
+                run = asyncio.run_coroutine_threadsafe(self._map_batch(batch), self._loop)
+                self._running[run] = batch
+            run.add_done_callback(self._batch_done)
+
+    def _batch_done(self, run: Future):
+        with self._submit_lock:
+            self._running.pop(run, None)
+        self._in_flight.release()
+
+    async def _map_batch(self, batch: List[Tuple[RawTable, Future]]):
+        self._bump("batches")
+        results = await asyncio.gather(
+            *(self.mapper.amap_table(table, self._limiter) for table, _ in batch),
+            return_exceptions=True,
+        )
+        for (_, future), result in zip(batch, results):
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    def map_tables(self, tables: List[RawTable]) -> List[MappedTable]:
+        futures = [self.submit(t) for t in tables]
+        self._bump("tables", len(tables))
+        return [f.result() for f in futures]
+
+    # ------------------------------------------------------------------
+    # Requests
+    # ------------------------------------------------------------------
+
+    def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        self._bump("requests")
+        op = request.get("op")
+        if op == "ping":
+            return {"ok": True, "pid": os.getpid(), "uptime": time.time() - self.started_at}
+        if op == "map":
+            tables = [RawTable.model_validate(t) for t in request.get("tables", [])]
+            return {"ok": True, "results": [r.model_dump() for r in self.map_tables(tables)]}
+        if op == "extract":
+            tables = self.extractor.extract(request["path"])
+            response = {"ok": True, "tables": [t.model_dump() for t in tables]}
+            if request.get("map"):
+                response["results"] = [r.model_dump() for r in self.map_tables(tables)]
+            return response
+        if op == "stats":
+            with self._stats_lock:
+                daemon_stats = dict(self.stats)
+            return {"ok": True, "daemon": daemon_stats, "mapper": dict(self.mapper.stats)}
+        if op == "shutdown":
+            threading.Thread(target=self.stop, daemon=True).start()
+            return {"ok": True}
+        return {"ok": False, "error": f"Unknown op: {op!r}"}
+
+
+class _DaemonHandler(socketserver.StreamRequestHandler):
+    service: MappingDaemon
+
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                response = self.service.handle(json.loads(line))
+            except Exception as e:
+                self.service._bump("errors")
+                response = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+            self.wfile.write((json.dumps(response) + "\n").encode("utf-8"))
+            self.wfile.flush()
+
+
+class DaemonError(RuntimeError):
+    """The daemon answered a request with an error."""
+
+
+class MappingClient:
+    """
+    Thin client for MappingDaemon. If no daemon is listening, requests are
+    served in-process by a locally built SemanticMapper (created on first use
+    by `mapper_factory`), so callers work the same either way.
+    """
+
+    def __init__(
+        self,
+        socket_path: Optional[str] = None,
+        timeout: Optional[float] = None,
+        mapper_factory: Optional[Callable[[], SemanticMapper]] = None,
+    ):
+        self.socket_path = Path(socket_path) if socket_path else default_socket_path()
+        self.timeout = timeout
+        self.mapper_factory = mapper_factory or SemanticMapper
+        self.used_daemon: Optional[bool] = None
+        self._local_mapper: Optional[SemanticMapper] = None
+
+    def _request(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(self.timeout)
+            sock.connect(str(self.socket_path))
+            sock.sendall((json.dumps(payload) + "\n").encode("utf-8"))
+            with sock.makefile("rb") as f:
+                line = f.readline()
+        if not line:
+            raise ConnectionError("Daemon closed the connection")
+        response = json.loads(line)
+        if not response.get("ok"):
+            raise DaemonError(response.get("error", "unknown error"))
+        return response
+
+    def _try_daemon(self, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """The daemon's response, or None if no daemon is reachable."""
+        if not self.socket_path.exists():
+            return None
+        try:
+            return self._request(payload)
+        except (FileNotFoundError, ConnectionRefusedError):
+            return None
+
+    def daemon_available(self) -> bool:
+        try:
+            return self._try_daemon({"op": "ping"}) is not None
+        except (OSError, DaemonError):
+            return False
+
+    @property
+    def local_mapper(self) -> SemanticMapper:
+        if self._local_mapper is None:
+            print("🏠 No mapping daemon running, mapping in-process")
+            self._local_mapper = self.mapper_factory()
+        return self._local_mapper
+
+    def map_tables(self, tables: List[RawTable]) -> List[MappedTable]:
+        response = self._try_daemon({"op": "map", "tables": [t.model_dump() for t in tables]})
+        self.used_daemon = response is not None
+        if response is None:
+            return [self.local_mapper.map_table(t) for t in tables]
+        return [MappedTable.model_validate(r) for r in response["results"]]
+
+    def map_table(self, table: RawTable) -> MappedTable:
+        return self.map_tables([table])[0]
+
+    def extract(self, path: str) -> List[RawTable]:
+        # The daemon resolves paths itself, so send an absolute one
+        response = self._try_daemon({"op": "extract", "path": os.path.abspath(path)})
+        self.used_daemon = response is not None
+        if response is None:
+            return SqlExtractor().extract(path)
+        return [RawTable.model_validate(t) for t in response["tables"]]
+
+    def shutdown(self):
+        self._try_daemon({"op": "shutdown"})
@@ -1,8 +1,12 @@
 import os
+import logging
 from typing import List, Optional
 import git
 from git import Repo
 from ..config.settings import settings
+from ..core.telemetry import telemetry
+
+logger = logging.getLogger(__name__)
 
 class GitLoader:
     """
@@ -10,26 +14,44 @@ class GitLoader:
     負責將遠端 GitHub 專案 Clone 到本地 data/raw_repos 目錄。
     """
     
+    @staticmethod
+    def repo_name(repo_url: str) -> str:
+        """'https://github.com/org/app.git' -> 'app'"""
+        repo_name = repo_url.rstrip("/").split("/")[-1]
+        if repo_name.endswith(".git"):
+            repo_name = repo_name[:-4]
+        return repo_name
+
+    @staticmethod
+    def head_commit(local_path: str) -> Optional[str]:
+        """SHA of the checked-out commit, or None if it can't be read."""
+        try:
+            return Repo(local_path).head.commit.hexsha
+        except Exception:
+            return None
+
     def load_repo(self, repo_url: str) -> str:
         """
         Clones a repo and returns the local directory path.
         If repo exists, it pulls the latest changes.
         """
-        repo_name = repo_url.rstrip("/").split("/")[-1]
-        if repo_name.endswith(".git"):
-            repo_name = repo_name[:-4]
+        repo_name = self.repo_name(repo_url)
             
         local_path = settings.REPOS_DIR / repo_name
         
-        if local_path.exists():
-            print(f"🔄 Repository exists at {local_path}, pulling latest...")
-            try:
-                repo = Repo(local_path)
-                repo.remotes.origin.pull()
-            except Exception as e:
-                print(f"⚠️ Git pull failed: {e}")
-        else:
-            print(f"⬇️ Cloning {repo_url} to {local_path}...")
-            Repo.clone_from(repo_url, local_path)
+        with telemetry.span("clone", repo=repo_name) as span:
+            if local_path.exists():
+                logger.info("🔄 Repository exists at %s, pulling latest...", local_path)
+                span.set(mode="pull")
+                try:
+                    repo = Repo(local_path)
+                    repo.remotes.origin.pull()
+                except Exception as e:
+                    logger.warning("⚠️ Git pull failed: %s", e)
+                    telemetry.count("git_pull_failures")
+            else:
+                logger.info("⬇️ Cloning %s to %s...", repo_url, local_path)
+                span.set(mode="clone")
+                Repo.clone_from(repo_url, local_path)
             
         return str(local_path)
@@ -1,11 +1,15 @@
 import os
 import re
+import logging
 import sqlparse
 from sqlparse.sql import Statement, TokenList, Function, Parenthesis, IdentifierList, Identifier
 from sqlparse.tokens import Keyword, Name, DML, DDL, Punctuation
-from typing import List
+from typing import Iterator, List
 from .base import BaseExtractor
 from ..core.domain import RawTable, RawColumn
+from ..core.telemetry import telemetry
+
+logger = logging.getLogger(__name__)
 
 class SqlExtractor(BaseExtractor):
     """
@@ -14,18 +18,29 @@ class SqlExtractor(BaseExtractor):
     """
 
     def extract(self, source_path: str) -> List[RawTable]:
-        raw_tables = []
+        return list(self.iter_extract(source_path))
+
+    def iter_extract(self, source_path: str) -> Iterator[RawTable]:
+        """
+        Like `extract`, but yields tables file by file, so only one file's
+        tables are held at a time (bulk runs over large trees).
+        """
         for root, dirs, files in os.walk(source_path):
             for file in files:
                 if file.endswith(".sql"):
                     full_path = os.path.join(root, file)
-                    print(f"🔍 Parsing SQL file: {full_path}")
+                    logger.debug("🔍 Parsing SQL file: %s", full_path)
                     try:
-                        tables = self._parse_sql_file(full_path)
-                        raw_tables.extend(tables)
+                        with telemetry.span("parse_file", file=full_path) as span:
+                            tables = self._parse_sql_file(full_path)
+                            span.set(tables=len(tables))
+                        telemetry.count("files_parsed")
+                        telemetry.count("tables_extracted", len(tables))
                     except Exception as e:
-                        print(f"⚠️ Error parsing {file}: {e}")
-        return raw_tables
+                        logger.warning("⚠️ Error parsing %s: %s", file, e)
+                        telemetry.count("parse_errors")
+                        continue
+                    yield from tables
 
     def _parse_sql_file(self, file_path: str) -> List[RawTable]:
         with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
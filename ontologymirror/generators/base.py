@@ -0,0 +1,231 @@
+import gzip
+import io
+import os
+import re
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+
+from ..config.settings import settings
+from ..core.domain import MappedEntity, RawTable
+
+COMPRESSION_SUFFIXES = {None: "", "gzip": ".gz", "zstd": ".zst"}
+
+
+class GeneratedColumn(NamedTuple):
+    original_name: str
+    original_type: Optional[str]
+    schema_property: Optional[str]   # None = left unmapped
+    confidence: Optional[float]
+    source: Optional[str]
+    is_primary_key: bool = False
+
+
+class GenerationItem(NamedTuple):
+    """One mapped table, flattened from whatever result type the mapper produced."""
+    table_name: str
+    source_file: Optional[str]
+    repo: Optional[str]
+    commit: Optional[str]
+    schema_class: str
+    rationale: str
+    columns: List[GeneratedColumn]
+
+
+def to_generation_item(item: Any) -> GenerationItem:
+    """
+    Accepts a pipeline TableResult, a MappedTable, a MappedEntity or a bulk
+    results record ({"repo", "commit", "source_file", "raw_table", "result"}).
+    """
+    raw: Optional[RawTable] = None
+    if isinstance(item, MappedEntity):
+        return GenerationItem(
+            table_name=item.raw_table_name, source_file=None, repo=None, commit=None,
+            schema_class=item.schema_org_type, rationale=item.description,
+            columns=[
+                GeneratedColumn(p.raw_column.name, p.normalized_type or p.raw_column.original_type,
+                                p.schema_org_property, p.confidence, "llm", p.raw_column.is_primary_key)
+                for p in item.properties
+            ],
+        )
+    if isinstance(item, dict):
+        result = item["result"]
+        meta = {"repo": item.get("repo"), "source_file": item.get("source_file"), "commit": item.get("commit")}
+        if item.get("raw_table"):
+            raw = RawTable.model_validate(item["raw_table"])
+    elif hasattr(item, "table") and hasattr(item, "result"):
+        raw, result = item.table, item.result.model_dump()
+        meta = {"repo": raw.repo, "source_file": raw.source_file, "commit": raw.commit}
+    else:
+        result = item.model_dump()
+        meta = {"repo": None, "source_file": None, "commit": None}
+
+    mapped = {c["original_name"]: c for c in result["columns"]}
+    if raw is not None:
+        # Keep every raw column (mapped or not) in source order, with its type
+        columns = [
+            GeneratedColumn(
+                c.name, c.original_type,
+                mapped.get(c.name, {}).get("schema_property"),
+                mapped.get(c.name, {}).get("confidence"),
+                mapped.get(c.name, {}).get("source"),
+                c.is_primary_key,
+            )
+            for c in raw.columns
+        ]
+    else:
+        columns = [
+            GeneratedColumn(c["original_name"], None, c["schema_property"], c.get("confidence"), c.get("source"))
+            for c in result["columns"]
+        ]
+    return GenerationItem(
+        table_name=result["original_table"], schema_class=result["schema_class"],
+        rationale=result.get("rationale", ""), columns=columns, **meta,
+    )
+
+
+def shard_name(repo: Optional[str]) -> str:
+    """File-system safe shard name for a repo ('org/app' -> 'org_app')."""
+    return re.sub(r"[^A-Za-z0-9._-]+", "_", repo).strip("_") if repo else "unknown"
+
+
+class ShardedOutput:
+    """
+    Buffered, optionally compressed output files, one per shard.
+
+    Files are opened lazily in append mode; at most `max_open` stay open
+    (least recently used are flushed and closed, and reopened for appending),
+    so memory and file handles stay bounded however many shards there are.
+    Appending to .gz / .zst files adds a new compressed member/frame, which
+    standard readers decompress transparently.
+    """
+
+    def __init__(
+        self,
+        output_dir: str,
+        basename: str,
+        extension: str,
+        compression: Optional[str] = None,
+        header: str = "",
+        max_open: Optional[int] = None,
+        buffer_size: Optional[int] = None,
+    ):
+        if compression not in COMPRESSION_SUFFIXES:
+            raise ValueError(f"Unknown compression: {compression!r} (use gzip or zstd)")
+        if compression == "zstd":
+            try:
+                import zstandard  # noqa: F401
+            except ImportError:
+                raise ValueError("zstd compression needs the 'zstandard' package (pip install zstandard)")
+        self.output_dir = Path(output_dir)
+        self.basename = basename
+        self.extension = extension
+        self.compression = compression
+        self.header = header
+        self.max_open = max_open or settings.GENERATOR_MAX_OPEN_FILES
+        self.buffer_size = buffer_size or settings.GENERATOR_BUFFER_SIZE
+        self._open: "OrderedDict[Optional[str], io.BufferedWriter]" = OrderedDict()
+        self._started: Dict[Optional[str], Path] = {}
+        os.makedirs(self.output_dir, exist_ok=True)
+
+    def path_for(self, shard: Optional[str]) -> Path:
+        name = self.basename if shard is None else f"{self.basename}-{shard_name(shard)}"
+        return self.output_dir / f"{name}{self.extension}{COMPRESSION_SUFFIXES[self.compression]}"
+
+    def _open_file(self, path: Path) -> io.BufferedWriter:
+        if self.compression == "gzip":
+            raw = gzip.open(path, "ab", compresslevel=6)
+        elif self.compression == "zstd":
+            import zstandard
+            raw = zstandard.ZstdCompressor().stream_writer(open(path, "ab"), closefd=True)
+        else:
+            raw = open(path, "ab", buffering=0)
+        return io.BufferedWriter(raw, buffer_size=self.buffer_size)
+
+    def _writer(self, shard: Optional[str]) -> io.BufferedWriter:
+        writer = self._open.get(shard)
+        if writer is not None:
+            self._open.move_to_end(shard)
+            return writer
+        if len(self._open) >= self.max_open:
+            _, oldest = self._open.popitem(last=False)
+            oldest.close()
+
+        path = self.path_for(shard)
+        first = shard not in self._started
+        if first and path.exists():
+            path.unlink()  # Each run rewrites its outputs
+        writer = self._open_file(path)
+        self._open[shard] = writer
+        if first:
+            self._started[shard] = path
+            if self.header:
+                writer.write(self.header.encode("utf-8"))
+        return writer
+
+    def write(self, text: str, shard: Optional[str] = None):
+        self._writer(shard).write(text.encode("utf-8"))
+
+    @property
+    def paths(self) -> List[Path]:
+        return list(self._started.values())
+
+    def close(self):
+        while self._open:
+            _, writer = self._open.popitem(last=False)
+            writer.close()
+
+
+class BaseGenerator(ABC):
+    """
+    Abstract Base Class for all Generators.
+    Consumes mapping results one at a time and streams them to (sharded) files.
+    """
+
+    EXTENSION = ""
+    HEADER = ""
+
+    def __init__(
+        self,
+        output_dir: Optional[str] = None,
+        basename: str = "mappings",
+        shard_by_repo: bool = False,
+        compression: Optional[str] = None,
+    ):
+        self.shard_by_repo = shard_by_repo
+        self.output = ShardedOutput(
+            output_dir or str(settings.DATA_DIR / "output"),
+            basename, self.EXTENSION, compression=compression, header=self.HEADER,
+        )
+        self.stats: Dict[str, int] = {"tables": 0, "skipped": 0}
+
+    @abstractmethod
+    def render(self, item: GenerationItem) -> Optional[str]:
+        """Returns the text for one table (None skips it)."""
+        pass
+
+    def add(self, result: Any):
+        item = to_generation_item(result)
+        text = self.render(item)
+        if text is None:
+            self.stats["skipped"] += 1
+            return
+        self.output.write(text, item.repo if self.shard_by_repo else None)
+        self.stats["tables"] += 1
+
+    def write_all(self, results: Iterable[Any]) -> List[Path]:
+        """Consumes an iterator of results and returns the files written."""
+        with self:
+            for result in results:
+                self.add(result)
+        return self.output.paths
+
+    def close(self):
+        self.output.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,50 @@
+import json
+from typing import Optional
+
+from .base import BaseGenerator, GenerationItem
+
+CONTEXT = {"schema": "https://schema.org/", "om": "urn:ontologymirror:"}
+
+_encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+
+
+class JsonLdGenerator(BaseGenerator):
+    """
+    Emits one JSON-LD mapping report per table, one document per line
+    (JSON Lines), so files can be streamed both when writing and reading.
+    """
+
+    EXTENSION = ".jsonld.jsonl"
+
+    def __init__(self, *args, include_errors: bool = False, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.include_errors = include_errors
+
+    @staticmethod
+    def document(item: GenerationItem) -> dict:
+        doc = {
+            "@context": CONTEXT,
+            "@type": "om:TableMapping",
+            "om:sourceTable": item.table_name,
+            "om:schemaClass": {"@id": f"schema:{item.schema_class}"},
+            "om:rationale": item.rationale,
+            "om:columns": [
+                {
+                    "om:sourceColumn": col.original_name,
+                    **({"om:sourceType": col.original_type} if col.original_type else {}),
+                    **({"om:schemaProperty": {"@id": f"schema:{col.schema_property}"},
+                        "om:confidence": col.confidence,
+                        "om:provenance": col.source} if col.schema_property else {}),
+                }
+                for col in item.columns
+            ],
+        }
+        for key, value in (("om:repo", item.repo), ("om:commit", item.commit), ("om:sourceFile", item.source_file)):
+            if value:
+                doc[key] = value
+        return doc
+
+    def render(self, item: GenerationItem) -> Optional[str]:
+        if item.schema_class == "Error" and not self.include_errors:
+            return None
+        return _encode(self.document(item)) + "\n"
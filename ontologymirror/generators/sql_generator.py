@@ -0,0 +1,130 @@
+import re
+from typing import Dict, Optional, Set
+
+from .base import BaseGenerator, GenerationItem
+
+# Templates are formatted with str.format, compiled once at import
+_TABLE_COMMENT = "-- Mapped to Schema.org/{schema_class} (from {source})\n"
+_CREATE = "CREATE TABLE {name} (\n{body}\n);\n\n"
+_COLUMN = "    {name} {type}{pk}"
+_COLUMN_NOTE = "  -- Mapped from {original}"
+_UNMAPPED = "    -- unmapped: {original} {type}"
+
+_SQL_TYPE = re.compile(r"^[A-Za-z][A-Za-z ]*(\(\s*\d+\s*(,\s*\d+\s*)?\))?$")
+_IDENTIFIER = re.compile(r"[^A-Za-z0-9_]+")
+
+
+def sql_type(original_type: Optional[str]) -> str:
+    """Keeps plain SQL types (`VARCHAR(254)`, `INT`); anything else (ORM field classes...) becomes TEXT."""
+    if original_type and _SQL_TYPE.match(original_type.strip()):
+        return " ".join(original_type.upper().split())
+    return "TEXT"
+
+
+def identifier(name: str) -> str:
+    return _IDENTIFIER.sub("_", name).strip("_") or "unnamed"
+
+
+def quote(name: str) -> str:
+    """ANSI-quoted identifier, so Schema.org names that are SQL keywords (`Order`, `Event`) stay valid."""
+    return '"' + name.replace('"', '""') + '"'
+
+
+def unique_name(name: str, suffix: str, used: Set[str]) -> str:
+    """`name`, else `name_suffix`, else `name_suffix_2`, `_3`... whichever is not in `used` yet."""
+    if name not in used:
+        return name
+    candidate = base = f"{name}_{suffix}"
+    counter = 2
+    while candidate in used:
+        candidate = f"{base}_{counter}"
+        counter += 1
+    return candidate
+
+
+class TableNames:
+    """
+    Same naming as unique_name, for the table names of one output file, in
+    memory proportional to the distinct base names rather than to the tables:
+    counters are handed out in order, so `Person_users_2` ... `Person_users_500`
+    are tracked as a single entry (`Person_users` -> 500).
+    """
+
+    def __init__(self):
+        self._taken: Dict[str, int] = {}  # Base name -> highest counter taken (1 = just the bare name)
+
+    def __contains__(self, name: str) -> bool:
+        if name in self._taken:
+            return True
+        base, _, counter = name.rpartition("_")
+        return counter.isdigit() and self._taken.get(base, 0) >= int(counter) >= 2
+
+    def __len__(self) -> int:
+        return len(self._taken)
+
+    def take(self, name: str, suffix: str) -> str:
+        if name not in self:
+            self._taken[name] = 1
+            return name
+        base = f"{name}_{suffix}"
+        if base not in self:
+            self._taken[base] = 1
+            return base
+        counter = max(2, self._taken.get(base, 1) + 1)
+        while f"{base}_{counter}" in self:
+            counter += 1
+        self._taken[base] = counter
+        return f"{base}_{counter}"
+
+
+class SqlGenerator(BaseGenerator):
+    """
+    Emits standardized DDL: one CREATE TABLE per mapped table, named after its
+    Schema.org class, with mapped columns renamed to their Schema.org property.
+    Unmapped columns are kept as comments; tables with no mapped column at all
+    are skipped. Identifiers are double-quoted. When a class repeats within
+    one output file, later tables are suffixed with their original name (and
+    a counter if that is taken too).
+    """
+
+    EXTENSION = ".sql"
+    HEADER = "-- Generated by OntologyMirror: Schema.org-standardized DDL\n\n"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Table names already used, per output shard
+        self._used: Dict[Optional[str], TableNames] = {}
+
+    def render(self, item: GenerationItem) -> Optional[str]:
+        if item.schema_class == "Error" or not any(col.schema_property for col in item.columns):
+            return None
+
+        used = self._used.setdefault(item.repo if self.shard_by_repo else None, TableNames())
+        name = used.take(identifier(item.schema_class), identifier(item.table_name))
+
+        lines, notes, seen = [], [], set()
+        for col in item.columns:
+            if not col.schema_property:
+                lines.append(_UNMAPPED.format(original=col.original_name, type=sql_type(col.original_type)))
+                notes.append(None)
+                continue
+            column_name = unique_name(identifier(col.schema_property), identifier(col.original_name), seen)
+            seen.add(column_name)
+            lines.append(_COLUMN.format(
+                name=quote(column_name),
+                type=sql_type(col.original_type),
+                pk=" PRIMARY KEY" if col.is_primary_key else "",
+            ))
+            notes.append(_COLUMN_NOTE.format(original=col.original_name))
+
+        # Commas go after every column definition except the last one
+        defined = [i for i, note in enumerate(notes) if note is not None]
+        last = defined[-1] if defined else -1
+        body = "\n".join(
+            line if note is None else f"{line}{',' if i != last else ''}{note}"
+            for i, (line, note) in enumerate(zip(lines, notes))
+        )
+        source = item.table_name if not item.repo else f"{item.repo}:{item.table_name}"
+        if item.commit:
+            source += f"@{item.commit[:12]}"
+        return _TABLE_COMMENT.format(schema_class=item.schema_class, source=source) + _CREATE.format(name=quote(name), body=body)
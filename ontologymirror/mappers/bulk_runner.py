@@ -0,0 +1,174 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from ..core.domain import RawTable
+from ..config.settings import settings
+from .semantic_mapper import SemanticMapper, MappedTable
+from .results_store import ResultsStore
+
+logger = logging.getLogger(__name__)
+
+
+def table_key(table: RawTable, repo: Optional[str] = None) -> str:
+    """Stable identity of a table within a run: repo, source file and table name."""
+    return f"{repo or ''}|{table.source_file}|{table.name}"
+
+
+def read_results(path: str) -> Iterator[Dict[str, Any]]:
+    """Lazily yields the records of a bulk results file, one per mapped table."""
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+class BulkMappingRunner:
+    """
+    Checkpointed, resumable bulk mapping.
+
+    Each successful MappedTable is appended as one JSON line to `output_path`.
+    Lines are fsynced in batches (every `fsync_every` results or
+    `fsync_interval` seconds); only after the fsync are the batch's keys and the
+    new committed byte offset recorded in a small sqlite completion index.
+
+    On restart, anything past the committed offset (a torn or un-indexed tail
+    from a crash) is truncated, and tables whose key is in the index are skipped,
+    so no paid-for LLM call is repeated for a committed result. Error results are
+    not written and are retried on the next run.
+
+    Tables are consumed from an iterator and at most one batch is held in memory.
+
+    With a `results_store`, each committed batch is also inserted there (before
+    the completion index is updated, so a crash can only cause a re-insert).
+    """
+
+    def __init__(
+        self,
+        mapper: SemanticMapper,
+        output_path: str,
+        index_path: Optional[str] = None,
+        fsync_every: Optional[int] = None,
+        fsync_interval: Optional[float] = None,
+        results_store: Optional[ResultsStore] = None,
+    ):
+        self.mapper = mapper
+        self.output_path = Path(output_path)
+        self.index_path = Path(index_path) if index_path else self.output_path.with_name(self.output_path.name + ".index")
+        self.fsync_every = fsync_every or settings.BULK_FSYNC_EVERY
+        self.fsync_interval = fsync_interval if fsync_interval is not None else settings.BULK_FSYNC_INTERVAL_SECONDS
+        self.results_store = results_store
+        self.stats: Dict[str, int] = {"seen": 0, "skipped": 0, "mapped": 0, "errors": 0, "truncated_bytes": 0}
+
+        os.makedirs(self.output_path.parent, exist_ok=True)
+        # Completion lookups may come from pipeline worker threads
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.index_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS completed (key TEXT PRIMARY KEY, end_offset INTEGER NOT NULL)")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+        self._conn.commit()
+
+        self._file = self._open_output()
+        self._pending: List[Tuple[str, int]] = []  # (key, end offset) written but not yet committed
+        self._pending_records: List[Dict[str, Any]] = []
+        self._last_sync = time.monotonic()
+
+    def _committed_offset(self) -> int:
+        row = self._conn.execute("SELECT value FROM meta WHERE name = 'committed_offset'").fetchone()
+        return row[0] if row else 0
+
+    def _open_output(self):
+        """Opens the results file for appending, cutting it back to the last committed offset."""
+        committed = self._committed_offset()
+        size = self.output_path.stat().st_size if self.output_path.exists() else 0
+        if size < committed:
+            raise RuntimeError(
+                f"{self.output_path} is shorter than its completion index ({size} < {committed} bytes); "
+                f"delete {self.index_path} to start over"
+            )
+        f = open(self.output_path, "ab")
+        if size > committed:
+            logger.warning("✂️ Dropping %s uncommitted bytes from %s", size - committed, self.output_path.name)
+            f.truncate(committed)
+            f.seek(committed)
+            self.stats["truncated_bytes"] = size - committed
+        return f
+
+    def is_completed(self, key: str) -> bool:
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM completed WHERE key = ?", (key,)).fetchone() is not None
+
+    def completed_count(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM completed").fetchone()[0]
+
+    def write(self, key: str, table: RawTable, result: MappedTable, repo: Optional[str] = None):
+        """Appends one result; commits the batch when it is full or old enough."""
+        record = {
+            "key": key,
+            "repo": repo,
+            "commit": table.commit,
+            "source_file": table.source_file,
+            "table": table.name,
+            "raw_table": table.model_dump(exclude={"raw_content"}),
+            "result": result.model_dump(),
+        }
+        self._file.write((json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8"))
+        self._pending.append((key, self._file.tell()))
+        if self.results_store is not None:
+            self._pending_records.append(record)
+        if len(self._pending) >= self.fsync_every or time.monotonic() - self._last_sync >= self.fsync_interval:
+            self.commit()
+
+    def commit(self):
+        """fsyncs the results file, then records the batch in the completion index."""
+        self._last_sync = time.monotonic()
+        if not self._pending:
+            return
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        if self._pending_records:
+            self.results_store.add_results(self._pending_records)
+            self._pending_records = []
+        with self._lock, self._conn:
+            self._conn.executemany("INSERT OR REPLACE INTO completed (key, end_offset) VALUES (?, ?)", self._pending)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (name, value) VALUES ('committed_offset', ?)", (self._pending[-1][1],)
+            )
+        self._pending = []
+
+    def run(self, tables: Iterable[RawTable], repo: Optional[str] = None) -> Dict[str, int]:
+        """Maps every table not already completed. Safe to interrupt and re-run."""
+        try:
+            for table in tables:
+                self.stats["seen"] += 1
+                key = table_key(table, repo)
+                if self.is_completed(key) or any(k == key for k, _ in self._pending):
+                    self.stats["skipped"] += 1
+                    continue
+
+                result = self.mapper.map_table(table)
+                if result.schema_class == "Error":
+                    self.stats["errors"] += 1
+                    continue
+                self.write(key, table, result, repo)
+                self.stats["mapped"] += 1
+        finally:
+            self.commit()
+        return dict(self.stats)
+
+    def close(self):
+        self.commit()
+        self._file.close()
+        self._conn.close()
+
+    def __enter__(self) -> "BulkMappingRunner":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
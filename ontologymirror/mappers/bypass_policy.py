@@ -0,0 +1,104 @@
+from typing import Dict, List, Any, Optional, Tuple, Set
+from pydantic import BaseModel, Field
+
+from ..config.settings import settings
+
+
+class BypassDecision(BaseModel):
+    """Outcome of evaluating the bypass policy for one table."""
+    bypass: bool
+    schema_class: Optional[str] = None
+    # column name -> (schema property, score)
+    column_matches: Dict[str, Tuple[str, float]] = Field(default_factory=dict)
+    reason: str = ""
+
+
+class BypassPolicy(BaseModel):
+    """
+    Decides when retrieval alone is confident enough to map a table without the LLM.
+
+    A table is mapped deterministically when:
+      1. The top class candidate scores at least `min_class_score`
+         and leads the runner-up by at least `min_class_margin`, and
+      2. At least `min_column_coverage` of the columns have a top property
+         candidate scoring `min_column_score` or more (primary keys count as `identifier`).
+    """
+    enabled: bool = True
+    min_class_score: float = Field(0.6, ge=0.0, le=1.0)
+    min_class_margin: float = Field(0.15, ge=0.0, le=1.0)
+    min_column_score: float = Field(0.9, ge=0.0, le=1.0)
+    min_column_coverage: float = Field(1.0, ge=0.0, le=1.0)
+
+    @classmethod
+    def from_settings(cls) -> "BypassPolicy":
+        return cls(
+            enabled=settings.LLM_BYPASS_ENABLED,
+            min_class_score=settings.BYPASS_MIN_CLASS_SCORE,
+            min_class_margin=settings.BYPASS_MIN_CLASS_MARGIN,
+            min_column_score=settings.BYPASS_MIN_COLUMN_SCORE,
+            min_column_coverage=settings.BYPASS_MIN_COLUMN_COVERAGE,
+        )
+
+    def decide(
+        self,
+        columns: List[Any],
+        candidates: List[Dict[str, Any]],
+        column_candidates: Dict[str, List[Dict[str, Any]]],
+        valid_properties: Optional[Set[str]] = None,
+        pre_resolved: Optional[Dict[str, Tuple[str, float]]] = None,
+    ) -> BypassDecision:
+        """
+        Args:
+            columns: The table's RawColumns.
+            candidates: Class candidates, best first ({"class", "recall_score", ...}).
+            column_candidates: {column_name: [{"property", "score"}, ...]} best first.
+            valid_properties: If given, only these properties (e.g. those of the
+                              top class) count as confident column matches.
+            pre_resolved: Columns already resolved deterministically (e.g. by the
+                          lexicon), {column_name: (property, confidence)}.
+        """
+        if not self.enabled:
+            return BypassDecision(bypass=False, reason="Bypass disabled")
+        if not candidates or not columns:
+            return BypassDecision(bypass=False, reason="No candidates")
+
+        top = candidates[0]["recall_score"]
+        runner_up = candidates[1]["recall_score"] if len(candidates) > 1 else 0.0
+        if top < self.min_class_score or top - runner_up < self.min_class_margin:
+            return BypassDecision(
+                bypass=False,
+                reason=f"Class ambiguous (top={top:.2f}, margin={top - runner_up:.2f})",
+            )
+
+        matches: Dict[str, Tuple[str, float]] = {}
+        pre_resolved = pre_resolved or {}
+        for col in columns:
+            resolved = pre_resolved.get(col.name)
+            if resolved and (valid_properties is None or resolved[0] in valid_properties):
+                matches[col.name] = resolved
+                continue
+            hits = [
+                h for h in column_candidates.get(col.name) or []
+                if valid_properties is None or h["property"] in valid_properties
+            ]
+            if hits and hits[0]["score"] >= self.min_column_score:
+                matches[col.name] = (hits[0]["property"], hits[0]["score"])
+            elif col.is_primary_key:
+                matches[col.name] = ("identifier", 1.0)
+
+        coverage = len(matches) / len(columns)
+        if coverage < self.min_column_coverage:
+            return BypassDecision(
+                bypass=False,
+                schema_class=candidates[0]["class"],
+                column_matches=matches,
+                reason=f"Column coverage {coverage:.0%} below threshold",
+            )
+
+        return BypassDecision(
+            bypass=True,
+            schema_class=candidates[0]["class"],
+            column_matches=matches,
+            reason=f"Top candidate scored {top:.2f} with margin {top - runner_up:.2f}; "
+                   f"{len(matches)}/{len(columns)} columns matched confidently.",
+        )
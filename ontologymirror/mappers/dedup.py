@@ -0,0 +1,152 @@
+import hashlib
+import random
+from collections import defaultdict
+from typing import Dict, List, Set, Tuple
+
+from pydantic import BaseModel
+
+from ..core.domain import RawTable
+from ..core.lexical_index import tokenize
+
+# Mersenne prime used for the universal hash family
+_PRIME = (1 << 61) - 1
+
+
+class TableCluster(BaseModel):
+    """A group of near-identical tables; only the representative goes to the LLM."""
+    representative: RawTable
+    members: List[RawTable]  # Other tables in the cluster (representative excluded)
+
+
+# Plurals the suffix rules below get wrong
+_IRREGULAR = {
+    "people": "person", "children": "child", "men": "man", "women": "woman",
+    "statuses": "status", "movies": "movie", "cookies": "cookie", "series": "series", "news": "news",
+}
+# Singular words that happen to end in "s" (address, status, analysis)
+_SINGULAR_ENDINGS = ("ss", "us", "is")
+
+
+def singularize(token: str) -> str:
+    """
+    Light English singularization for table-name tokens:
+    "users" -> "user", "categories" -> "category", "addresses" -> "address",
+    while "address", "status" and "class" stay as they are.
+    """
+    if token in _IRREGULAR:
+        return _IRREGULAR[token]
+    if len(token) <= 3 or not token.endswith("s") or token.endswith(_SINGULAR_ENDINGS):
+        return token
+    if token.endswith("ies"):
+        return token[:-3] + "y"
+    if token.endswith(("sses", "xes", "ches", "shes", "zzes")):
+        return token[:-2]
+    return token[:-1]
+
+
+def column_key(name: str) -> str:
+    """Canonical column name used for shingling and projection ('firstName' == 'first_name')."""
+    return "_".join(tokenize(name))
+
+
+def table_shingles(table: RawTable) -> Set[str]:
+    """
+    The set a table is fingerprinted by: its canonical column names plus its
+    table-name tokens (singularized), so `users(id, name)` and `products(id, name)`
+    are not treated as the same shape.
+    """
+    shingles = {f"col:{column_key(c.name)}" for c in table.columns}
+    shingles |= {f"table:{singularize(token)}" for token in tokenize(table.name.split(".")[-1])}
+    return shingles
+
+
+def jaccard(a: Set[str], b: Set[str]) -> float:
+    return len(a & b) / len(a | b) if a or b else 1.0
+
+
+class TableDeduplicator:
+    """
+    Clusters near-duplicate RawTables with MinHash + LSH banding.
+
+    Candidate pairs come from LSH buckets and are confirmed with the exact Jaccard
+    similarity of their shingle sets, so the threshold is exact and the LSH only
+    decides which pairs are compared.
+    """
+
+    def __init__(self, threshold: float = 0.8, num_perm: int = 64, bands: int = 16, seed: int = 42):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        rng = random.Random(seed)
+        self._perms = [(rng.randrange(1, _PRIME), rng.randrange(0, _PRIME)) for _ in range(num_perm)]
+
+    @staticmethod
+    def _base_hash(shingle: str) -> int:
+        return int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big")
+
+    def signature(self, shingles: Set[str]) -> Tuple[int, ...]:
+        """MinHash signature of a shingle set."""
+        hashes = [self._base_hash(s) for s in shingles] or [0]
+        return tuple(min((a * h + b) % _PRIME for h in hashes) for a, b in self._perms)
+
+    def cluster(self, tables: List[RawTable]) -> List[TableCluster]:
+        """
+        Groups tables whose shingle sets have Jaccard similarity >= threshold
+        (transitively). The table with the most columns represents each cluster.
+        """
+        return [
+            TableCluster(representative=tables[rep], members=[tables[i] for i in members])
+            for rep, members in self.cluster_indices(tables)
+        ]
+
+    def cluster_indices(self, tables: List[RawTable]) -> List[Tuple[int, List[int]]]:
+        """Same as cluster(), as (representative index, member indices) pairs."""
+        # Exact repeats (the common case: framework boilerplate) collapse to one
+        # shape up front, so LSH buckets only ever hold distinct shapes.
+        shape_of: Dict[frozenset, int] = {}
+        table_shape: List[int] = []
+        shapes: List[Set[str]] = []
+        for table in tables:
+            key = frozenset(table_shingles(table))
+            if key not in shape_of:
+                shape_of[key] = len(shapes)
+                shapes.append(set(key))
+            table_shape.append(shape_of[key])
+
+        buckets: Dict[Tuple[int, Tuple[int, ...]], List[int]] = defaultdict(list)
+        for i, sh in enumerate(shapes):
+            sig = self.signature(sh)
+            for band in range(self.bands):
+                buckets[(band, sig[band * self.rows:(band + 1) * self.rows])].append(i)
+
+        parent = list(range(len(shapes)))
+
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        compared: Set[Tuple[int, int]] = set()
+        for members in buckets.values():
+            for x in range(len(members)):
+                for y in range(x + 1, len(members)):
+                    pair = (members[x], members[y])
+                    if pair in compared:
+                        continue
+                    compared.add(pair)
+                    if jaccard(shapes[pair[0]], shapes[pair[1]]) >= self.threshold:
+                        parent[find(pair[0])] = find(pair[1])
+
+        groups: Dict[int, List[int]] = defaultdict(list)
+        for i in range(len(tables)):
+            groups[find(table_shape[i])].append(i)
+
+        clusters = []
+        for indices in sorted(groups.values(), key=lambda g: g[0]):
+            rep = max(indices, key=lambda i: (len(tables[i].columns), -i))
+            clusters.append((rep, [i for i in indices if i != rep]))
+        return clusters
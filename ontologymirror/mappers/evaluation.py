@@ -0,0 +1,69 @@
+import json
+from pathlib import Path
+from typing import Dict, List, Any
+from pydantic import BaseModel
+
+from ..core.domain import RawTable
+
+
+class LabelledTable(BaseModel):
+    """A RawTable with its expected (gold) Schema.org mapping."""
+    table: RawTable
+    expected_class: str
+    expected_columns: Dict[str, str]  # column name -> schema property
+
+
+def load_labelled_tables(path: str | Path) -> List[LabelledTable]:
+    """Loads a JSON list of labelled tables (see tests/fixtures/labelled_tables.json)."""
+    with open(path, "r", encoding="utf-8") as f:
+        return [LabelledTable(**item) for item in json.load(f)]
+
+
+def evaluate_mapper(mapper, labelled: List[LabelledTable]) -> Dict[str, Any]:
+    """
+    Maps every labelled table and reports bypass rate and accuracy.
+
+    Accuracy is reported overall and for the bypassed (LLM-free) subset, so a
+    policy change can be judged on both cost and correctness. Lexicon-resolved
+    columns are reported separately, together with how many columns were sent
+    to the LLM.
+    """
+    totals = {"all": [0, 0, 0, 0], "bypassed": [0, 0, 0, 0]}  # class_ok, tables, col_ok, cols
+    lexicon_cols = lexicon_ok = 0
+    prompt_columns_before = mapper.stats["prompt_columns"]
+    for item in labelled:
+        bypassed_before = mapper.stats["bypassed"]
+        result = mapper.map_table(item.table)
+        was_bypassed = mapper.stats["bypassed"] > bypassed_before
+
+        predicted = {c.original_name: c.schema_property for c in result.columns}
+        class_ok = int(result.schema_class == item.expected_class)
+        col_ok = sum(1 for name, prop in item.expected_columns.items() if predicted.get(name) == prop)
+
+        for col in result.columns:
+            if col.source.startswith("lexicon") and col.original_name in item.expected_columns:
+                lexicon_cols += 1
+                lexicon_ok += int(item.expected_columns[col.original_name] == col.schema_property)
+
+        buckets = ["all", "bypassed"] if was_bypassed else ["all"]
+        for bucket in buckets:
+            totals[bucket][0] += class_ok
+            totals[bucket][1] += 1
+            totals[bucket][2] += col_ok
+            totals[bucket][3] += len(item.expected_columns)
+
+    def ratio(a, b):
+        return round(a / b, 3) if b else None
+
+    return {
+        "tables": totals["all"][1],
+        "bypassed": totals["bypassed"][1],
+        "bypass_rate": ratio(totals["bypassed"][1], totals["all"][1]),
+        "class_accuracy": ratio(totals["all"][0], totals["all"][1]),
+        "column_accuracy": ratio(totals["all"][2], totals["all"][3]),
+        "bypassed_class_accuracy": ratio(totals["bypassed"][0], totals["bypassed"][1]),
+        "bypassed_column_accuracy": ratio(totals["bypassed"][2], totals["bypassed"][3]),
+        "lexicon_resolved_rate": ratio(lexicon_cols, totals["all"][3]),
+        "lexicon_accuracy": ratio(lexicon_ok, lexicon_cols),
+        "prompt_columns": mapper.stats["prompt_columns"] - prompt_columns_before,
+    }
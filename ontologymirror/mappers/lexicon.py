@@ -0,0 +1,105 @@
+from typing import Dict, Iterable, Optional, Tuple
+
+from .schema_loader import SchemaOrgLoader
+from .dedup import column_key
+
+# Common column spellings -> Schema.org property label.
+# Keys are canonical column keys (see dedup.column_key), so `firstName`,
+# `first_name` and `FirstName` all hit the same entry.
+SYNONYMS: Dict[str, str] = {
+    "id": "identifier",
+    "uuid": "identifier",
+    "guid": "identifier",
+    "first_name": "givenName",
+    "fname": "givenName",
+    "f_name": "givenName",
+    "forename": "givenName",
+    "last_name": "familyName",
+    "lname": "familyName",
+    "l_name": "familyName",
+    "surname": "familyName",
+    "full_name": "name",
+    "display_name": "name",
+    "email_address": "email",
+    "mail": "email",
+    "phone": "telephone",
+    "phone_number": "telephone",
+    "tel": "telephone",
+    "created_at": "dateCreated",
+    "created_on": "dateCreated",
+    "created": "dateCreated",
+    "creation_date": "dateCreated",
+    "updated_at": "dateModified",
+    "updated_on": "dateModified",
+    "modified_at": "dateModified",
+    "modified": "dateModified",
+    "last_modified": "dateModified",
+    "published_at": "datePublished",
+    "pub_date": "datePublished",
+    "desc": "description",
+    "website": "url",
+    "homepage": "url",
+    "link": "url",
+    "dob": "birthDate",
+    "birthday": "birthDate",
+    "birth_date": "birthDate",
+    "date_of_birth": "birthDate",
+    "avatar": "image",
+    "avatar_url": "image",
+    "photo": "image",
+    "image_url": "image",
+    "zip": "postalCode",
+    "zip_code": "postalCode",
+    "postcode": "postalCode",
+    "lat": "latitude",
+    "lng": "longitude",
+    "lon": "longitude",
+}
+
+# Confidence assigned per match kind
+CONFIDENCE = {"exact": 1.0, "normalized": 0.97, "synonym": 0.9}
+
+
+class LexiconMapper:
+    """
+    Deterministic column -> property resolver, compiled once from Schema.org labels.
+
+    Match kinds (first hit wins):
+      - exact:      column name equals a property label        (`email`, `givenName`)
+      - normalized: canonical keys are equal                   (`given_name`, `DateCreated`)
+      - synonym:    column key is a known synonym (SYNONYMS)   (`first_name`, `created_at`)
+
+    Lookups are dict hits, so resolving a column costs microseconds.
+    """
+
+    def __init__(self, property_labels: Iterable[str], synonyms: Optional[Dict[str, str]] = None):
+        labels = set(property_labels)
+        self._exact: Dict[str, str] = {label: label for label in labels}
+        self._normalized: Dict[str, str] = {}
+        for label in sorted(labels):
+            self._normalized.setdefault(column_key(label), label)
+        # Drop synonyms pointing at properties missing from this vocabulary version
+        self._synonyms: Dict[str, str] = {
+            key: target for key, target in (synonyms if synonyms is not None else SYNONYMS).items()
+            if target in labels
+        }
+
+    @classmethod
+    def from_loader(cls, loader: SchemaOrgLoader) -> "LexiconMapper":
+        labels = [loader.node_text(p.get("rdfs:label")) for p in loader.get_properties()]
+        return cls([label for label in labels if label])
+
+    def match(self, column_name: str, allowed: Optional[Iterable[str]] = None) -> Optional[Tuple[str, str]]:
+        """
+        Returns (property, match kind) or None.
+        If `allowed` is given, only those properties are accepted.
+        """
+        key = column_key(column_name)
+        for kind, hit in (
+            ("exact", self._exact.get(column_name)),
+            ("normalized", self._normalized.get(key)),
+            ("synonym", self._synonyms.get(key)),
+        ):
+            if hit and (allowed is None or hit in allowed):
+                return hit, kind
+        return None
@@ -0,0 +1,199 @@
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from ..config.settings import settings
+from ..generators.base import to_generation_item
+
+_SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS mapped_tables (
+        id INTEGER PRIMARY KEY,
+        repo TEXT NOT NULL DEFAULT '',
+        commit_sha TEXT NOT NULL DEFAULT '',
+        source_file TEXT NOT NULL DEFAULT '',
+        raw_table TEXT NOT NULL,
+        schema_class TEXT NOT NULL,
+        rationale TEXT,
+        mapped_at REAL NOT NULL,
+        UNIQUE (repo, commit_sha, source_file, raw_table)
+    )""",
+    """CREATE TABLE IF NOT EXISTS mapped_columns (
+        table_id INTEGER NOT NULL REFERENCES mapped_tables(id) ON DELETE CASCADE,
+        original_name TEXT NOT NULL,
+        original_type TEXT,
+        schema_property TEXT,
+        confidence REAL,
+        source TEXT
+    )""",
+    # Covering indexes for the common questions (class -> repos, property -> columns)
+    "CREATE INDEX IF NOT EXISTS idx_tables_repo ON mapped_tables(repo, commit_sha)",
+    "CREATE INDEX IF NOT EXISTS idx_tables_commit ON mapped_tables(commit_sha)",
+    "CREATE INDEX IF NOT EXISTS idx_tables_raw_table ON mapped_tables(raw_table)",
+    "CREATE INDEX IF NOT EXISTS idx_tables_class ON mapped_tables(schema_class, repo)",
+    "CREATE INDEX IF NOT EXISTS idx_columns_table ON mapped_columns(table_id)",
+    "CREATE INDEX IF NOT EXISTS idx_columns_property ON mapped_columns(schema_property, table_id)",
+]
+
+
+class ResultsStore:
+    """
+    Queryable sqlite store of mapping results across repos.
+
+    One row per mapped table (keyed by repo, commit, source file and raw table
+    name; re-adding a table replaces it) and one row per column, unmapped
+    columns included with a NULL property. Inserts are batched into one
+    transaction per `batch_size` results.
+    """
+
+    def __init__(self, path: Optional[str] = None, batch_size: Optional[int] = None):
+        self.path = Path(path) if path else settings.DATA_DIR / "results.sqlite"
+        os.makedirs(self.path.parent, exist_ok=True)
+        self.batch_size = batch_size or settings.RESULTS_STORE_BATCH_SIZE
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        with self._conn:
+            for statement in _SCHEMA:
+                self._conn.execute(statement)
+
+    @classmethod
+    def from_settings(cls) -> Optional["ResultsStore"]:
+        """Returns the configured store, or None if disabled."""
+        if not settings.RESULTS_STORE_ENABLED:
+            return None
+        return cls(settings.RESULTS_STORE_PATH)
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def _insert(self, result: Any, now: float):
+        item = to_generation_item(result)
+        key = (item.repo or "", item.commit or "", item.source_file or "", item.table_name)
+        row = self._conn.execute(
+            "INSERT INTO mapped_tables (repo, commit_sha, source_file, raw_table, schema_class, rationale, mapped_at)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?)"
+            " ON CONFLICT (repo, commit_sha, source_file, raw_table) DO UPDATE SET"
+            " schema_class = excluded.schema_class, rationale = excluded.rationale, mapped_at = excluded.mapped_at"
+            " RETURNING id",
+            (*key, item.schema_class, item.rationale, now),
+        ).fetchone()
+        table_id = row[0]
+        self._conn.execute("DELETE FROM mapped_columns WHERE table_id = ?", (table_id,))
+        self._conn.executemany(
+            "INSERT INTO mapped_columns (table_id, original_name, original_type, schema_property, confidence, source)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            [(table_id, c.original_name, c.original_type, c.schema_property, c.confidence, c.source)
+             for c in item.columns],
+        )
+
+    def add_results(self, results: Iterable[Any]) -> int:
+        """
+        Inserts results (TableResult, MappedTable or bulk results records),
+        one transaction per batch. Returns the number inserted.
+        """
+        count = 0
+        batch: List[Any] = []
+        for result in results:
+            batch.append(result)
+            if len(batch) >= self.batch_size:
+                count += self._write_batch(batch)
+                batch = []
+        if batch:
+            count += self._write_batch(batch)
+        return count
+
+    def _write_batch(self, batch: List[Any]) -> int:
+        now = time.time()
+        with self._lock, self._conn:
+            for result in batch:
+                self._insert(result, now)
+        return len(batch)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def _query(self, sql: str, params: tuple = ()) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [dict(row) for row in self._conn.execute(sql, params)]
+
+    def repos_for_class(self, schema_class: str) -> List[str]:
+        """Repos with at least one table mapped to `schema_class`."""
+        rows = self._query(
+            "SELECT DISTINCT repo FROM mapped_tables WHERE schema_class = ? ORDER BY repo", (schema_class,)
+        )
+        return [r["repo"] for r in rows]
+
+    def tables(
+        self,
+        schema_class: Optional[str] = None,
+        repo: Optional[str] = None,
+        raw_table: Optional[str] = None,
+        commit: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Mapped tables matching every given filter."""
+        filters, params = [], []
+        for column, value in (("schema_class", schema_class), ("repo", repo),
+                              ("raw_table", raw_table), ("commit_sha", commit)):
+            if value is not None:
+                filters.append(f"{column} = ?")
+                params.append(value)
+        sql = "SELECT id, repo, commit_sha, source_file, raw_table, schema_class, rationale FROM mapped_tables"
+        if filters:
+            sql += " WHERE " + " AND ".join(filters)
+        sql += " ORDER BY repo, raw_table"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        return self._query(sql, tuple(params))
+
+    def columns_for_property(self, schema_property: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Every column mapped to `schema_property`, with the table it belongs to."""
+        sql = (
+            "SELECT t.repo, t.commit_sha, t.raw_table, t.schema_class, c.original_name, c.original_type,"
+            " c.confidence, c.source"
+            " FROM mapped_columns c JOIN mapped_tables t ON t.id = c.table_id"
+            " WHERE c.schema_property = ? ORDER BY t.repo, t.raw_table, c.original_name"
+        )
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        return self._query(sql, (schema_property,))
+
+    def columns(self, table_id: int) -> List[Dict[str, Any]]:
+        return self._query(
+            "SELECT original_name, original_type, schema_property, confidence, source"
+            " FROM mapped_columns WHERE table_id = ?", (table_id,)
+        )
+
+    def class_counts(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Schema classes by number of mapped tables."""
+        sql = ("SELECT schema_class, COUNT(*) AS tables, COUNT(DISTINCT repo) AS repos"
+               " FROM mapped_tables GROUP BY schema_class ORDER BY tables DESC, schema_class")
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        return self._query(sql)
+
+    def stats(self) -> Dict[str, int]:
+        row = self._query(
+            "SELECT (SELECT COUNT(*) FROM mapped_tables) AS tables,"
+            " (SELECT COUNT(*) FROM mapped_columns) AS columns,"
+            " (SELECT COUNT(DISTINCT repo) FROM mapped_tables) AS repos"
+        )[0]
+        return row
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self) -> "ResultsStore":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -2,7 +2,7 @@ import os
 import json
 import requests
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Iterable, Set
 from ..config.settings import settings
 
 class SchemaOrgLoader:
@@ -19,6 +19,8 @@ class SchemaOrgLoader:
         self.kb_dir = settings.DATA_DIR / "knowledge_base"
         self.file_path = self.kb_dir / "schemaorg-current-https.jsonld"
         self.graph: List[Dict[str, Any]] = []
+        self._class_parents: Dict[str, List[str]] | None = None
+        self._properties_for: Dict[frozenset, Set[str]] = {}
         
     def ensure_schema_loaded(self, force_update: bool = False):
         """
@@ -28,6 +30,10 @@ class SchemaOrgLoader:
             force_update (bool): If True, re-downloads the file from source.
                                  Useful since Schema.org is continuously updated.
         """
+        if self.graph and not force_update:
+            return
+        self.clear_caches()
+
         if force_update or not self.file_path.exists():
             self._download_schema()
             
@@ -92,3 +98,85 @@ class SchemaOrgLoader:
             if node_type == "rdf:Property" or (isinstance(node_type, list) and "rdf:Property" in node_type):
                 props.append(node)
         return props
+
+    # ------------------------------------------------------------------
+    # Node helpers
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def node_text(value: Any) -> str:
+        """
+        Normalizes a JSON-LD literal (plain string or {"@value": ...}) to a string.
+        """
+        if isinstance(value, dict):
+            return str(value.get("@value", ""))
+        if isinstance(value, list):
+            return SchemaOrgLoader.node_text(value[0]) if value else ""
+        return str(value) if value is not None else ""
+
+    @staticmethod
+    def node_refs(value: Any) -> List[str]:
+        """
+        Returns the labels referenced by a JSON-LD link field such as
+        "schema:domainIncludes" ({"@id": "schema:Person"} or a list of them).
+        """
+        if value is None:
+            return []
+        items = value if isinstance(value, list) else [value]
+        refs = []
+        for item in items:
+            ref = item.get("@id", "") if isinstance(item, dict) else str(item)
+            # "schema:Person" / "https://schema.org/Person" -> "Person"
+            refs.append(ref.rsplit(":", 1)[-1].rsplit("/", 1)[-1])
+        return [r for r in refs if r]
+
+    def clear_caches(self):
+        """Drops the memoized class hierarchy and per-class property sets (rebuilt on next use)."""
+        self._class_parents = None
+        self._properties_for = {}
+
+    def get_class_ancestors(self, class_label: str) -> Set[str]:
+        """
+        Returns the class itself plus all of its superclasses (via rdfs:subClassOf).
+        e.g. "Person" -> {"Person", "Thing"}
+        """
+        parents = self._class_parents
+        if parents is None:
+            # Built in a local and published once: mappers call this from
+            # worker threads, which must never see a half-filled map.
+            parents = {}
+            for cls in self.get_classes():
+                label = self.node_text(cls.get("rdfs:label"))
+                parents[label] = self.node_refs(cls.get("rdfs:subClassOf"))
+            self._class_parents = parents
+
+        ancestors: Set[str] = set()
+        stack = [class_label]
+        while stack:
+            current = stack.pop()
+            if current in ancestors:
+                continue
+            ancestors.add(current)
+            stack.extend(parents.get(current, []))
+        return ancestors
+
+    def get_properties_for_classes(self, class_labels: Iterable[str]) -> Set[str]:
+        """
+        Returns the labels of all properties usable on any of the given classes,
+        including properties inherited from superclasses (e.g. Thing.name).
+        Results are memoized per class set.
+        """
+        key = frozenset(class_labels)
+        if key in self._properties_for:
+            return self._properties_for[key]
+
+        domains: Set[str] = set()
+        for label in key:
+            domains |= self.get_class_ancestors(label)
+
+        allowed = set()
+        for prop in self.get_properties():
+            if domains & set(self.node_refs(prop.get("schema:domainIncludes"))):
+                allowed.add(self.node_text(prop.get("rdfs:label")))
+        self._properties_for[key] = allowed
+        return allowed
@@ -1,10 +1,23 @@
+import asyncio
 import json
-from typing import List, Optional, Dict, Any
-from pydantic import BaseModel
+import logging
+from typing import List, Optional, Dict, Any, Tuple, Iterable, AsyncIterator, Callable
+from pydantic import BaseModel, Field
 
-from ..core.domain import RawTable
+from ..core.domain import RawTable, RawColumn
 from ..core.vector_store import SchemaVectorStore
-from ..core.llm_client import LLMClient
+from ..core.llm_client import LLMClient, create_llm_client
+from ..core.rate_limit import RateLimiter, is_retryable_error, backoff_delay
+from ..core.tokens import count_tokens
+from ..core.llm_cache import MappingCache, table_signature, normalize_table_name
+from ..core.json_stream import IncrementalMappingParser, StreamParseError
+from ..core.telemetry import telemetry
+from ..config.settings import settings
+from .bypass_policy import BypassPolicy, BypassDecision
+from .dedup import TableDeduplicator, column_key
+from .lexicon import LexiconMapper, CONFIDENCE as LEXICON_CONFIDENCE
+
+logger = logging.getLogger(__name__)
 
 class MappedColumn(BaseModel):
     """Represents a mapping from a raw SQL column to a Schema.org Property."""
@@ -12,6 +25,7 @@ class MappedColumn(BaseModel):
     schema_property: str  # e.g., "email", "givenName"
     confidence: float
     reason: str
+    source: str = "llm"   # Provenance: "llm", "retrieval", "lexicon:exact|normalized|synonym"
 
 class MappedTable(BaseModel):
     """Represents the final mapping decision for a table."""
@@ -20,46 +34,317 @@ class MappedTable(BaseModel):
     columns: List[MappedColumn]
     rationale: str
 
+class MappingContext(BaseModel):
+    """Retrieval results for one table, ready to be turned into a prompt."""
+    table: RawTable
+    candidates: List[Dict[str, Any]]                     # [{"class", "description", "recall_score"}]
+    column_candidates: Dict[str, List[Dict[str, Any]]] = Field(default_factory=dict)
+    resolved: List[MappedColumn] = Field(default_factory=list)  # Pre-mapped without the LLM
+
+    @property
+    def unresolved_columns(self) -> List[RawColumn]:
+        """Columns the lexicon could not resolve; only these go into the prompt."""
+        done = {c.original_name for c in self.resolved}
+        return [c for c in self.table.columns if c.name not in done]
+
 class SemanticMapper:
     """
     Coordinates the semantic mapping process.
     Steps:
       1. Receive RawTable
       2. Consult VectorStore for candidate Schema.org classes
-      3. Ask LLM to pick the best class and map columns
+      3. Resolve well-known columns with the lexicon (exact / normalized / synonym)
+      4. Consult VectorStore for candidate properties of the remaining columns
+      5. If retrieval is confident (see BypassPolicy), build the mapping directly
+      6. Otherwise ask LLM to pick the best class and map the remaining columns
     """
     
-    def __init__(self):
-        self.vector_store = SchemaVectorStore()
+    PROPERTY_CANDIDATES_PER_COLUMN = 3
+    # Hits fetched per column when one property search serves tables with
+    # different candidate classes (each keeps its top valid ones)
+    PROPERTY_CANDIDATE_POOL = 10
+    # Bump whenever the prompts change, so cached answers from old prompts are not reused
+    PROMPT_VERSION = "3"
+
+    def __init__(
+        self,
+        vector_store: Optional[SchemaVectorStore] = None,
+        llm: Optional[LLMClient] = None,
+        bypass_policy: Optional[BypassPolicy] = None,
+        cache: Optional[MappingCache] = None,
+    ):
+        self.vector_store = vector_store or SchemaVectorStore()
         # Ensure index exists (light check)
         if self.vector_store.vector_db._collection.count() == 0:
             print("⚠️ Index is empty, building now...")
             self.vector_store.build_index()
+        elif self.vector_store.property_db._collection.count() == 0:
+            print("⚠️ Property index is empty, building now...")
+            self.vector_store.build_property_index()
             
-        self.llm = LLMClient()
-        
-    def map_table(self, table: RawTable) -> MappedTable:
+        self.llm = llm or create_llm_client()
+        self.bypass_policy = bypass_policy or BypassPolicy.from_settings()
+        self.cache = cache if cache is not None else MappingCache.from_settings()
+        self.stats = {"tables": 0, "bypassed": 0, "llm_calls": 0, "retries": 0, "cache_hits": 0,
+                      "projected": 0, "lexicon_resolved": 0, "prompt_columns": 0,
+                      "stream_aborts": 0}
+        self._lexicon: Optional[LexiconMapper] = None
+
+    def _bump(self, stat: str, amount: int = 1):
+        """Increments a mapper stat and the matching `mapper_<stat>` telemetry counter."""
+        self.stats[stat] += amount
+        telemetry.count(f"mapper_{stat}", amount)
+
+    def warm_up(self):
+        """Builds the lazily created indexes now, so the first table doesn't pay for them."""
+        self.vector_store.lexical_index("class")
+        self.vector_store.lexical_index("property")
+        self.lexicon
+
+    @property
+    def lexicon(self) -> Optional[LexiconMapper]:
+        """The compiled lexicon (built on first use), or None if disabled."""
+        if not settings.LEXICON_ENABLED:
+            return None
+        if self._lexicon is None:
+            self._lexicon = LexiconMapper.from_loader(self.vector_store.loader)
+        return self._lexicon
+
+    def resolve_with_lexicon(self, columns: List[RawColumn], allowed: Optional[set] = None) -> List[MappedColumn]:
+        """Maps columns with exact / normalized / synonym matches, recording provenance."""
+        lexicon = self.lexicon
+        if lexicon is None:
+            return []
+        resolved = []
+        for col in columns:
+            hit = lexicon.match(col.name, allowed)
+            if hit:
+                prop, kind = hit
+                resolved.append(MappedColumn(
+                    original_name=col.name,
+                    schema_property=prop,
+                    confidence=LEXICON_CONFIDENCE[kind],
+                    reason=f"Lexicon {kind} match",
+                    source=f"lexicon:{kind}",
+                ))
+        self._bump("lexicon_resolved", len(resolved))
+        return resolved
+
+    def finalize(self, context: MappingContext, result: MappedTable) -> MappedTable:
         """
-        Main entry point to map a single table.
+        Merges lexicon-resolved columns into an LLM result. Resolved columns
+        whose property is not valid for the chosen class are dropped (the LLM's
+        own mapping for them, if any, is kept). LLM mappings for the remaining
+        resolved columns, or for columns the table doesn't have, are dropped.
+        """
+        if result.schema_class == "Error":
+            return result
+        valid = self.vector_store.loader.get_properties_for_classes([result.schema_class])
+        resolved = [c for c in context.resolved if c.schema_property in valid]
+        if len(resolved) < len(context.resolved):
+            logger.debug("   Dropped %s lexicon match(es) not valid for %s",
+                         len(context.resolved) - len(resolved), result.schema_class)
+        resolved_names = {c.original_name for c in resolved}
+        known = {c.name for c in context.table.columns}
+        llm_columns = [
+            c for c in result.columns
+            if c.original_name in known and c.original_name not in resolved_names
+        ]
+        result.columns = resolved + llm_columns
+        return result
+
+    # ------------------------------------------------------------------
+    # Response cache
+    # ------------------------------------------------------------------
+
+    def _cache_key(self, context: MappingContext) -> str:
+        return table_signature(
+            context.table,
+            [c["class"] for c in context.candidates],
+            self.PROMPT_VERSION,
+            self.llm.model_name,
+        )
+
+    def cache_lookup(self, context: MappingContext) -> Optional[MappedTable]:
+        """Returns a cached mapping for an equivalent table, adapted to this table's names."""
+        if self.cache is None:
+            return None
+        cached = self.cache.get(self._cache_key(context))
+        if cached is None:
+            return None
+
+        self._bump("cache_hits")
+        result = MappedTable.model_validate_json(cached)
+        # The signature is name-normalized, so restore this table's own spelling
+        names = {normalize_table_name(c.name): c.name for c in context.table.columns}
+        for col in result.columns:
+            col.original_name = names.get(normalize_table_name(col.original_name), col.original_name)
+        result.original_table = context.table.name
+        return result
+
+    def cache_store(self, context: MappingContext, result: MappedTable):
+        """Caches a successful LLM mapping (errors are never cached)."""
+        if self.cache is not None and result.schema_class != "Error":
+            self.cache.put(self._cache_key(context), result.model_dump_json())
+
+    @staticmethod
+    def _column_query(column) -> str:
+        """Turns a raw column into a short natural-language retrieval query."""
+        return column.name.replace("_", " ").strip()
+
+    def retrieve_property_candidates(
+        self,
+        tables: List[RawTable],
+        class_labels: List[str],
+        k: Optional[int] = None,
+    ) -> List[Dict[str, List[Dict[str, Any]]]]:
         """
-        print(f"🔄 Mapping Table: {table.name}")
+        Looks up top-k property candidates (default: PROPERTY_CANDIDATES_PER_COLUMN)
+        for every column of every table in a single vectorized search,
+        restricted to properties of `class_labels`.
+
+        Returns:
+            One {column_name: [{"property": ..., "score": ...}]} dict per table.
+        """
+        queries = [self._column_query(c) for t in tables for c in t.columns]
+        hits = self.vector_store.search_properties(
+            queries, k=k or self.PROPERTY_CANDIDATES_PER_COLUMN, class_labels=class_labels
+        )
+
+        per_table = []
+        offset = 0
+        for table in tables:
+            column_candidates = {}
+            for col, col_hits in zip(table.columns, hits[offset:offset + len(table.columns)]):
+                column_candidates[col.name] = [
+                    {"property": doc.metadata.get("label"), "score": round(score, 3)}
+                    for doc, score in col_hits
+                ]
+            per_table.append(column_candidates)
+            offset += len(table.columns)
+        return per_table
         
-        # 1. Retrieve Candidates
+    def prepare(self, table: RawTable) -> MappingContext:
+        """
+        Runs retrieval for a table: scored class candidates plus
+        per-column property candidates.
+        """
+        return self.prepare_many([table])[0]
+
+    def prepare_many(self, tables: List[RawTable]) -> List[MappingContext]:
+        """
+        Like prepare, for a batch of tables: class retrieval runs per table, the
+        property candidates of all their unresolved columns come from ONE search.
+        """
+        contexts = [self._retrieve_classes(table) for table in tables]
+        self.attach_property_candidates(contexts)
+        return contexts
+
+    def _retrieve_classes(self, table: RawTable) -> MappingContext:
+        """Class candidates and lexicon matches for a table (no property search yet)."""
         # Construct a query string from table metadata
         query = f"Table {table.name} with columns: {', '.join([c.name for c in table.columns])}"
-        candidates_docs = self.vector_store.search(query, k=3)
+        with telemetry.span("retrieve", table=table.name):
+            scored_docs = self.vector_store.search_with_scores(query, k=3, lexical_query=table.name)
         
         candidates = []
-        for doc in candidates_docs:
+        for doc, score in scored_docs:
             candidates.append({
                 "class": doc.metadata.get("label"),
                 "description": doc.page_content,
-                "recall_score": 0.0 # Placeholder if we had scores
+                "recall_score": round(score, 3)
             })
             
-        print(f"   Candidates: {[c['class'] for c in candidates]}")
-        
-        # 2. Construct Prompt for LLM
+        class_labels = [c["class"] for c in candidates]
+        logger.debug("   Candidates: %s", class_labels)
+
+        # Lexicon hits are not restricted to the candidate classes: columns like
+        # `email` map the same way regardless of how good retrieval was.
+        # finalize drops the ones the chosen class can't have.
+        return MappingContext(
+            table=table,
+            candidates=candidates,
+            resolved=self.resolve_with_lexicon(table.columns),
+        )
+
+    def attach_property_candidates(self, contexts: List[MappingContext]):
+        """
+        Fills `column_candidates` for the unresolved columns of every context in
+        a single search over the union of their candidate classes. When the
+        tables' classes differ, a larger pool is fetched per column and each
+        table keeps the top hits valid for its own classes.
+        """
+        todo = [ctx for ctx in contexts if ctx.unresolved_columns]
+        if not todo:
+            return
+        class_sets = [[c["class"] for c in ctx.candidates] for ctx in todo]
+        union = sorted({label for labels in class_sets for label in labels})
+        shared = all(set(labels) == set(union) for labels in class_sets)
+
+        pending_tables = [
+            RawTable(name=ctx.table.name, columns=ctx.unresolved_columns, source_file=ctx.table.source_file)
+            for ctx in todo
+        ]
+        if shared:
+            per_table = self.retrieve_property_candidates(pending_tables, class_sets[0])
+        else:
+            per_table = self.retrieve_property_candidates(pending_tables, union, k=self.PROPERTY_CANDIDATE_POOL)
+
+        loader = self.vector_store.loader
+        for ctx, labels, column_candidates in zip(todo, class_sets, per_table):
+            if not shared:
+                allowed = loader.get_properties_for_classes(labels)
+                column_candidates = {
+                    name: [h for h in hits if h["property"] in allowed][:self.PROPERTY_CANDIDATES_PER_COLUMN]
+                    for name, hits in column_candidates.items()
+                }
+            ctx.column_candidates = column_candidates
+
+    def decide_bypass(self, context: MappingContext) -> BypassDecision:
+        """Applies the bypass policy to a prepared context."""
+        valid_properties = None
+        if context.candidates:
+            valid_properties = self.vector_store.loader.get_properties_for_classes(
+                [context.candidates[0]["class"]]
+            )
+        return self.bypass_policy.decide(
+            context.table.columns,
+            context.candidates,
+            context.column_candidates,
+            valid_properties=valid_properties,
+            pre_resolved={c.original_name: (c.schema_property, c.confidence) for c in context.resolved},
+        )
+
+    @staticmethod
+    def build_deterministic(
+        table: RawTable,
+        decision: BypassDecision,
+        context: Optional[MappingContext] = None,
+    ) -> MappedTable:
+        """Builds a MappedTable straight from lexicon/retrieval results (no LLM)."""
+        resolved = {c.original_name: c for c in context.resolved} if context else {}
+        columns = []
+        for name, (prop, score) in decision.column_matches.items():
+            if name in resolved and resolved[name].schema_property == prop:
+                columns.append(resolved[name])
+                continue
+            columns.append(MappedColumn(
+                original_name=name,
+                schema_property=prop,
+                confidence=round(min(score, 1.0), 3),
+                reason="Retrieval match (LLM bypassed)",
+                source="retrieval",
+            ))
+        return MappedTable(
+            original_table=table.name,
+            schema_class=decision.schema_class,
+            columns=columns,
+            rationale=f"Deterministic mapping: {decision.reason}",
+        )
+
+    def build_prompts(self, context: MappingContext) -> Tuple[str, str]:
+        """Builds the (system_prompt, user_prompt) pair for a prepared table."""
+        table = context.table
         system_prompt = """You are an expert Ontology Engineer. Your task is to map a legacy SQL table to a standardized Schema.org Class.
         
         Output strictly in JSON format matching this structure:
@@ -72,60 +357,602 @@ class SemanticMapper:
         }
         """
         
-        # Serialize input data for the prompt
+        # Serialize input data for the prompt (lexicon-resolved columns are left out)
+        pending = context.unresolved_columns
+        self._bump("prompt_columns", len(pending))
         table_def = {
             "table_name": table.name,
-            "columns": [{"name": c.name, "type": c.original_type} for c in table.columns]
+            "columns": [{"name": c.name, "type": c.original_type} for c in pending]
         }
+        already_mapped = ""
+        if context.resolved:
+            resolved = {c.original_name: c.schema_property for c in context.resolved}
+            already_mapped = f"ALREADY MAPPED (do not map again): {json.dumps(resolved)}"
         
         user_prompt = f"""
         INPUT TABLE:
         {json.dumps(table_def, indent=2)}
+        {already_mapped}
         
         CANDIDATE SCHEMA.ORG CLASSES (Retrieved from Knowledge Base):
-        {json.dumps(candidates, indent=2)}
+        {json.dumps(context.candidates, indent=2)}
+        
+        CANDIDATE PROPERTIES PER COLUMN (Retrieved from Knowledge Base):
+        {json.dumps(context.column_candidates, indent=2)}
         
         INSTRUCTIONS:
         1. Select the SINGLE best Schema.org Class from the candidates that represents this table.
         2. If none are good matches, use "Thing" or "None".
-        3. Map each column in the Input Table to a valid property of that Class.
+        3. Map each column in the Input Table to a valid property of that Class,
+           preferring the retrieved property candidates for that column.
         4. If a column has no semantic equivalent (e.g. internal DB IDs), map it to "identifier" or leave blank/null.
         """
-        
-        # 3. Call LLM
-        response_text = self.llm.generate(system_prompt, user_prompt)
-        
-        # 4. Parse Response (Mock handling or JSON parsing)
-        try:
-            # If Mock env, the response might be simple string, so we force a valid structure for demo if needed
-            if hasattr(self.llm.model, "responses"): # It's a FakeListChatModel
-                 # In Mock mode, provide a fake valid response relevant to the table context if possible
-                 # But FakeListChatModel just cycles responses.
-                 # Let's just try to parse whatever comes back.
-                 pass
-            
-            # Basic cleanup for common markdown block issues ```json ... ```
-            clean_json = response_text.replace("```json", "").replace("```", "").strip()
-            data = json.loads(clean_json)
+        return system_prompt, user_prompt
+
+    @staticmethod
+    def _strip_fences(response_text: str) -> str:
+        # Basic cleanup for common markdown block issues ```json ... ```
+        return response_text.replace("```json", "").replace("```", "").strip()
+
+    @staticmethod
+    def _mapped_table_from_data(table: RawTable, data: Dict[str, Any]) -> MappedTable:
+        """Builds a MappedTable from one decoded JSON answer object."""
+        mapped_cols = []
+        for m in data.get("mappings", []):
+            mapped_cols.append(MappedColumn(
+                original_name=m["original_name"],
+                schema_property=m["schema_property"],
+                confidence=0.9, # Mock confidence
+                reason=m.get("reason", "")
+            ))
             
-            mapped_cols = []
-            for m in data.get("mappings", []):
-                mapped_cols.append(MappedColumn(
-                    original_name=m["original_name"],
-                    schema_property=m["schema_property"],
-                    confidence=0.9, # Mock confidence
-                    reason=m.get("reason", "")
-                ))
-                
-            return MappedTable(
-                original_table=table.name,
-                schema_class=data.get("schema_class", "Thing"),
-                columns=mapped_cols,
-                rationale=data.get("rationale", "")
-            )
+        return MappedTable(
+            original_table=table.name,
+            schema_class=data.get("schema_class", "Thing"),
+            columns=mapped_cols,
+            rationale=data.get("rationale", "")
+        )
+
+    def parse_response(self, table: RawTable, response_text: str) -> MappedTable:
+        """Parses the LLM's JSON answer into a MappedTable."""
+        try:
+            with telemetry.span("json_parse", chars=len(response_text)):
+                data = json.loads(self._strip_fences(response_text))
+                return self._mapped_table_from_data(table, data)
             
         except json.JSONDecodeError:
-            print(f"❌ LLM Output was not valid JSON: {response_text}")
+            logger.error("❌ LLM Output was not valid JSON: %s", response_text)
+            telemetry.count("json_parse_errors")
             # Return empty/error object
             return MappedTable(original_table=table.name, schema_class="Error", columns=[], rationale="Parsing Failed")
 
+    @property
+    def bypass_rate(self) -> float:
+        """Fraction of mapped tables that skipped the LLM."""
+        return self.stats["bypassed"] / self.stats["tables"] if self.stats["tables"] else 0.0
+
+    def map_table(self, table: RawTable) -> MappedTable:
+        """
+        Main entry point to map a single table.
+        """
+        logger.info("🔄 Mapping Table: %s", table.name)
+
+        # 1. Retrieve Candidates
+        with telemetry.span("map_table", table=table.name):
+            return self.map_context(self.prepare(table))
+
+    def map_context(self, context: MappingContext) -> MappedTable:
+        """
+        Maps a table whose retrieval already ran (see prepare), so retrieval and
+        the LLM call can run in separate pipeline stages.
+        """
+        table = context.table
+        self._bump("tables")
+
+        # 2. Skip the LLM if retrieval is already confident
+        decision = self.decide_bypass(context)
+        if decision.bypass:
+            logger.debug("   ⚡ Bypassing LLM: %s", decision.reason)
+            self._bump("bypassed")
+            return self.build_deterministic(table, decision, context)
+
+        # 3. Reuse an earlier answer for an equivalent table
+        cached = self.cache_lookup(context)
+        if cached is not None:
+            logger.debug("   💾 Cache hit")
+            return cached
+        
+        # 4. Call LLM
+        system_prompt, user_prompt = self.build_prompts(context)
+        self._bump("llm_calls")
+        response_text = self.llm.generate(system_prompt, user_prompt)
+        
+        # 5. Parse Response
+        result = self.finalize(context, self.parse_response(table, response_text))
+        self.cache_store(context, result)
+        return result
+
+    # ------------------------------------------------------------------
+    # Async / concurrent mapping
+    # ------------------------------------------------------------------
+
+    async def _agenerate_limited(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        limiter: Optional[RateLimiter] = None,
+    ) -> str:
+        """
+        Calls the LLM asynchronously under the rate limiter,
+        retrying 429/5xx errors with jittered exponential backoff.
+        """
+        estimate = settings.LLM_OUTPUT_TOKENS_ESTIMATE
+        prompt_tokens = count_tokens(system_prompt + user_prompt, self.llm.model_name)
+
+        for attempt in range(settings.LLM_MAX_RETRIES + 1):
+            if limiter:
+                await limiter.acquire(prompt_tokens + estimate)
+            self._bump("llm_calls")
+            try:
+                response_text = await self.llm.agenerate(system_prompt, user_prompt)
+            except Exception as e:
+                if attempt >= settings.LLM_MAX_RETRIES or not is_retryable_error(e):
+                    raise
+                self._bump("retries")
+                delay = backoff_delay(attempt, settings.LLM_RETRY_BASE_DELAY, settings.LLM_RETRY_MAX_DELAY)
+                logger.warning("   ⏳ Retryable LLM error (%s), retrying in %.1fs", type(e).__name__, delay)
+                await asyncio.sleep(delay)
+                continue
+
+            if limiter:
+                limiter.charge_tokens(count_tokens(response_text, self.llm.model_name) - estimate)
+            return response_text
+
+    async def amap_table(self, table: RawTable, limiter: Optional[RateLimiter] = None) -> MappedTable:
+        """
+        Async version of map_table. Retrieval runs in a worker thread,
+        the LLM call goes through `limiter`.
+        """
+        with telemetry.span("map_table", table=table.name):
+            context = await asyncio.to_thread(self.prepare, table)
+            return await self._amap_context(context, limiter)
+
+    async def amap_context(self, context: MappingContext, limiter: Optional[RateLimiter] = None) -> MappedTable:
+        """Async version of map_context (retrieval already ran, see prepare_many)."""
+        with telemetry.span("map_table", table=context.table.name):
+            return await self._amap_context(context, limiter)
+
+    async def _amap_context(self, context: MappingContext, limiter: Optional[RateLimiter] = None) -> MappedTable:
+        table = context.table
+        logger.info("🔄 Mapping Table: %s", table.name)
+        self._bump("tables")
+
+        decision = await asyncio.to_thread(self.decide_bypass, context)
+        if decision.bypass:
+            logger.debug("   ⚡ Bypassing LLM: %s", decision.reason)
+            self._bump("bypassed")
+            return self.build_deterministic(table, decision, context)
+
+        cached = self.cache_lookup(context)
+        if cached is not None:
+            logger.debug("   💾 Cache hit")
+            return cached
+
+        system_prompt, user_prompt = self.build_prompts(context)
+        response_text = await self._agenerate_limited(system_prompt, user_prompt, limiter)
+        result = self.finalize(context, self.parse_response(table, response_text))
+        self.cache_store(context, result)
+        return result
+
+    async def map_tables(
+        self,
+        tables: Iterable[RawTable],
+        max_concurrency: Optional[int] = None,
+        limiter: Optional[RateLimiter] = None,
+    ) -> AsyncIterator[MappedTable]:
+        """
+        Maps many tables concurrently, yielding each MappedTable as soon as it completes
+        (NOT in input order).
+
+        Retrieval for all tables runs first (see prepare_many), so their columns
+        share one property search. Concurrency is bounded by `max_concurrency`
+        (default: LLM_MAX_CONCURRENCY) and LLM calls are throttled by
+        requests/tokens-per-minute buckets (default: from settings).
+
+        Usage:
+            async for result in mapper.map_tables(tables):
+                ...
+        """
+        limiter = limiter or RateLimiter.from_settings()
+        semaphore = asyncio.Semaphore(max_concurrency or settings.LLM_MAX_CONCURRENCY)
+
+        contexts = await asyncio.to_thread(self.prepare_many, list(tables))
+
+        async def worker(context: MappingContext) -> MappedTable:
+            async with semaphore:
+                try:
+                    return await self.amap_context(context, limiter)
+                except Exception as e:
+                    logger.error("❌ Mapping failed for %s: %s", context.table.name, e)
+                    return MappedTable(original_table=context.table.name, schema_class="Error", columns=[],
+                                       rationale=f"LLM call failed: {e}")
+
+        tasks = [asyncio.ensure_future(worker(context)) for context in contexts]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    # ------------------------------------------------------------------
+    # Packed (multi-table) prompts
+    # ------------------------------------------------------------------
+
+    PACKED_SYSTEM_PROMPT = """You are an expert Ontology Engineer. Your task is to map SEVERAL legacy SQL tables, each to a standardized Schema.org Class.
+        
+        Output strictly in JSON format matching this structure, with one entry per input table:
+        {
+            "tables": [
+                {
+                    "table_name": "original_table_name",
+                    "schema_class": "BestMatchingClassOrNone",
+                    "rationale": "Why you chose this class...",
+                    "mappings": [
+                        {"original_name": "col_name", "schema_property": "mappedProperty", "reason": "why"}
+                    ]
+                }
+            ]
+        }
+        """
+
+    PACKED_INSTRUCTIONS = """
+        INSTRUCTIONS:
+        1. For EACH input table, select the SINGLE best Schema.org Class from its candidates.
+        2. If none are good matches, use "Thing" or "None".
+        3. Map each column to a valid property of that Class, preferring the retrieved property candidates.
+        4. If a column has no semantic equivalent (e.g. internal DB IDs), map it to "identifier" or leave blank/null.
+        5. Return the tables in the "tables" array, keyed by their exact "table_name".
+        """
+
+    @staticmethod
+    def _packed_table_section(context: MappingContext) -> Dict[str, Any]:
+        """The per-table part of a packed prompt."""
+        table = context.table
+        section = {
+            "table_name": table.name,
+            "columns": [{"name": c.name, "type": c.original_type} for c in context.unresolved_columns],
+            "candidate_classes": [
+                {"class": c["class"], "recall_score": c["recall_score"]} for c in context.candidates
+            ],
+            "candidate_properties": context.column_candidates,
+        }
+        if context.resolved:
+            section["already_mapped"] = {c.original_name: c.schema_property for c in context.resolved}
+        return section
+
+    def build_packed_prompts(self, contexts: List[MappingContext]) -> Tuple[str, str]:
+        """Builds one (system_prompt, user_prompt) pair covering several tables."""
+        sections = [self._packed_table_section(ctx) for ctx in contexts]
+        self._bump("prompt_columns", sum(len(ctx.unresolved_columns) for ctx in contexts))
+        user_prompt = f"""
+        INPUT TABLES (each with candidates retrieved from the Knowledge Base):
+        {json.dumps(sections, indent=1)}
+        {self.PACKED_INSTRUCTIONS}"""
+        return self.PACKED_SYSTEM_PROMPT, user_prompt
+
+    def pack_contexts(self, contexts: List[MappingContext], token_budget: int) -> List[List[MappingContext]]:
+        """
+        Greedily groups contexts so each packed prompt stays within `token_budget`
+        (measured with tiktoken). A table larger than the budget gets a pack of its own.
+        """
+        model_name = self.llm.model_name
+        overhead = count_tokens(self.PACKED_SYSTEM_PROMPT + self.PACKED_INSTRUCTIONS, model_name)
+
+        packs: List[List[MappingContext]] = []
+        current: List[MappingContext] = []
+        used = overhead
+        for ctx in contexts:
+            cost = count_tokens(json.dumps(self._packed_table_section(ctx), indent=1), model_name)
+            if current and used + cost > token_budget:
+                packs.append(current)
+                current, used = [], overhead
+            current.append(ctx)
+            used += cost
+        if current:
+            packs.append(current)
+        return packs
+
+    def _parse_packed_response(
+        self,
+        contexts: List[MappingContext],
+        response_text: str,
+    ) -> Tuple[Dict[str, MappedTable], List[MappingContext]]:
+        """
+        Splits a multi-table JSON answer into MappedTables.
+        Returns (results by table name, contexts that failed to parse).
+        """
+        try:
+            with telemetry.span("json_parse", chars=len(response_text), tables=len(contexts)):
+                data = json.loads(self._strip_fences(response_text))
+            entries = data.get("tables", []) if isinstance(data, dict) else []
+            by_name = {e.get("table_name"): e for e in entries if isinstance(e, dict)}
+        except json.JSONDecodeError:
+            logger.error("❌ Packed LLM Output was not valid JSON (%s tables)", len(contexts))
+            telemetry.count("json_parse_errors")
+            return {}, list(contexts)
+
+        results: Dict[str, MappedTable] = {}
+        failed: List[MappingContext] = []
+        for ctx in contexts:
+            entry = by_name.get(ctx.table.name)
+            try:
+                if entry is None:
+                    raise KeyError(ctx.table.name)
+                results[ctx.table.name] = self.finalize(ctx, self._mapped_table_from_data(ctx.table, entry))
+            except (KeyError, TypeError, AttributeError, ValueError):
+                failed.append(ctx)
+        return results, failed
+
+    def _map_pack(self, contexts: List[MappingContext]) -> Dict[str, MappedTable]:
+        """
+        Maps one pack with a single LLM call. Tables that fail to parse are
+        split in halves and retried; a lone table falls back to the single-table prompt.
+        """
+        if len(contexts) == 1:
+            ctx = contexts[0]
+            system_prompt, user_prompt = self.build_prompts(ctx)
+            self._bump("llm_calls")
+            result = self.parse_response(ctx.table, self.llm.generate(system_prompt, user_prompt))
+            return {ctx.table.name: self.finalize(ctx, result)}
+
+        system_prompt, user_prompt = self.build_packed_prompts(contexts)
+        self._bump("llm_calls")
+        results, failed = self._parse_packed_response(contexts, self.llm.generate(system_prompt, user_prompt))
+
+        if failed:
+            logger.info("   🔁 Retrying %s table(s) that failed to parse", len(failed))
+            self._bump("retries")
+            middle = len(failed) // 2
+            for half in (failed[:middle], failed[middle:]):
+                if half:
+                    results.update(self._map_pack(half))
+        return results
+
+    def map_tables_packed(self, tables: List[RawTable], token_budget: Optional[int] = None) -> List[MappedTable]:
+        """
+        Batch mapping mode: packs several tables (and their candidates) into each
+        prompt, up to `token_budget` tokens (default: PACKED_PROMPT_TOKEN_BUDGET).
+        Results are returned in input order.
+        """
+        token_budget = token_budget or settings.PACKED_PROMPT_TOKEN_BUDGET
+        results: Dict[int, MappedTable] = {}
+        pending: List[Tuple[int, MappingContext]] = []
+
+        for i, context in enumerate(self.prepare_many(tables)):
+            table = context.table
+            logger.info("🔄 Mapping Table: %s", table.name)
+            self._bump("tables")
+            decision = self.decide_bypass(context)
+            if decision.bypass:
+                logger.debug("   ⚡ Bypassing LLM: %s", decision.reason)
+                self._bump("bypassed")
+                results[i] = self.build_deterministic(table, decision, context)
+                continue
+
+            cached = self.cache_lookup(context)
+            if cached is not None:
+                logger.debug("   💾 Cache hit")
+                results[i] = cached
+            else:
+                pending.append((i, context))
+
+        # Table names may repeat across files, so packs never contain duplicates
+        # (the answer is keyed by table name).
+        while pending:
+            seen, batch, rest = set(), [], []
+            for i, ctx in pending:
+                (rest if ctx.table.name in seen else batch).append((i, ctx))
+                seen.add(ctx.table.name)
+            pending = rest
+
+            index_of = {id(ctx): i for i, ctx in batch}
+            for pack in self.pack_contexts([ctx for _, ctx in batch], token_budget):
+                logger.debug("   📦 Sending packed prompt with %s table(s)", len(pack))
+                mapped = self._map_pack(pack)
+                for ctx in pack:
+                    results[index_of[id(ctx)]] = mapped[ctx.table.name]
+                    self.cache_store(ctx, mapped[ctx.table.name])
+
+        return [results[i] for i in range(len(tables))]
+
+    # ------------------------------------------------------------------
+    # Near-duplicate tables
+    # ------------------------------------------------------------------
+
+    def map_residual_columns(self, table: RawTable, columns: List[RawColumn], schema_class: str) -> List[MappedColumn]:
+        """
+        Resolves only `columns` of `table`, with the Schema.org class already decided.
+        Confident retrieval matches skip the LLM, like in map_table.
+        """
+        if not columns:
+            return []
+        residual = RawTable(name=table.name, columns=columns, source_file=table.source_file)
+        allowed = self.vector_store.loader.get_properties_for_classes([schema_class])
+        context = MappingContext(
+            table=residual,
+            candidates=[{"class": schema_class, "description": f"Class: {schema_class}", "recall_score": 1.0}],
+            resolved=self.resolve_with_lexicon(columns, allowed),
+        )
+        pending = context.unresolved_columns
+        if pending:
+            pending_table = RawTable(name=table.name, columns=pending, source_file=table.source_file)
+            context.column_candidates = self.retrieve_property_candidates([pending_table], [schema_class])[0]
+
+        decision = self.decide_bypass(context)
+        if decision.bypass:
+            return self.build_deterministic(residual, decision, context).columns
+
+        cached = self.cache_lookup(context)
+        if cached is not None:
+            return cached.columns
+
+        system_prompt, user_prompt = self.build_prompts(context)
+        self._bump("llm_calls")
+        result = self.finalize(context, self.parse_response(residual, self.llm.generate(system_prompt, user_prompt)))
+        self.cache_store(context, result)
+        return result.columns
+
+    def project_mapping(self, source: RawTable, mapping: MappedTable, target: RawTable) -> MappedTable:
+        """
+        Reuses `mapping` (of `source`) for a near-identical `target` table.
+        Shared columns are copied; only target columns missing from `source` are resolved.
+        """
+        mapped_by_key = {column_key(c.original_name): c for c in mapping.columns}
+        source_keys = {column_key(c.name) for c in source.columns}
+
+        columns = []
+        differing = []
+        for col in target.columns:
+            key = column_key(col.name)
+            if key not in source_keys:
+                differing.append(col)
+            elif key in mapped_by_key:
+                columns.append(mapped_by_key[key].model_copy(update={"original_name": col.name}))
+
+        if differing:
+            logger.debug("   🧩 Resolving %s differing column(s) of '%s'", len(differing), target.name)
+            columns.extend(self.map_residual_columns(target, differing, mapping.schema_class))
+
+        return MappedTable(
+            original_table=target.name,
+            schema_class=mapping.schema_class,
+            columns=columns,
+            rationale=f"Projected from near-duplicate table '{source.name}': {mapping.rationale}",
+        )
+
+    def map_tables_deduplicated(
+        self,
+        tables: List[RawTable],
+        deduplicator: Optional[TableDeduplicator] = None,
+    ) -> List[MappedTable]:
+        """
+        Clusters near-duplicate tables (MinHash/LSH over column sets), maps one
+        representative per cluster and projects its mapping onto the other members.
+        Results are returned in input order.
+        """
+        deduplicator = deduplicator or TableDeduplicator(threshold=settings.DEDUP_SIMILARITY_THRESHOLD)
+        clusters = deduplicator.cluster_indices(tables)
+        logger.info("🧬 %s tables -> %s distinct shapes", len(tables), len(clusters))
+
+        results: List[Optional[MappedTable]] = [None] * len(tables)
+        for rep, members in clusters:
+            results[rep] = self.map_table(tables[rep])
+            for i in members:
+                if results[rep].schema_class == "Error":
+                    results[i] = self.map_table(tables[i])
+                    continue
+                self._bump("tables")
+                self._bump("projected")
+                results[i] = self.project_mapping(tables[rep], results[rep], tables[i])
+        return results
+
+    # ------------------------------------------------------------------
+    # Streaming
+    # ------------------------------------------------------------------
+
+    def _stream_mapping(
+        self,
+        context: MappingContext,
+        on_column: Optional[Callable[[MappedColumn], None]] = None,
+        reported: Optional[set] = None,
+    ) -> MappedTable:
+        """
+        Streams one LLM answer through the incremental parser, reporting each
+        column mapping as soon as its JSON object closes.
+        Raises StreamParseError as soon as the answer is structurally broken.
+        `reported` holds (column, property) pairs already passed to `on_column`
+        by an earlier attempt, so retries don't report them twice.
+        """
+        table = context.table
+        known = {c.name for c in context.unresolved_columns}
+        system_prompt, user_prompt = self.build_prompts(context)
+        parser = IncrementalMappingParser()
+        reported = reported if reported is not None else set()
+
+        self._bump("llm_calls")
+        chunks = self.llm.stream(system_prompt, user_prompt)
+        try:
+            for chunk in chunks:
+                for item in parser.feed(chunk):
+                    pair = (item["original_name"], item["schema_property"])
+                    if on_column and pair[0] in known and pair not in reported:
+                        reported.add(pair)
+                        on_column(MappedColumn(
+                            original_name=item["original_name"],
+                            schema_property=item["schema_property"],
+                            confidence=0.9, # Mock confidence
+                            reason=item.get("reason", ""),
+                        ))
+                if parser.done:
+                    break
+        finally:
+            # Stops the provider stream if we bailed out early
+            close = getattr(chunks, "close", None)
+            if close:
+                close()
+
+        return self.finalize(context, self._mapped_table_from_data(table, parser.finish()))
+
+    def map_table_streaming(
+        self,
+        table: RawTable,
+        on_column: Optional[Callable[[MappedColumn], None]] = None,
+    ) -> MappedTable:
+        """
+        Like map_table, but streams the LLM answer.
+
+        `on_column` is called for every MappedColumn as soon as it is known:
+        lexicon-resolved columns first, then each LLM mapping as its JSON object
+        closes. A structurally broken stream is aborted immediately and retried
+        (up to LLM_STREAM_MAX_ATTEMPTS).
+        """
+        logger.info("🔄 Mapping Table (streaming): %s", table.name)
+        self._bump("tables")
+
+        context = self.prepare(table)
+        decision = self.decide_bypass(context)
+        if decision.bypass:
+            logger.debug("   ⚡ Bypassing LLM: %s", decision.reason)
+            self._bump("bypassed")
+            result = self.build_deterministic(table, decision, context)
+            if on_column:
+                for col in result.columns:
+                    on_column(col)
+            return result
+
+        cached = self.cache_lookup(context)
+        if cached is not None:
+            logger.debug("   💾 Cache hit")
+            if on_column:
+                for col in cached.columns:
+                    on_column(col)
+            return cached
+
+        if on_column:
+            for col in context.resolved:
+                on_column(col)
+
+        reported: set = set()
+        for attempt in range(1, settings.LLM_STREAM_MAX_ATTEMPTS + 1):
+            try:
+                result = self._stream_mapping(context, on_column, reported)
+            except StreamParseError as e:
+                self._bump("stream_aborts")
+                logger.warning("   ✂️ Aborted stream (attempt %s): %s", attempt, e)
+                continue
+            self.cache_store(context, result)
+            return result
+
+        return MappedTable(original_table=table.name, schema_class="Error", columns=list(context.resolved),
+                           rationale="Parsing Failed (stream)")
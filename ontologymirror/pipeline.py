@@ -0,0 +1,250 @@
+import logging
+import multiprocessing
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+from .config.settings import settings
+from .core.domain import RawTable
+from .core.telemetry import run_collected, telemetry
+from .extractors.git_loader import GitLoader
+from .extractors.sql_parser import SqlExtractor
+from .mappers.semantic_mapper import SemanticMapper, MappedTable
+
+logger = logging.getLogger(__name__)
+
+# Marks the end of a stage's input
+_DONE = object()
+# How often blocked workers re-check for cancellation (seconds)
+_POLL = 0.1
+
+
+class RepoSource(BaseModel):
+    """A cloned repository, as passed from the clone stage to the extract stage."""
+    url: str
+    repo: str
+    path: str
+    commit: Optional[str] = None
+
+
+class TableResult(BaseModel):
+    """A mapped table together with the raw table (and repo/commit) it came from."""
+    table: RawTable
+    result: MappedTable
+
+
+class Stage:
+    """
+    One pipeline stage: `fn` applied to every item by `workers` workers.
+
+    - kind="thread":  fn runs in worker threads (I/O bound: git, LLM calls).
+    - kind="process": fn runs in a process pool of `workers` processes (CPU bound);
+                      fn and its items must be picklable. Telemetry recorded in the
+                      worker (spans, counters) is merged back into this process.
+    - fan_out=True:   fn returns an iterable and each element is passed on separately.
+    Returning None drops the item.
+    """
+
+    def __init__(self, name: str, fn: Callable[[Any], Any], workers: int = 1, kind: str = "thread", fan_out: bool = False):
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Unknown stage kind: {kind}")
+        self.name = name
+        self.fn = fn
+        self.workers = max(1, workers)
+        self.kind = kind
+        self.fan_out = fan_out
+
+
+class Pipeline:
+    """
+    Runs stages concurrently, connected by bounded queues.
+
+    A full queue blocks the stage feeding it (backpressure), so memory stays
+    bounded and steady-state throughput is set by the slowest stage rather than
+    the sum of all stages. Items that raise are recorded in `errors` and skipped.
+    `cancel()` (or closing the result iterator) stops all stages promptly:
+    items already being processed finish, nothing new is started.
+    A Pipeline object runs once.
+    """
+
+    def __init__(self, stages: List[Stage], queue_size: Optional[int] = None):
+        if not stages:
+            raise ValueError("A pipeline needs at least one stage")
+        self.stages = stages
+        self.queue_size = queue_size or settings.PIPELINE_QUEUE_SIZE
+        self.errors: List[Tuple[str, Any, BaseException]] = []
+        self.stats: Dict[str, Dict[str, float]] = {
+            s.name: {"in": 0, "out": 0, "errors": 0, "busy_seconds": 0.0} for s in stages
+        }
+        self._cancel = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def cancel(self):
+        self._cancel.set()
+
+    def _put(self, q: queue.Queue, item) -> bool:
+        while not self._cancel.is_set():
+            try:
+                q.put(item, timeout=_POLL)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(self, q: queue.Queue):
+        while not self._cancel.is_set():
+            try:
+                return q.get(timeout=_POLL)
+            except queue.Empty:
+                continue
+        return _DONE
+
+    def _feed(self, inputs: Iterable, out: queue.Queue):
+        try:
+            for item in inputs:
+                if not self._put(out, item):
+                    return
+        except Exception as e:
+            logger.exception("⚠️ Pipeline input failed: %s", e)
+            with self._lock:
+                self.errors.append(("input", None, e))
+        self._put(out, _DONE)
+
+    def _record(self, stage: Stage, key: str, amount: float = 1):
+        with self._lock:
+            self.stats[stage.name][key] += amount
+
+    def _work(self, stage: Stage, inbox: queue.Queue, outbox: queue.Queue, pool, remaining: List[int]):
+        try:
+            while True:
+                item = self._get(inbox)
+                if item is _DONE:
+                    # Let sibling workers see the end of input too
+                    self._put(inbox, _DONE)
+                    return
+                self._record(stage, "in")
+                start = time.perf_counter()
+                try:
+                    with telemetry.span(f"stage.{stage.name}"):
+                        if pool:
+                            output, collected = pool.submit(run_collected, telemetry.enabled, stage.fn, item).result()
+                            if collected:
+                                telemetry.merge(collected)
+                        else:
+                            output = stage.fn(item)
+                except Exception as e:
+                    if getattr(e, "telemetry", None):
+                        telemetry.merge(e.telemetry)
+                    logger.exception("⚠️ Stage '%s' failed: %s", stage.name, e)
+                    self._record(stage, "errors")
+                    with self._lock:
+                        self.errors.append((stage.name, item, e))
+                    continue
+                finally:
+                    self._record(stage, "busy_seconds", time.perf_counter() - start)
+
+                if output is None:
+                    continue
+                for out in (output if stage.fan_out else (output,)):
+                    if not self._put(outbox, out):
+                        return
+                    self._record(stage, "out")
+        finally:
+            with self._lock:
+                remaining[0] -= 1
+                last = remaining[0] == 0
+            if last:
+                if pool:
+                    pool.shutdown(wait=False, cancel_futures=True)
+                self._put(outbox, _DONE)
+
+    def run(self, inputs: Iterable) -> Iterator:
+        """Starts all stages and yields the last stage's outputs as they are produced."""
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in range(len(self.stages) + 1)]
+        threads = [threading.Thread(target=self._feed, args=(inputs, queues[0]), name="pipeline-input", daemon=True)]
+
+        for i, stage in enumerate(self.stages):
+            # "spawn": forking a process that already runs threads can deadlock the child
+            pool = (
+                ProcessPoolExecutor(max_workers=stage.workers, mp_context=multiprocessing.get_context("spawn"))
+                if stage.kind == "process" else None
+            )
+            remaining = [stage.workers]
+            for n in range(stage.workers):
+                threads.append(threading.Thread(
+                    target=self._work,
+                    args=(stage, queues[i], queues[i + 1], pool, remaining),
+                    name=f"pipeline-{stage.name}-{n}",
+                    daemon=True,
+                ))
+
+        for t in threads:
+            t.start()
+        try:
+            while True:
+                item = self._get(queues[-1])
+                if item is _DONE:
+                    break
+                yield item
+        finally:
+            # Normal end, consumer stopped early, or KeyboardInterrupt: stop everything
+            self.cancel()
+            for t in threads:
+                t.join(timeout=5)
+
+
+def extract_repo(source: RepoSource) -> List[RawTable]:
+    """Extract stage (runs in a worker process): parses a cloned repo's schema files."""
+    tables = SqlExtractor().extract(source.path)
+    return [t.model_copy(update={"repo": source.repo, "commit": source.commit}) for t in tables]
+
+
+def build_repo_pipeline(
+    mapper: SemanticMapper,
+    sink: Callable[[TableResult], Any],
+    git_loader: Optional[GitLoader] = None,
+    skip: Optional[Callable[[RawTable], bool]] = None,
+    queue_size: Optional[int] = None,
+) -> Pipeline:
+    """
+    The standard clone -> extract -> retrieve -> map -> generate pipeline.
+    Input items are repo URLs (or local git paths); `sink` receives every
+    TableResult (the generate stage, single-threaded so sinks need no locking).
+    Tables for which `skip(table)` is true are dropped before retrieval.
+    """
+    git_loader = git_loader or GitLoader()
+
+    def clone(url: str) -> RepoSource:
+        path = git_loader.load_repo(url)
+        return RepoSource(url=url, repo=git_loader.repo_name(url), path=path, commit=git_loader.head_commit(path))
+
+    def retrieve(table: RawTable):
+        if skip and skip(table):
+            return None
+        return mapper.prepare(table)
+
+    def map_context(context) -> TableResult:
+        return TableResult(table=context.table, result=mapper.map_context(context))
+
+    def generate(item: TableResult) -> TableResult:
+        sink(item)
+        return item
+
+    return Pipeline(
+        [
+            Stage("clone", clone, settings.PIPELINE_CLONE_WORKERS),
+            Stage("extract", extract_repo, settings.PIPELINE_EXTRACT_WORKERS, kind="process", fan_out=True),
+            Stage("retrieve", retrieve, settings.PIPELINE_RETRIEVE_WORKERS),
+            Stage("map", map_context, settings.LLM_MAX_CONCURRENCY),
+            Stage("generate", generate, 1),
+        ],
+        queue_size=queue_size,
+    )
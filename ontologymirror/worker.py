@@ -0,0 +1,147 @@
+import os
+import socket
+import threading
+import uuid
+from typing import Any, Callable, Dict, Optional
+
+from .config.settings import settings
+from .core.domain import RawTable
+from .core.job_queue import Job, JobQueue
+from .extractors.git_loader import GitLoader
+from .extractors.sql_parser import SqlExtractor
+from .mappers.bulk_runner import table_key
+from .mappers.results_store import ResultsStore
+from .mappers.semantic_mapper import SemanticMapper
+from .pipeline import TableResult
+
+REPO_JOB, TABLE_JOB = "repo", "table"
+
+
+class QueueWorker:
+    """
+    Pulls jobs from a JobQueue and runs the handler registered for their kind.
+
+    While a handler runs, a background thread renews the job's lease every
+    `heartbeat_interval` seconds, so long jobs are not reclaimed; if the worker
+    dies, heartbeats stop and the lease expires. A handler's return value is
+    stored as the job result; an exception fails the job (retry / dead letter).
+    """
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        handlers: Dict[str, Callable[[Job], Any]],
+        worker_id: Optional[str] = None,
+        heartbeat_interval: Optional[float] = None,
+        poll_interval: Optional[float] = None,
+    ):
+        self.queue = queue
+        self.handlers = handlers
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self.heartbeat_interval = heartbeat_interval or settings.JOB_HEARTBEAT_SECONDS
+        self.poll_interval = poll_interval if poll_interval is not None else settings.JOB_POLL_SECONDS
+        self.stats: Dict[str, int] = {"done": 0, "failed": 0, "lost_leases": 0}
+        self._stop = threading.Event()
+
+    def stop(self):
+        """Finish the current job, then exit."""
+        self._stop.set()
+
+    def _heartbeat(self, job: Job, done: threading.Event):
+        # sqlite connections can't be shared across threads: use a separate one
+        queue = JobQueue(self.queue.path, lease_seconds=self.queue.lease_seconds, clock=self.queue.clock)
+        try:
+            while not done.wait(self.heartbeat_interval):
+                if not queue.heartbeat(job):
+                    print(f"⚠️ Lost the lease on job {job.id}")
+                    return
+        finally:
+            queue.close()
+
+    def run_one(self, job: Job) -> bool:
+        """Runs a claimed job; True if it completed."""
+        handler = self.handlers.get(job.kind)
+        done = threading.Event()
+        beat = threading.Thread(target=self._heartbeat, args=(job, done), daemon=True)
+        beat.start()
+        try:
+            if handler is None:
+                raise ValueError(f"No handler for job kind {job.kind!r}")
+            result = handler(job)
+        except Exception as e:
+            done.set()
+            beat.join()
+            print(f"❌ Job {job.id} ({job.kind}) failed on attempt {job.attempts}/{job.max_attempts}: {e}")
+            self.stats["failed"] += 1
+            if not self.queue.fail(job, f"{type(e).__name__}: {e}"):
+                self.stats["lost_leases"] += 1
+            return False
+        done.set()
+        beat.join()
+        if self.queue.complete(job, result):
+            self.stats["done"] += 1
+            return True
+        self.stats["lost_leases"] += 1
+        return False
+
+    def run(self, max_jobs: Optional[int] = None, exit_when_idle: bool = False) -> Dict[str, int]:
+        """
+        Processes jobs until stopped, `max_jobs` are done, or (with
+        `exit_when_idle`) no job of this worker's kinds is queued or running.
+        Queued jobs waiting out a retry backoff keep the worker alive.
+        """
+        processed = 0
+        kinds = list(self.handlers)
+        while not self._stop.is_set() and (max_jobs is None or processed < max_jobs):
+            job = self.queue.claim(self.worker_id, kinds)
+            if job is None:
+                if exit_when_idle:
+                    counts = self.queue.counts(kinds)
+                    if not counts["queued"] and not counts["leased"]:
+                        break
+                self._stop.wait(self.poll_interval)
+                continue
+            self.run_one(job)
+            processed += 1
+        return dict(self.stats)
+
+
+def mapping_handlers(
+    queue: JobQueue,
+    mapper_factory: Callable[[], SemanticMapper] = SemanticMapper,
+    results_store: Optional[ResultsStore] = None,
+    git_loader: Optional[GitLoader] = None,
+) -> Dict[str, Callable[[Job], Any]]:
+    """
+    Handlers for the two standard job kinds:
+      - "repo"  {"url"}: clone + extract, then enqueue one "table" job per table
+      - "table" {"table": RawTable}: map it and store the result
+    The mapper is built on the first table job, so repo-only workers stay light.
+    """
+    git_loader = git_loader or GitLoader()
+    extractor = SqlExtractor()
+    mapper: Dict[str, SemanticMapper] = {}
+
+    def handle_repo(job: Job):
+        url = job.payload["url"]
+        path = git_loader.load_repo(url)
+        repo, commit = git_loader.repo_name(url), git_loader.head_commit(path)
+        tables = [t.model_copy(update={"repo": repo, "commit": commit}) for t in extractor.extract(path)]
+        added = queue.enqueue_many(
+            TABLE_JOB,
+            [({"table": t.model_dump()}, f"{TABLE_JOB}:{table_key(t, repo)}@{commit or ''}") for t in tables],
+        )
+        return {"repo": repo, "commit": commit, "tables": len(tables), "enqueued": len(added)}
+
+    def handle_table(job: Job):
+        if "mapper" not in mapper:
+            mapper["mapper"] = mapper_factory()
+        table = RawTable.model_validate(job.payload["table"])
+        result = mapper["mapper"].map_table(table)
+        if result.schema_class == "Error":
+            raise RuntimeError(f"Mapping failed: {result.rationale}")
+        if results_store is not None:
+            results_store.add_results([TableResult(table=table, result=result)])
+        return result.model_dump()
+
+    return {REPO_JOB: handle_repo, TABLE_JOB: handle_table}
@@ -0,0 +1,36 @@
+import sys
+import os
+import json
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from ontologymirror.extractors.sql_parser import SqlExtractor
+from ontologymirror.mappers.semantic_mapper import SemanticMapper
+from ontologymirror.mappers.bulk_runner import BulkMappingRunner
+from ontologymirror.core.telemetry import configure_logging, telemetry
+
+def main():
+    # Usage: python scripts/bulk_map.py <source_dir> <results.jsonl> [repo_name]
+    # Re-running the same command resumes where the previous run stopped.
+    if len(sys.argv) < 3:
+        print("Usage: python scripts/bulk_map.py <source_dir> <results.jsonl> [repo_name]")
+        return
+    source_dir, output_path = sys.argv[1], sys.argv[2]
+    repo = sys.argv[3] if len(sys.argv) > 3 else None
+    configure_logging()
+    telemetry.start()
+
+    # Tables are parsed file by file as the runner asks for them, so memory
+    # doesn't grow with the size of the source tree
+    tables = SqlExtractor().iter_extract(source_dir)
+    print(f"📦 Mapping tables from {source_dir}, writing to {output_path}")
+
+    with BulkMappingRunner(SemanticMapper(), output_path) as runner:
+        print(f"⏩ {runner.completed_count()} tables already completed")
+        stats = runner.run(tables, repo=repo)
+
+    print("\n✅ Bulk run finished:")
+    print(json.dumps(stats, indent=2))
+
+if __name__ == "__main__":
+    main()
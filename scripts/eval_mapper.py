@@ -0,0 +1,37 @@
+import sys
+import os
+import json
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from ontologymirror.config.settings import settings
+from ontologymirror.mappers.semantic_mapper import SemanticMapper
+from ontologymirror.mappers.evaluation import load_labelled_tables, evaluate_mapper
+
+def main():
+    # Usage: python scripts/eval_mapper.py [labelled_tables.json] [--compare-lexicon]
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    fixture = args[0] if args else os.path.abspath(
+        os.path.join(os.path.dirname(__file__), '../tests/fixtures/labelled_tables.json'))
+
+    print(f"📏 Evaluating mapper on {os.path.basename(fixture)}...")
+    labelled = load_labelled_tables(fixture)
+    mapper = SemanticMapper()
+    report = evaluate_mapper(mapper, labelled)
+
+    print("\n✅ Evaluation Report:")
+    print(json.dumps(report, indent=2))
+
+    if "--compare-lexicon" in sys.argv:
+        # Same run without the lexicon pre-mapper, to see how much it saves
+        settings.LEXICON_ENABLED = False
+        settings.LLM_CACHE_BYPASS = True
+        baseline = evaluate_mapper(SemanticMapper(), labelled)
+        print("\n📉 Without lexicon:")
+        print(json.dumps(baseline, indent=2))
+        if baseline["prompt_columns"]:
+            saved = 1 - report["prompt_columns"] / baseline["prompt_columns"]
+            print(f"\n✂️  Prompt columns reduced by {saved:.0%}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+import sys
+import os
+import argparse
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from ontologymirror.core.stub_server import StubLLMServer, StubServerConfig
+
+def main():
+    # Usage: python scripts/llm_stub_server.py --port 8089 --latency lognormal:300 --error-rate 0.02
+    # then:  LLM_PROVIDER=openai OPENAI_API_KEY=stub OPENAI_BASE_URL=http://127.0.0.1:8089/v1 ...
+    parser = argparse.ArgumentParser(description="Local OpenAI-compatible stub LLM for offline load tests.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency", default="fixed:0",
+                        help="fixed:MS | uniform:MIN_MS:MAX_MS | lognormal:MEDIAN_MS[:SIGMA]")
+    parser.add_argument("--rpm", type=float, default=None, help="Requests per minute before 429s")
+    parser.add_argument("--tpm", type=float, default=None, help="Prompt tokens per minute before 429s")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Probability of a random 5xx")
+    parser.add_argument("--malformed-rate", type=float, default=0.0, help="Probability of truncated JSON content")
+    parser.add_argument("--chunk-chars", type=int, default=16, help="Characters per streamed chunk")
+    parser.add_argument("--chunk-delay-ms", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    kind, *params = args.latency.split(":")
+    params = [float(p) for p in params]
+    latency = {"latency_distribution": kind}
+    if kind == "uniform":
+        latency.update(latency_ms=params[0], latency_max_ms=params[1])
+    elif kind == "lognormal":
+        latency.update(latency_ms=params[0], latency_sigma=params[1] if len(params) > 1 else 0.5)
+    else:
+        latency.update(latency_ms=params[0] if params else 0.0)
+
+    config = StubServerConfig(
+        host=args.host,
+        port=args.port,
+        requests_per_minute=args.rpm,
+        tokens_per_minute=args.tpm,
+        error_rate=args.error_rate,
+        malformed_rate=args.malformed_rate,
+        stream_chunk_chars=args.chunk_chars,
+        stream_chunk_delay_ms=args.chunk_delay_ms,
+        seed=args.seed,
+        **latency,
+    )
+    StubLLMServer(config).serve_forever()
+
+if __name__ == "__main__":
+    main()
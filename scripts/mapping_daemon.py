@@ -0,0 +1,36 @@
+import sys
+import os
+import json
+import argparse
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from ontologymirror.daemon import MappingDaemon, MappingClient
+from ontologymirror.core.telemetry import configure_logging, telemetry
+
+def main():
+    # Usage: python scripts/mapping_daemon.py [--socket PATH] [--status | --stop]
+    parser = argparse.ArgumentParser(description="Warm SemanticMapper served over a Unix socket.")
+    parser.add_argument("--socket", help="Socket path (default: DAEMON_SOCKET_PATH or DATA_DIR/ontologymirror.sock)")
+    parser.add_argument("--status", action="store_true", help="Print the running daemon's stats")
+    parser.add_argument("--stop", action="store_true", help="Ask the running daemon to exit")
+    args = parser.parse_args()
+    configure_logging()
+    telemetry.start()
+
+    client = MappingClient(args.socket)
+    if args.status or args.stop:
+        if not client.daemon_available():
+            print("💤 No daemon running")
+            return
+        if args.stop:
+            client.shutdown()
+            print("🛑 Daemon stopping")
+        else:
+            print(json.dumps(client._request({"op": "stats"}), indent=2))
+        return
+
+    MappingDaemon(socket_path=args.socket).serve_forever()
+
+if __name__ == "__main__":
+    main()
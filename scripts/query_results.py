@@ -0,0 +1,56 @@
+import sys
+import os
+import json
+import argparse
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from ontologymirror.mappers.results_store import ResultsStore
+from ontologymirror.mappers.bulk_runner import read_results
+
+def main():
+    # Usage: python scripts/query_results.py repos-for-class Person
+    #        python scripts/query_results.py columns-for-property email --limit 20
+    #        python scripts/query_results.py import data/output/mappings.jsonl
+    parser = argparse.ArgumentParser(description="Query mapping results across repos.")
+    parser.add_argument("--db", help="Results store path (default: RESULTS_STORE_PATH or DATA_DIR/results.sqlite)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("import", help="Load a bulk results JSONL file")
+    p.add_argument("results_file")
+    p = sub.add_parser("repos-for-class", help="Repos with a table mapped to CLASS")
+    p.add_argument("schema_class")
+    p = sub.add_parser("columns-for-property", help="Columns mapped to PROPERTY")
+    p.add_argument("schema_property")
+    p.add_argument("--limit", type=int)
+    p = sub.add_parser("tables", help="Mapped tables, filtered")
+    p.add_argument("--class", dest="schema_class")
+    p.add_argument("--repo")
+    p.add_argument("--table", dest="raw_table")
+    p.add_argument("--commit")
+    p.add_argument("--limit", type=int)
+    p = sub.add_parser("summary", help="Counts and top classes")
+    p.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    store = ResultsStore(args.db)
+    start = time.perf_counter()
+    if args.command == "import":
+        output = {"imported": store.add_results(read_results(args.results_file))}
+    elif args.command == "repos-for-class":
+        output = store.repos_for_class(args.schema_class)
+    elif args.command == "columns-for-property":
+        output = store.columns_for_property(args.schema_property, limit=args.limit)
+    elif args.command == "tables":
+        output = store.tables(args.schema_class, args.repo, args.raw_table, args.commit, limit=args.limit)
+    else:
+        output = {"totals": store.stats(), "classes": store.class_counts(limit=args.limit)}
+    elapsed = time.perf_counter() - start
+
+    print(json.dumps(output, indent=2, ensure_ascii=False))
+    print(f"⏱️ {elapsed * 1000:.1f} ms", file=sys.stderr)
+    store.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+import sys
+import os
+import json
+import argparse
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from ontologymirror.core.job_queue import JobQueue
+from ontologymirror.mappers.results_store import ResultsStore
+from ontologymirror.worker import QueueWorker, mapping_handlers, REPO_JOB
+from ontologymirror.core.telemetry import configure_logging, telemetry
+
+def main():
+    # Usage: python scripts/queue_worker.py enqueue https://github.com/org/app.git
+    #        python scripts/queue_worker.py enqueue --urls-file repos.txt
+    #        python scripts/queue_worker.py work            (run one per process / host)
+    #        python scripts/queue_worker.py status
+    #        python scripts/queue_worker.py dead-letters
+    #        python scripts/queue_worker.py requeue [ID ...]
+    parser = argparse.ArgumentParser(description="Distributed mapping over a shared sqlite job queue.")
+    parser.add_argument("--queue", help="Queue path (default: JOB_QUEUE_PATH or DATA_DIR/jobs.sqlite)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("enqueue", help="Queue repos for cloning, extraction and mapping")
+    p.add_argument("urls", nargs="*")
+    p.add_argument("--urls-file", help="File with one repo URL per line")
+    p = sub.add_parser("work", help="Process jobs")
+    p.add_argument("--kinds", help="Comma-separated job kinds to take (default: all)")
+    p.add_argument("--max-jobs", type=int)
+    p.add_argument("--exit-when-idle", action="store_true", help="Stop once no job is queued or running")
+    p.add_argument("--worker-id")
+    sub.add_parser("status", help="Job counts by status")
+    p = sub.add_parser("dead-letters", help="List dead-lettered jobs")
+    p.add_argument("--limit", type=int, default=100)
+    p = sub.add_parser("requeue", help="Retry dead-lettered jobs (all, or the given ids)")
+    p.add_argument("ids", nargs="*", type=int)
+    args = parser.parse_args()
+    configure_logging()
+    telemetry.start()
+
+    queue = JobQueue(args.queue)
+    if args.command == "enqueue":
+        urls = list(args.urls)
+        if args.urls_file:
+            with open(args.urls_file, encoding="utf-8") as f:
+                urls.extend(line.strip() for line in f if line.strip() and not line.startswith("#"))
+        # Finished repos are queued again to pick up new commits; their table
+        # jobs are keyed by commit, so only tables of new commits get mapped
+        added = queue.enqueue_many(REPO_JOB, (({"url": url}, f"{REPO_JOB}:{url}") for url in urls), requeue_done=True)
+        print(f"📥 Queued {len(added)} repos ({len(urls) - len(added)} already queued or running)")
+    elif args.command == "work":
+        store = ResultsStore.from_settings()
+        handlers = mapping_handlers(queue, results_store=store)
+        if args.kinds:
+            kinds = args.kinds.split(",")
+            handlers = {k: v for k, v in handlers.items() if k in kinds}
+        worker = QueueWorker(queue, handlers, worker_id=args.worker_id)
+        print(f"👷 Worker {worker.worker_id} taking {', '.join(handlers)} jobs from {queue.path}")
+        try:
+            stats = worker.run(max_jobs=args.max_jobs, exit_when_idle=args.exit_when_idle)
+        except KeyboardInterrupt:
+            stats = worker.stats
+        print(f"✅ Worker finished: {stats}")
+        if store:
+            store.close()
+    elif args.command == "status":
+        print(json.dumps(queue.counts(), indent=2))
+    elif args.command == "dead-letters":
+        print(json.dumps(queue.dead_letters(limit=args.limit), indent=2, ensure_ascii=False))
+    else:
+        print(f"🔁 Requeued {queue.requeue_dead(args.ids or None)} jobs")
+    queue.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+import sys
+import os
+import argparse
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.corpus import PRESETS
+from benchmarks.harness import build_report, compare, environment, load_report, write_report
+from benchmarks.suite import BENCHMARKS, BenchContext, run_suite
+
+def main():
+    # Usage: python scripts/run_benchmarks.py --preset small --output data/benchmarks/current.json
+    #        python scripts/run_benchmarks.py --baseline benchmarks/baselines/small.json   (exit 1 on regression)
+    #        python scripts/run_benchmarks.py --output benchmarks/baselines/small.json     (re-record the baseline)
+    # The committed baseline was recorded on one machine: re-record it on the
+    # machine that runs the comparison (e.g. the CI runner) before trusting it.
+    #        python scripts/run_benchmarks.py --only extract vector.search --kind micro
+    parser = argparse.ArgumentParser(description="Offline benchmarks over a synthetic corpus.")
+    parser.add_argument("--preset", choices=list(PRESETS), default="small", help="Corpus size")
+    parser.add_argument("--repos", type=int, help="Override the preset's repo count")
+    parser.add_argument("--dump-rows", type=int, help="Override the preset's INSERT rows per table")
+    parser.add_argument("--seed", type=int, help="Override the corpus seed")
+    parser.add_argument("--only", nargs="*", help="Benchmark names or prefixes (e.g. extract, vector.search)")
+    parser.add_argument("--kind", choices=["micro", "macro"], action="append", help="Only micro or macro benchmarks")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--max-tables", type=int, default=200, help="Tables used by the mapping benchmarks")
+    parser.add_argument("--output", help="Write the JSON report here")
+    parser.add_argument("--baseline", help="Compare against this report and flag regressions")
+    parser.add_argument("--threshold", type=float, default=0.15, help="Relative slowdown counted as a regression")
+    parser.add_argument("--list", action="store_true", help="List benchmarks and exit")
+    args = parser.parse_args()
+
+    if args.list:
+        for name, (kind, _) in BENCHMARKS.items():
+            print(f"{kind:5}  {name}")
+        return
+
+    overrides = {k: v for k, v in (("repos", args.repos), ("dump_rows", args.dump_rows), ("seed", args.seed))
+                 if v is not None}
+    config = PRESETS[args.preset].model_copy(update=overrides)
+
+    print(f"🏗️ Generating '{args.preset}' corpus...")
+    ctx = BenchContext(config, max_tables=args.max_tables)
+    manifest = ctx.manifest
+    print(f"   {len(manifest.repos)} repos, {manifest.files} files, {manifest.tables} tables, "
+          f"{manifest.bytes / 1024:.0f} KiB")
+    try:
+        results = run_suite(ctx, names=args.only, kinds=args.kind, repeat=args.repeat,
+                            warmup=args.warmup, progress=print)
+    finally:
+        ctx.close()
+
+    comparisons = None
+    if args.baseline:
+        baseline = load_report(args.baseline)
+        if baseline.get("corpus") != manifest.model_dump(exclude={"root", "repos", "schema_graph"}):
+            print("⚠️ Baseline was recorded on a different corpus; differences may not be regressions")
+        recorded, current = baseline.get("environment", {}), environment()
+        if any(recorded.get(k) != current[k] for k in ("python", "machine", "cpus")):
+            print(f"⚠️ Baseline was recorded on another environment (python {recorded.get('python')}, "
+                  f"{recorded.get('cpus')} CPUs); differences may not be regressions")
+        comparisons = compare(results, baseline, threshold=args.threshold)
+        print("\n📊 Against baseline:")
+        for c in comparisons:
+            change = f"{c.change * 100:+.1f}%" if c.change is not None else "new"
+            marker = {"regression": "❌", "improvement": "🚀", "new": "🆕"}.get(c.status, "✅")
+            print(f"   {marker} {c.name:32} {c.current * 1000:10.2f} ms  {change}")
+
+    report = build_report(results, {**config.model_dump(), "preset": args.preset, "repeat": args.repeat},
+                          manifest.model_dump(exclude={"root", "repos", "schema_graph"}), comparisons)
+    if args.output:
+        write_report(report, args.output)
+        print(f"💾 Report written to {args.output}")
+
+    if report.get("regressions"):
+        print(f"❌ {len(report['regressions'])} regressions: {', '.join(report['regressions'])}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
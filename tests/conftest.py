@@ -0,0 +1,92 @@
+import pytest
+
+from ontologymirror.mappers.schema_loader import SchemaOrgLoader
+
+# A tiny, hand-written slice of the Schema.org JSON-LD graph.
+# Lets tests run offline without downloading the full vocabulary.
+MINI_GRAPH = [
+    {"@id": "schema:Thing", "@type": "rdfs:Class", "rdfs:label": "Thing",
+     "rdfs:comment": "The most generic type of item."},
+    {"@id": "schema:Person", "@type": "rdfs:Class", "rdfs:label": "Person",
+     "rdfs:comment": "A person (alive, dead, undead, or fictional).",
+     "rdfs:subClassOf": {"@id": "schema:Thing"}},
+    {"@id": "schema:CreativeWork", "@type": "rdfs:Class", "rdfs:label": "CreativeWork",
+     "rdfs:comment": "The most generic kind of creative work.",
+     "rdfs:subClassOf": {"@id": "schema:Thing"}},
+    {"@id": "schema:BlogPosting", "@type": "rdfs:Class", "rdfs:label": "BlogPosting",
+     "rdfs:comment": "A blog post.",
+     "rdfs:subClassOf": {"@id": "schema:CreativeWork"}},
+    {"@id": "schema:Product", "@type": "rdfs:Class", "rdfs:label": "Product",
+     "rdfs:comment": "Any offered product or service.",
+     "rdfs:subClassOf": {"@id": "schema:Thing"}},
+
+    {"@id": "schema:name", "@type": "rdf:Property", "rdfs:label": "name",
+     "rdfs:comment": "The name of the item.",
+     "schema:domainIncludes": {"@id": "schema:Thing"}, "schema:rangeIncludes": {"@id": "schema:Text"}},
+    {"@id": "schema:identifier", "@type": "rdf:Property", "rdfs:label": "identifier",
+     "rdfs:comment": "The identifier property represents any kind of identifier.",
+     "schema:domainIncludes": {"@id": "schema:Thing"}, "schema:rangeIncludes": {"@id": "schema:Text"}},
+    {"@id": "schema:description", "@type": "rdf:Property", "rdfs:label": "description",
+     "rdfs:comment": "A description of the item.",
+     "schema:domainIncludes": {"@id": "schema:Thing"}, "schema:rangeIncludes": {"@id": "schema:Text"}},
+    {"@id": "schema:url", "@type": "rdf:Property", "rdfs:label": "url",
+     "rdfs:comment": "URL of the item.",
+     "schema:domainIncludes": {"@id": "schema:Thing"}, "schema:rangeIncludes": {"@id": "schema:URL"}},
+    {"@id": "schema:email", "@type": "rdf:Property", "rdfs:label": "email",
+     "rdfs:comment": "Email address.",
+     "schema:domainIncludes": [{"@id": "schema:Person"}], "schema:rangeIncludes": {"@id": "schema:Text"}},
+    {"@id": "schema:givenName", "@type": "rdf:Property", "rdfs:label": "givenName",
+     "rdfs:comment": "Given name. In the U.S., the first name of a Person.",
+     "schema:domainIncludes": {"@id": "schema:Person"}, "schema:rangeIncludes": {"@id": "schema:Text"}},
+    {"@id": "schema:familyName", "@type": "rdf:Property", "rdfs:label": "familyName",
+     "rdfs:comment": "Family name. In the U.S., the last name of a Person.",
+     "schema:domainIncludes": {"@id": "schema:Person"}, "schema:rangeIncludes": {"@id": "schema:Text"}},
+    {"@id": "schema:telephone", "@type": "rdf:Property", "rdfs:label": "telephone",
+     "rdfs:comment": "The telephone number.",
+     "schema:domainIncludes": {"@id": "schema:Person"}, "schema:rangeIncludes": {"@id": "schema:Text"}},
+    {"@id": "schema:headline", "@type": "rdf:Property", "rdfs:label": "headline",
+     "rdfs:comment": "Headline of the article.",
+     "schema:domainIncludes": {"@id": "schema:CreativeWork"}, "schema:rangeIncludes": {"@id": "schema:Text"}},
+    {"@id": "schema:articleBody", "@type": "rdf:Property", "rdfs:label": "articleBody",
+     "rdfs:comment": "The actual body of the article.",
+     "schema:domainIncludes": {"@id": "schema:BlogPosting"}, "schema:rangeIncludes": {"@id": "schema:Text"}},
+    {"@id": "schema:dateCreated", "@type": "rdf:Property", "rdfs:label": "dateCreated",
+     "rdfs:comment": "The date on which the CreativeWork was created.",
+     "schema:domainIncludes": {"@id": "schema:CreativeWork"}, "schema:rangeIncludes": {"@id": "schema:Date"}},
+    {"@id": "schema:dateModified", "@type": "rdf:Property", "rdfs:label": "dateModified",
+     "rdfs:comment": "The date on which the CreativeWork was most recently modified.",
+     "schema:domainIncludes": {"@id": "schema:CreativeWork"}, "schema:rangeIncludes": {"@id": "schema:Date"}},
+    {"@id": "schema:price", "@type": "rdf:Property", "rdfs:label": "price",
+     "rdfs:comment": "The offer price of a product.",
+     "schema:domainIncludes": {"@id": "schema:Product"}, "schema:rangeIncludes": {"@id": "schema:Number"}},
+]
+
+
+@pytest.fixture(autouse=True)
+def no_persistent_cache(monkeypatch):
+    """Keep tests independent of the on-disk mapping cache in DATA_DIR."""
+    from ontologymirror.config.settings import settings
+    monkeypatch.setattr(settings, "LLM_CACHE_ENABLED", False)
+
+
+@pytest.fixture
+def mini_loader():
+    """A SchemaOrgLoader pre-populated with MINI_GRAPH (no download, no disk)."""
+    loader = SchemaOrgLoader()
+    loader.graph = [dict(node) for node in MINI_GRAPH]
+    return loader
+
+
+@pytest.fixture
+def mini_store(tmp_path, mini_loader):
+    """An isolated SchemaVectorStore indexed from MINI_GRAPH with deterministic embeddings."""
+    from langchain_community.embeddings import DeterministicFakeEmbedding
+    from ontologymirror.core.vector_store import SchemaVectorStore
+
+    store = SchemaVectorStore(
+        persist_directory=str(tmp_path / "vector_store"),
+        embedding_fn=DeterministicFakeEmbedding(size=64),
+        loader=mini_loader,
+    )
+    store.build_index()
+    return store
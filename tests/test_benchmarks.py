@@ -0,0 +1,57 @@
+import contextlib
+import io
+
+from benchmarks.corpus import CorpusConfig, generate_corpus, synthetic_schema_graph
+from benchmarks.harness import build_report, compare, summarize
+from benchmarks.suite import BenchContext, run_suite
+from ontologymirror.extractors.sql_parser import SqlExtractor
+
+TINY = CorpusConfig(repos=2, files_per_repo=4, tables_per_file=3, dump_rows=2,
+                    ontology_classes=30, ontology_properties=60)
+
+
+def _files(root):
+    return {p.relative_to(root): p.read_bytes() for p in root.rglob("*") if p.is_file()}
+
+
+def test_corpus_is_deterministic_and_parseable(tmp_path):
+    first = generate_corpus(str(tmp_path / "a"), TINY)
+    generate_corpus(str(tmp_path / "b"), TINY)
+    assert _files(tmp_path / "a") == _files(tmp_path / "b")
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        tables = SqlExtractor().extract(str(tmp_path / "a"))
+    # Every dialect's CREATE TABLEs come back, with all their columns
+    assert len(tables) == first.tables == 24
+    assert sum(len(t.columns) for t in tables) == first.columns
+    assert {t.source_file.rsplit("_", 1)[-1] for t in tables} == {"postgres.sql", "mysql.sql", "sqlite.sql", "mssql.sql"}
+
+
+def test_schema_graph_labels_are_unique():
+    graph = synthetic_schema_graph(CorpusConfig(ontology_classes=100, ontology_properties=200))
+    labels = [node["rdfs:label"] for node in graph]
+    assert len(labels) == len(set(labels)) == 300
+
+
+def test_compare_flags_regressions_beyond_threshold_and_noise():
+    baseline = {"results": [{"name": "a", "median": 0.100}, {"name": "b", "median": 0.0001},
+                            {"name": "c", "median": 0.100}]}
+    results = [summarize("a", "macro", [0.130, 0.130], 10), summarize("b", "micro", [0.0005], 10),
+               summarize("c", "macro", [0.070], 10), summarize("d", "micro", [0.01], 1)]
+
+    comparisons = {c.name: c.status for c in compare(results, baseline, threshold=0.2)}
+
+    assert comparisons == {"a": "regression", "b": "ok", "c": "improvement", "d": "new"}
+    assert build_report(results, {}, {}, compare(results, baseline, threshold=0.2))["regressions"] == ["a"]
+
+
+def test_suite_runs_offline(tmp_path):
+    ctx = BenchContext(TINY, workdir=str(tmp_path), max_tables=5)
+    try:
+        results = run_suite(ctx, names=["extract.corpus", "loader", "mapper.map_table"], repeat=1, warmup=0)
+    finally:
+        ctx.close()
+
+    assert [r.name for r in results] == [
+        "extract.corpus", "loader.load_graph", "loader.properties_for_classes", "mapper.map_table"]
+    assert all(r.median > 0 and r.items > 0 for r in results)
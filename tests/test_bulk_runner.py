@@ -0,0 +1,97 @@
+import pytest
+
+from ontologymirror.core.domain import RawTable, RawColumn
+from ontologymirror.mappers.bulk_runner import BulkMappingRunner, read_results
+from ontologymirror.mappers.semantic_mapper import MappedTable
+
+
+class CountingMapper:
+    """Returns a fixed mapping and counts calls; tables named in `fail` come back as errors."""
+
+    def __init__(self, fail=()):
+        self.calls = []
+        self.fail = set(fail)
+
+    def map_table(self, table):
+        self.calls.append(table.name)
+        schema_class = "Error" if table.name in self.fail else "Thing"
+        return MappedTable(original_table=table.name, schema_class=schema_class, columns=[], rationale="stub")
+
+
+def _tables(n):
+    return (RawTable(name=f"t{i}", source_file="a.sql", columns=[RawColumn(name="id", original_type="INT")])
+            for i in range(n))
+
+
+def test_results_are_appended_and_indexed(tmp_path):
+    out = tmp_path / "results.jsonl"
+    with BulkMappingRunner(CountingMapper(), str(out), fsync_every=3) as runner:
+        stats = runner.run(_tables(7), repo="acme/shop")
+
+    assert stats["mapped"] == 7
+    records = list(read_results(str(out)))
+    assert [r["table"] for r in records] == [f"t{i}" for i in range(7)]
+    assert records[0]["key"] == "acme/shop|a.sql|t0"
+    assert records[0]["result"]["schema_class"] == "Thing"
+
+
+def test_restart_skips_completed_and_drops_uncommitted_tail(tmp_path):
+    out = tmp_path / "results.jsonl"
+    with BulkMappingRunner(CountingMapper(), str(out)) as runner:
+        runner.run(_tables(4))
+    committed_size = out.stat().st_size
+
+    # A crash mid-batch leaves written-but-unindexed (possibly torn) lines behind
+    with open(out, "ab") as f:
+        f.write(b'{"key": "|a.sql|t4", "result": {"schema_cl')
+
+    mapper = CountingMapper()
+    with BulkMappingRunner(mapper, str(out)) as runner:
+        assert runner.stats["truncated_bytes"] > 0
+        stats = runner.run(_tables(6))
+
+    assert mapper.calls == ["t4", "t5"]
+    assert stats["skipped"] == 4
+    assert out.stat().st_size > committed_size
+    assert [r["table"] for r in read_results(str(out))] == [f"t{i}" for i in range(6)]
+
+
+def test_errors_are_retried_on_next_run(tmp_path):
+    out = tmp_path / "results.jsonl"
+    with BulkMappingRunner(CountingMapper(fail={"t1"}), str(out)) as runner:
+        assert runner.run(_tables(3))["errors"] == 1
+
+    mapper = CountingMapper()
+    with BulkMappingRunner(mapper, str(out)) as runner:
+        runner.run(_tables(3))
+    assert mapper.calls == ["t1"]
+
+
+def test_externally_truncated_output_is_refused(tmp_path):
+    out = tmp_path / "results.jsonl"
+    with BulkMappingRunner(CountingMapper(), str(out)) as runner:
+        runner.run(_tables(2))
+    out.write_bytes(b"")
+    with pytest.raises(RuntimeError, match="shorter than its completion index"):
+        BulkMappingRunner(CountingMapper(), str(out))
+
+
+def test_tables_are_extracted_lazily_per_file(tmp_path):
+    from ontologymirror.extractors.sql_parser import SqlExtractor
+
+    for i in range(3):
+        (tmp_path / f"s{i}.sql").write_text(f"CREATE TABLE a{i} (id INT);\nCREATE TABLE b{i} (id INT);\n")
+    parsed = []
+    extractor = SqlExtractor()
+    parse = extractor._parse_sql_file
+    extractor._parse_sql_file = lambda path: parsed.append(path) or parse(path)
+
+    tables = extractor.iter_extract(str(tmp_path))
+    assert parsed == []  # Nothing parsed until the runner pulls
+    with BulkMappingRunner(CountingMapper(), str(tmp_path / "results.jsonl")) as runner:
+        first = next(tables)
+        assert len(parsed) == 1
+        stats = runner.run(tables)
+
+    assert stats["mapped"] == 5 and len(parsed) == 3
+    assert first.name.startswith("a")
@@ -0,0 +1,87 @@
+import os
+
+import pytest
+
+from ontologymirror.core.domain import RawTable, RawColumn
+from ontologymirror.mappers.bypass_policy import BypassPolicy
+from ontologymirror.mappers.evaluation import load_labelled_tables, evaluate_mapper
+from ontologymirror.mappers.semantic_mapper import SemanticMapper
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "labelled_tables.json")
+
+USERS = RawTable(name="users", source_file="a.sql", columns=[
+    RawColumn(name="id", original_type="INT", is_primary_key=True),
+    RawColumn(name="email", original_type="TEXT"),
+    RawColumn(name="name", original_type="TEXT"),
+])
+
+
+class FailingLLM:
+    def generate(self, system_prompt, user_prompt):
+        raise AssertionError("LLM should have been bypassed")
+
+
+def _candidates(*scored):
+    return [{"class": label, "description": "", "recall_score": score} for label, score in scored]
+
+
+def test_policy_requires_margin():
+    policy = BypassPolicy()
+    decision = policy.decide(USERS.columns, _candidates(("Person", 0.9), ("Thing", 0.85)), {})
+    assert not decision.bypass
+    assert "ambiguous" in decision.reason
+
+
+def test_policy_requires_column_coverage():
+    policy = BypassPolicy()
+    column_candidates = {"email": [{"property": "email", "score": 1.0}]}
+    decision = policy.decide(USERS.columns, _candidates(("Person", 0.9), ("Thing", 0.2)), column_candidates)
+    assert not decision.bypass
+    assert decision.column_matches == {"email": ("email", 1.0), "id": ("identifier", 1.0)}
+
+
+def test_policy_disabled():
+    decision = BypassPolicy(enabled=False).decide(USERS.columns, _candidates(("Person", 1.0)), {})
+    assert not decision.bypass
+
+
+def test_mapper_bypasses_llm_when_confident(mini_store, monkeypatch):
+    from langchain_core.documents import Document
+
+    def scored(query, k=3, **kwargs):
+        return [(Document(page_content="Class: Person", metadata={"label": "Person"}), 0.95),
+                (Document(page_content="Class: Thing", metadata={"label": "Thing"}), 0.4)]
+
+    monkeypatch.setattr(mini_store, "search_with_scores", scored)
+    mapper = SemanticMapper(vector_store=mini_store, llm=FailingLLM())
+    result = mapper.map_table(USERS)
+
+    assert result.schema_class == "Person"
+    assert {c.original_name: c.schema_property for c in result.columns} == {
+        "id": "identifier", "email": "email", "name": "name"}
+    assert mapper.bypass_rate == 1.0
+
+
+def test_evaluate_mapper_reports_bypass_and_accuracy(mini_store):
+    from ontologymirror.core.llm_client import LLMClient
+
+    mapper = SemanticMapper(vector_store=mini_store, llm=LLMClient())
+    report = evaluate_mapper(mapper, load_labelled_tables(FIXTURE))
+    assert report["tables"] == 8
+    # Deterministic: hashed fake embeddings, keyword mock LLM, fixed fixture
+    assert report["bypassed"] == 2 and report["bypass_rate"] == 0.25
+    assert report["bypassed_class_accuracy"] == 1.0
+    assert report["class_accuracy"] == 0.75
+    # The two tables mapped to Thing lose their Person/Product-only lexicon hits
+    assert report["column_accuracy"] == 0.897
+    assert report["lexicon_accuracy"] == 1.0
+
+
+def test_dense_scores_are_relevances_in_unit_range(mini_store, recwarn):
+    assert mini_store.vector_db._collection.metadata["hnsw:space"] == "cosine"
+    # Nothing lexical in the query: the ranking comes from the dense side
+    hits = mini_store.search_with_scores("zzz qqq", k=3)
+    assert hits and all(0.0 <= score <= 1.0 for _, score in hits)
+    [property_hits] = mini_store.search_properties(["zzz qqq"], k=3)
+    assert property_hits and all(0.0 <= score <= 1.0 for _, score in property_hits)
+    assert not [w for w in recwarn if "Relevance scores" in str(w.message)]
@@ -0,0 +1,102 @@
+import asyncio
+import time
+
+from ontologymirror.config.settings import settings
+from ontologymirror.core.domain import RawTable, RawColumn
+from ontologymirror.core.llm_client import LLMClient
+from ontologymirror.core.rate_limit import TokenBucket, RateLimiter, is_retryable_error, backoff_delay
+from ontologymirror.mappers.bypass_policy import BypassPolicy
+from ontologymirror.mappers.semantic_mapper import SemanticMapper
+
+
+class HTTPError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+class StubAsyncLLM:
+    """Answers after a short delay; fails the first `failures` calls with a 429."""
+    model_name = "stub"
+
+    def __init__(self, delay=0.05, failures=0):
+        self.delay = delay
+        self.failures = failures
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def agenerate(self, system_prompt, user_prompt):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise HTTPError(429)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(self.delay)
+        self.in_flight -= 1
+        return '{"schema_class": "Thing", "rationale": "stub", "mappings": []}'
+
+
+def _tables(n):
+    return [RawTable(name=f"t{i}", source_file="a.sql",
+                     columns=[RawColumn(name="blob", original_type="TEXT")]) for i in range(n)]
+
+
+async def _collect(agen):
+    return [item async for item in agen]
+
+
+def test_retryable_errors():
+    assert is_retryable_error(HTTPError(429))
+    assert is_retryable_error(HTTPError(503))
+    assert not is_retryable_error(HTTPError(400))
+    assert not is_retryable_error(ValueError("bad"))
+    assert 0 <= backoff_delay(10, base=1.0, cap=2.0) <= 2.0
+
+
+def test_token_bucket_throttles():
+    async def run():
+        bucket = TokenBucket(rate_per_minute=600, capacity=1)  # 10/s
+        start = time.monotonic()
+        for _ in range(4):
+            await bucket.acquire(1)
+        return time.monotonic() - start
+
+    assert asyncio.run(run()) >= 0.25
+
+
+def test_map_tables_runs_concurrently(mini_store):
+    llm = StubAsyncLLM(delay=0.1)
+    mapper = SemanticMapper(vector_store=mini_store, llm=llm, bypass_policy=BypassPolicy(enabled=False))
+
+    start = time.monotonic()
+    results = asyncio.run(_collect(mapper.map_tables(_tables(8), max_concurrency=4, limiter=RateLimiter())))
+    elapsed = time.monotonic() - start
+
+    assert sorted(r.original_table for r in results) == [f"t{i}" for i in range(8)]
+    assert llm.max_in_flight == 4
+    assert elapsed < 8 * 0.1
+
+
+def test_map_tables_retries_rate_limit_errors(mini_store, monkeypatch):
+    monkeypatch.setattr(settings, "LLM_RETRY_BASE_DELAY", 0.01)
+    llm = StubAsyncLLM(delay=0.0, failures=2)
+    mapper = SemanticMapper(vector_store=mini_store, llm=llm, bypass_policy=BypassPolicy(enabled=False))
+
+    [result] = asyncio.run(_collect(mapper.map_tables(_tables(1))))
+    assert result.schema_class == "Thing"
+    assert mapper.stats["retries"] == 2
+    assert mapper.stats["llm_calls"] == 3
+
+
+def test_map_tables_with_default_mock_client(mini_store, monkeypatch):
+    monkeypatch.delenv("LLM_PROVIDER", raising=False)
+    mapper = SemanticMapper(vector_store=mini_store, llm=LLMClient(), bypass_policy=BypassPolicy(enabled=False))
+    tables = [
+        RawTable(name="blog_posts", source_file="a.sql", columns=[RawColumn(name="title", original_type="TEXT")]),
+        RawTable(name="users", source_file="a.sql", columns=[RawColumn(name="email", original_type="TEXT")]),
+    ]
+
+    results = {r.original_table: r for r in asyncio.run(_collect(mapper.map_tables(tables)))}
+    assert results["blog_posts"].schema_class == "BlogPosting"
+    assert results["users"].schema_class == "Person"
@@ -0,0 +1,125 @@
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+
+import pytest
+
+from ontologymirror.core.domain import RawTable, RawColumn
+from ontologymirror.core.llm_client import LLMClient
+from ontologymirror.daemon import DaemonStoppedError, MappingClient, MappingDaemon
+from ontologymirror.mappers.bypass_policy import BypassPolicy
+from ontologymirror.mappers.semantic_mapper import SemanticMapper
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+@pytest.fixture
+def socket_path():
+    # Unix socket paths are limited to ~100 characters, so avoid pytest's long tmp_path
+    directory = tempfile.mkdtemp(prefix="om-", dir="/tmp")
+    yield Path(directory) / "d.sock"
+    shutil.rmtree(directory, ignore_errors=True)
+
+
+@pytest.fixture
+def mapper(mini_store):
+    return SemanticMapper(vector_store=mini_store, llm=LLMClient(), bypass_policy=BypassPolicy(enabled=False))
+
+
+def _table(name, *columns):
+    return RawTable(name=name, source_file="a.sql",
+                    columns=[RawColumn(name=c, original_type="TEXT") for c in columns])
+
+
+def test_client_maps_through_daemon(socket_path, mapper):
+    with MappingDaemon(mapper, socket_path=str(socket_path), batch_size=4, batch_wait_ms=50) as daemon:
+        client = MappingClient(socket_path, mapper_factory=lambda: pytest.fail("must not build a local mapper"))
+        assert client.daemon_available()
+
+        results = client.map_tables([_table("blog_post", "title", "content"), _table("auth_user", "email")])
+        assert client.used_daemon
+        assert [r.schema_class for r in results] == ["BlogPosting", "Person"]
+
+        tables = client.extract(str(FIXTURES))
+        assert {t.name for t in tables} == {"auth_user", "blog_post"}
+
+    assert daemon.stats["tables"] == 2
+    assert not socket_path.exists()
+
+
+def test_concurrent_requests_are_batched(socket_path, mapper):
+    with MappingDaemon(mapper, socket_path=str(socket_path), batch_size=8, batch_wait_ms=200) as daemon:
+        results = {}
+
+        def call(i):
+            results[i] = MappingClient(socket_path).map_table(_table(f"post_{i}", "title"))
+
+        threads = [threading.Thread(target=call, args=(i,)) for i in range(6)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert {r.original_table for r in results.values()} == {f"post_{i}" for i in range(6)}
+        assert daemon.stats["batches"] < 6
+
+
+def test_client_falls_back_in_process(socket_path, mapper):
+    client = MappingClient(socket_path, mapper_factory=lambda: mapper)
+    assert not client.daemon_available()
+
+    result = client.map_table(_table("blog_post", "title"))
+    assert client.used_daemon is False
+    assert result.schema_class == "BlogPosting"
+
+
+def test_stale_socket_is_replaced(socket_path, mapper):
+    socket_path.touch()
+    with MappingDaemon(mapper, socket_path=str(socket_path)):
+        assert MappingClient(socket_path).daemon_available()
+
+
+class SlowFirstMapper:
+    """amap_table stub: "slow" takes a second, "stuck" a minute, everything else is instant."""
+    stats = {}
+
+    def warm_up(self):
+        pass
+
+    async def amap_table(self, table, limiter=None):
+        import asyncio
+        from ontologymirror.mappers.semantic_mapper import MappedTable
+
+        await asyncio.sleep({"slow": 1.0, "stuck": 60.0}.get(table.name, 0))
+        return MappedTable(original_table=table.name, schema_class="Thing", rationale="", columns=[])
+
+
+def test_slow_batch_does_not_block_later_batches(socket_path):
+    import time
+
+    with MappingDaemon(SlowFirstMapper(), socket_path=str(socket_path), batch_size=1, batch_wait_ms=0) as daemon:
+        slow = daemon.submit(_table("slow", "a"))
+        start = time.monotonic()
+        assert daemon.submit(_table("fast", "a")).result(timeout=5).original_table == "fast"
+        assert time.monotonic() - start < 0.5
+        assert not slow.done()
+        assert slow.result(timeout=5).original_table == "slow"
+
+
+def test_stop_fails_pending_tables(socket_path):
+    import time
+
+    daemon = MappingDaemon(SlowFirstMapper(), socket_path=str(socket_path), batch_size=1, batch_wait_ms=0,
+                           max_in_flight=1).start()
+    running = daemon.submit(_table("stuck", "a"))
+    time.sleep(0.1)
+    waiting = [daemon.submit(_table("stuck", "a")) for _ in range(3)]  # One in the batcher, two queued
+    time.sleep(0.1)
+    start = time.monotonic()
+    daemon.stop()
+    assert time.monotonic() - start < 2
+
+    for future in [running, *waiting, daemon.submit(_table("late", "a"))]:
+        with pytest.raises(DaemonStoppedError):
+            future.result(timeout=1)
@@ -0,0 +1,70 @@
+from ontologymirror.core.domain import RawTable, RawColumn
+from ontologymirror.core.llm_client import LLMClient
+from ontologymirror.mappers.bypass_policy import BypassPolicy
+from ontologymirror.mappers.dedup import TableDeduplicator, table_shingles, jaccard, singularize
+from ontologymirror.mappers.semantic_mapper import SemanticMapper
+
+
+def _table(name, *cols, source="a.sql"):
+    return RawTable(name=name, source_file=source,
+                    columns=[RawColumn(name=c, original_type="TEXT") for c in cols])
+
+
+USER_COLS = ("id", "username", "email", "password", "last_login", "is_active", "date_joined", "is_staff")
+
+
+def test_shingles_normalize_names():
+    assert table_shingles(_table("users", "firstName")) == table_shingles(_table("user", "first_name"))
+    assert jaccard(table_shingles(_table("users", "id", "name")),
+                   table_shingles(_table("products", "id", "name"))) < 0.8
+
+
+def test_singularize_keeps_words_ending_in_s():
+    pairs = {"users": "user", "categories": "category", "addresses": "address", "boxes": "box",
+             "address": "address", "status": "status", "statuses": "status", "class": "class",
+             "classes": "class", "analysis": "analysis", "people": "person", "bus": "bus"}
+    assert {word: singularize(word) for word in pairs} == pairs
+
+
+def test_cluster_groups_near_duplicates():
+    tables = [
+        _table("auth_user", *USER_COLS, source="repo1/schema.sql"),
+        _table("auth_user", *USER_COLS, source="repo2/schema.sql"),
+        _table("auth_user", *USER_COLS, "avatar_url", source="repo3/schema.sql"),  # one extra column
+        _table("blog_post", "id", "title", "content"),
+    ]
+    clusters = TableDeduplicator(threshold=0.8).cluster_indices(tables)
+    assert len(clusters) == 2
+    rep, members = clusters[0]
+    assert rep == 2  # the widest table represents the cluster
+    assert sorted(members) == [0, 1]
+    assert clusters[1] == (3, [])
+
+
+class CountingLLM(LLMClient):
+    def __init__(self):
+        super().__init__()
+        self.prompts = []
+
+    def generate(self, system_prompt, user_prompt):
+        self.prompts.append(user_prompt)
+        return super().generate(system_prompt, user_prompt)
+
+
+def test_mapper_maps_one_representative_per_cluster(mini_store):
+    llm = CountingLLM()
+    mapper = SemanticMapper(vector_store=mini_store, llm=llm, bypass_policy=BypassPolicy(enabled=False))
+    tables = [
+        _table("auth_user", *USER_COLS, source="repo1/schema.sql"),
+        _table("auth_user", *USER_COLS, source="repo2/schema.sql"),
+        _table("auth_user", *USER_COLS[:-1], "nickname", source="repo3/schema.sql"),  # renamed column
+    ]
+    results = mapper.map_tables_deduplicated(tables)
+
+    assert [r.schema_class for r in results] == ["Person"] * 3
+    assert mapper.stats["projected"] == 2
+    # One call for the representative, one for the differing column only
+    assert len(llm.prompts) == 2
+    assert '"nickname"' in llm.prompts[1] and '"username"' not in llm.prompts[1]
+    emails = [c for c in results[2].columns if c.original_name == "email"]
+    assert emails and emails[0].schema_property == "email"
@@ -0,0 +1,106 @@
+import gzip
+import json
+
+import pytest
+
+from ontologymirror.core.domain import RawTable, RawColumn
+from ontologymirror.generators.json_generator import JsonLdGenerator
+from ontologymirror.generators.sql_generator import SqlGenerator, TableNames, sql_type
+from ontologymirror.mappers.semantic_mapper import MappedTable, MappedColumn
+from ontologymirror.pipeline import TableResult
+
+
+def _result(repo, name="auth_user", schema_class="Person"):
+    table = RawTable(name=name, source_file="schema.sql", repo=repo, commit="abc123", columns=[
+        RawColumn(name="id", original_type="INT", is_primary_key=True),
+        RawColumn(name="email", original_type="varchar(254)"),
+        RawColumn(name="is_active", original_type="BOOLEAN"),
+    ])
+    mapped = MappedTable(original_table=name, schema_class=schema_class, rationale="r", columns=[
+        MappedColumn(original_name="id", schema_property="identifier", confidence=1.0, reason="", source="lexicon:synonym"),
+        MappedColumn(original_name="email", schema_property="email", confidence=0.9, reason=""),
+    ])
+    return TableResult(table=table, result=mapped)
+
+
+def test_sql_generator_renders_standardized_ddl(tmp_path):
+    paths = SqlGenerator(str(tmp_path)).write_all([_result("shop"), _result("shop", name="customers")])
+    sql = paths[0].read_text()
+
+    assert 'CREATE TABLE "Person" (\n    "identifier" INT PRIMARY KEY,  -- Mapped from id\n' in sql
+    assert '    "email" VARCHAR(254)  -- Mapped from email\n    -- unmapped: is_active BOOLEAN\n);' in sql
+    # The second Person table gets a distinct name
+    assert 'CREATE TABLE "Person_customers" (' in sql
+    assert "-- Mapped to Schema.org/Person (from shop:auth_user@abc123)" in sql
+
+
+def test_sql_generator_output_is_valid_ddl(tmp_path):
+    import sqlite3
+
+    results = [_result("shop", name="orders", schema_class="Order") for _ in range(3)]
+    unmapped = _result("shop", name="audit_log", schema_class="Thing")
+    unmapped.result.columns = []
+    generator = SqlGenerator(str(tmp_path))
+    sql = generator.write_all(results + [unmapped])[0].read_text()
+
+    # Reserved word as a table name, three colliding tables, one table with nothing mapped
+    assert 'CREATE TABLE "Order" (' in sql
+    assert 'CREATE TABLE "Order_orders" (' in sql and 'CREATE TABLE "Order_orders_2" (' in sql
+    assert "audit_log" not in sql
+    assert generator.stats == {"tables": 3, "skipped": 1}
+    db = sqlite3.connect(":memory:")
+    db.executescript(sql)
+    assert len(db.execute("SELECT name FROM sqlite_master WHERE type = 'table'").fetchall()) == 3
+
+
+def test_table_names_stay_unique_in_bounded_memory():
+    names = TableNames()
+    taken = [names.take("Order", "orders") for _ in range(500)]
+    # A table whose own name looks like a counted one must not reuse it
+    taken += [names.take("Order", "orders_2"), names.take("Order", "orders_2"), names.take("Order", "orders_600")]
+
+    assert taken[:3] == ["Order", "Order_orders", "Order_orders_2"]
+    assert taken[-3:] == ["Order_orders_2_2", "Order_orders_2_3", "Order_orders_600"]
+    assert len(set(taken)) == len(taken)
+    assert len(names) == 4
+
+
+def test_sql_type_passthrough():
+    assert sql_type("numeric( 10, 2 )") == "NUMERIC( 10, 2 )"
+    assert sql_type("models.CharField(max_length=30)") == "TEXT"
+    assert sql_type(None) == "TEXT"
+
+
+def test_jsonld_generator_shards_by_repo_with_gzip(tmp_path):
+    generator = JsonLdGenerator(str(tmp_path), shard_by_repo=True, compression="gzip")
+    generator.output.max_open = 1  # Force closing and re-opening shard files
+    paths = generator.write_all([_result("org/a"), _result("b"), _result("org/a", name="staff")])
+
+    assert sorted(p.name for p in paths) == ["mappings-b.jsonld.jsonl.gz", "mappings-org_a.jsonld.jsonl.gz"]
+    with gzip.open(tmp_path / "mappings-org_a.jsonld.jsonl.gz", "rt") as f:
+        docs = [json.loads(line) for line in f]
+    assert [d["om:sourceTable"] for d in docs] == ["auth_user", "staff"]
+    assert docs[0]["om:schemaClass"] == {"@id": "schema:Person"}
+    assert docs[0]["om:columns"][1]["om:schemaProperty"] == {"@id": "schema:email"}
+    assert "om:schemaProperty" not in docs[0]["om:columns"][2]
+
+
+def test_zstd_output_and_bulk_records(tmp_path):
+    zstandard = pytest.importorskip("zstandard")
+    record = json.loads(json.dumps({
+        "repo": "shop", "commit": "abc123", "source_file": "schema.sql",
+        "raw_table": _result("shop").table.model_dump(), "result": _result("shop").result.model_dump(),
+    }))
+    error = {"repo": "shop", "result": MappedTable(original_table="x", schema_class="Error", columns=[], rationale="").model_dump()}
+    generator = SqlGenerator(str(tmp_path), compression="zstd")
+    paths = generator.write_all([record, error])
+
+    with zstandard.ZstdDecompressor().stream_reader(open(paths[0], "rb")) as f:
+        sql = f.read().decode("utf-8")
+    assert '"identifier" INT PRIMARY KEY' in sql
+    assert generator.stats == {"tables": 1, "skipped": 1}
+
+
+def test_unknown_compression_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        SqlGenerator(str(tmp_path), compression="brotli")
@@ -0,0 +1,151 @@
+import asyncio
+import time
+
+import pytest
+
+from ontologymirror.core.hedging import (
+    CircuitBreaker, CircuitOpenError, HedgedLLMClient, LatencyTracker, is_json_answer,
+)
+from ontologymirror.core.llm_client import LLMClient
+from ontologymirror.core.stub_server import StubLLMServer
+
+USER_PROMPT = "INPUT TABLE:\n{\"table_name\": \"blog_post\", \"columns\": [\"title\"]}\nCANDIDATE CLASSES: ..."
+ANSWER = '{"schema_class": "Thing", "rationale": "stub", "mappings": []}'
+
+
+class StubProvider:
+    """Answers `answer` after `delay` seconds, or raises `error`."""
+
+    def __init__(self, name, delay=0.0, answer=ANSWER, error=None):
+        self.model_name = name
+        self.delay = delay
+        self.answer = answer
+        self.error = error
+        self.calls = 0
+        self.cancelled = 0
+
+    async def agenerate(self, system_prompt, user_prompt):
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.error:
+            raise self.error
+        return self.answer
+
+
+def test_latency_tracker_percentiles():
+    tracker = LatencyTracker(window=100)
+    for ms in range(1, 101):
+        tracker.record(ms / 1000)
+    assert tracker.percentile(50) == pytest.approx(0.050)
+    assert tracker.percentile(95) == pytest.approx(0.095)
+    assert LatencyTracker().percentile(95) is None
+
+
+def test_slow_primary_is_hedged_and_cancelled():
+    slow, fast = StubProvider("slow", delay=2.0), StubProvider("fast", delay=0.01)
+    client = HedgedLLMClient([slow, fast], default_delay=0.05)
+
+    start = time.monotonic()
+    assert client.generate("sys", "user") == ANSWER
+    assert time.monotonic() - start < 0.5
+    assert slow.cancelled == 1
+    assert client.stats["hedged"] == 1
+    assert client.stats["hedge_wins"] == 1
+
+
+def test_hedge_delay_follows_observed_p95():
+    primary = StubProvider("primary", delay=0.01)
+    client = HedgedLLMClient([primary, StubProvider("backup")], default_delay=5.0, min_delay=0.0, min_samples=5)
+    assert client.hedge_delay(client.slots[0]) == 5.0
+
+    async def run():
+        for _ in range(5):
+            await client.agenerate("sys", "user")
+    asyncio.run(run())
+
+    assert 0.01 <= client.hedge_delay(client.slots[0]) < 0.2
+    assert client.stats["hedged"] == 0
+
+
+def test_errors_and_invalid_answers_fail_over():
+    broken = StubProvider("broken", error=RuntimeError("HTTP 500"))
+    garbled = StubProvider("garbled", answer="Sure! Here is the mapping:")
+    good = StubProvider("good")
+    client = HedgedLLMClient([broken, garbled, good], default_delay=5.0, validator=is_json_answer)
+
+    assert client.generate("sys", "user") == ANSWER
+    assert client.stats["failovers"] == 2
+    assert client.provider_stats()["good"]["wins"] == 1
+
+
+def test_sync_generate_works_inside_a_running_loop():
+    client = HedgedLLMClient([StubProvider("primary", delay=0.01)], default_delay=5.0)
+
+    async def caller():
+        return client.generate("sys", "user")
+
+    assert asyncio.run(caller()) == ANSWER
+
+
+def test_repeated_sync_generate_reuses_the_provider_client(monkeypatch):
+    # ChatOpenAI's async HTTP client is bound to the loop of its first call
+    monkeypatch.setenv("OPENAI_API_KEY", "stub")
+    monkeypatch.setenv("OPENAI_MODEL", "stub-gpt")
+    with StubLLMServer() as server:
+        monkeypatch.setenv("OPENAI_BASE_URL", server.base_url)
+        provider = LLMClient(provider="openai")
+        provider.model.max_retries = 0
+        client = HedgedLLMClient([provider], default_delay=5.0, validator=is_json_answer)
+        answers = [client.generate("map", USER_PROMPT) for _ in range(4)]
+        client.close()
+
+    assert all(is_json_answer(a) for a in answers)
+    stats = client.provider_stats()["stub-gpt"]
+    assert stats["errors"] == 0 and stats["wins"] == 4
+    assert stats["state"] == CircuitBreaker.CLOSED
+
+
+def test_all_providers_failing_raises_last_error():
+    client = HedgedLLMClient([StubProvider("a", error=RuntimeError("a down")),
+                              StubProvider("b", error=RuntimeError("b down"))])
+    with pytest.raises(RuntimeError, match="b down"):
+        client.generate("sys", "user")
+
+
+def test_circuit_breaker_opens_then_probes():
+    now = [0.0]
+    breaker = CircuitBreaker(error_rate=0.5, min_calls=4, cooldown=10.0, clock=lambda: now[0])
+    for ok in (True, False, True, False):
+        assert breaker.allow()
+        breaker.record_success() if ok else breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+
+    now[0] = 10.0
+    assert breaker.allow()          # The half-open probe
+    assert not breaker.allow()      # Only one probe at a time
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_open_breaker_routes_around_provider():
+    flaky = StubProvider("flaky", error=RuntimeError("HTTP 503"))
+    backup = StubProvider("backup")
+    client = HedgedLLMClient(
+        [flaky, backup],
+        breaker_factory=lambda: CircuitBreaker(error_rate=0.5, min_calls=2, cooldown=60.0),
+    )
+    for _ in range(5):
+        assert client.generate("sys", "user") == ANSWER
+
+    assert flaky.calls == 2
+    assert client.stats["short_circuited"] == 3
+    assert client.provider_stats()["flaky"]["state"] == CircuitBreaker.OPEN
+
+    client.slots[1].breaker._trip()
+    with pytest.raises(CircuitOpenError):
+        client.generate("sys", "user")
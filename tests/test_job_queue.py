@@ -0,0 +1,175 @@
+import threading
+
+from ontologymirror.config.settings import settings
+from ontologymirror.core.job_queue import JobQueue
+from ontologymirror.mappers.results_store import ResultsStore
+from ontologymirror.mappers.semantic_mapper import MappedTable, MappedColumn
+from ontologymirror.worker import QueueWorker, mapping_handlers
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_enqueue_deduplicates_by_key(tmp_path):
+    queue = JobQueue(str(tmp_path / "jobs.sqlite"))
+    assert queue.enqueue("repo", {"url": "a"}, key="repo:a") is not None
+    assert queue.enqueue("repo", {"url": "a"}, key="repo:a") is None
+    assert len(queue.enqueue_many("repo", [({"url": "a"}, "repo:a"), ({"url": "b"}, "repo:b")])) == 1
+    assert queue.counts()["queued"] == 2
+
+
+def test_requeue_done_only_requeues_finished_jobs(tmp_path):
+    queue = JobQueue(str(tmp_path / "jobs.sqlite"))
+    queue.enqueue_many("repo", [({"url": "a"}, "repo:a"), ({"url": "b"}, "repo:b")])
+    job = queue.claim("w1")
+    queue.complete(job, {"commit": "old"})
+
+    ids = queue.enqueue_many("repo", [({"url": "a", "n": 2}, "repo:a"), ({"url": "b"}, "repo:b")], requeue_done=True)
+    assert ids == [job.id]
+    assert queue.counts() == {"queued": 2, "leased": 0, "done": 0, "dead": 0}
+    [again] = [j for j in (queue.claim("w2"), queue.claim("w2")) if j.id == job.id]
+    assert again.attempts == 1 and again.payload == {"url": "a", "n": 2}
+
+
+def test_concurrent_workers_never_claim_the_same_job(tmp_path):
+    path = str(tmp_path / "jobs.sqlite")
+    JobQueue(path).enqueue_many("table", [({"n": i}, f"t{i}") for i in range(200)])
+    claimed, lock = [], threading.Lock()
+
+    def work(worker_id):
+        queue = JobQueue(path)
+        while (job := queue.claim(worker_id)) is not None:
+            with lock:
+                claimed.append(job.payload["n"])
+            queue.complete(job)
+        queue.close()
+
+    threads = [threading.Thread(target=work, args=(f"w{i}",)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert sorted(claimed) == list(range(200))
+    assert JobQueue(path).counts() == {"queued": 0, "leased": 0, "done": 200, "dead": 0}
+
+
+def test_expired_lease_is_reclaimed_and_heartbeat_keeps_it(tmp_path):
+    clock = Clock()
+    queue = JobQueue(str(tmp_path / "jobs.sqlite"), lease_seconds=10, clock=clock)
+    queue.enqueue("repo", {"url": "a"})
+    first = queue.claim("crashed")
+
+    clock.now += 8
+    assert queue.heartbeat(first)
+    clock.now += 8  # Within the renewed lease
+    assert queue.claim("other") is None
+
+    clock.now += 11
+    second = queue.claim("other")
+    assert second.id == first.id and second.attempts == 2
+    # The crashed worker's late writes are rejected
+    assert not queue.complete(first) and not queue.heartbeat(first)
+    assert queue.complete(second, {"ok": True})
+
+
+def test_failures_back_off_then_dead_letter(tmp_path):
+    clock = Clock()
+    queue = JobQueue(str(tmp_path / "jobs.sqlite"), max_attempts=2, clock=clock)
+    queue.enqueue("table", {"n": 1})
+
+    queue.fail(queue.claim("w"), "boom", retry_delay=30)
+    assert queue.claim("w") is None
+    clock.now += 30
+    job = queue.claim("w")
+    assert job.attempts == 2
+    queue.fail(job, "boom again")
+
+    assert queue.counts()["dead"] == 1
+    assert queue.dead_letters()[0]["last_error"] == "boom again"
+    assert queue.requeue_dead() == 1
+    assert queue.claim("w").attempts == 1
+
+
+class FakeGitLoader:
+    def __init__(self, root):
+        self.root = root
+
+    def load_repo(self, url):
+        return str(self.root / url)
+
+    def repo_name(self, url):
+        return f"org/{url}"
+
+    def head_commit(self, path):
+        return "abc123"
+
+
+class FixedMapper:
+    def map_table(self, table):
+        return MappedTable(original_table=table.name, schema_class="Person", rationale="", columns=[
+            MappedColumn(original_name=c.name, schema_property="email", confidence=0.9, reason="")
+            for c in table.columns if c.name == "email"
+        ])
+
+
+def test_worker_runs_repo_and_table_jobs_end_to_end(tmp_path):
+    (tmp_path / "shop").mkdir()
+    (tmp_path / "shop" / "schema.sql").write_text(
+        "CREATE TABLE users (id INT PRIMARY KEY, email TEXT);\n"
+        "CREATE TABLE staff (id INT PRIMARY KEY, email TEXT);\n"
+    )
+    queue = JobQueue(str(tmp_path / "jobs.sqlite"))
+    store = ResultsStore(str(tmp_path / "results.sqlite"))
+    handlers = mapping_handlers(queue, mapper_factory=FixedMapper, results_store=store,
+                                git_loader=FakeGitLoader(tmp_path))
+    queue.enqueue("repo", {"url": "shop"}, key="repo:shop")
+
+    stats = QueueWorker(queue, handlers, worker_id="w1", poll_interval=0).run(exit_when_idle=True)
+
+    assert stats == {"done": 3, "failed": 0, "lost_leases": 0}
+    assert store.repos_for_class("Person") == ["org/shop"]
+    assert len(store.columns_for_property("email")) == 2
+    # Re-running the finished repo job doesn't queue its unchanged tables again
+    assert queue.enqueue("repo", {"url": "shop"}, key="repo:shop") is None
+    assert queue.enqueue("repo", {"url": "shop"}, key="repo:shop", requeue_done=True) is not None
+    assert handlers["repo"](queue.claim("w2", ["repo"]))["enqueued"] == 0
+
+
+def test_worker_retries_failing_handler(tmp_path):
+    queue = JobQueue(str(tmp_path / "jobs.sqlite"), max_attempts=2)
+    queue.enqueue("flaky", {}, max_attempts=2)
+    calls = []
+
+    def flaky(job):
+        calls.append(job.attempts)
+        raise RuntimeError("nope")
+
+    worker = QueueWorker(queue, {"flaky": flaky}, poll_interval=0)
+    assert not worker.run_one(queue.claim(worker.worker_id))
+    assert queue.counts()["queued"] == 1 and calls == [1] and worker.stats["failed"] == 1
+
+
+def test_exit_when_idle_waits_for_backoff_retries(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "JOB_RETRY_BASE_DELAY", 0.1)
+    queue = JobQueue(str(tmp_path / "jobs.sqlite"))
+    queue.enqueue("flaky", {}, max_attempts=3)
+    queue.enqueue("other", {})  # Not this worker's kind: must not keep it running
+    calls = []
+
+    def flaky(job):
+        calls.append(job.attempts)
+        if job.attempts < 2:
+            raise RuntimeError("try again")
+
+    worker = QueueWorker(queue, {"flaky": flaky}, poll_interval=0.01)
+    stats = worker.run(exit_when_idle=True)
+
+    assert calls == [1, 2]
+    assert stats == {"done": 1, "failed": 1, "lost_leases": 0}
+    assert queue.counts(["other"])["queued"] == 1
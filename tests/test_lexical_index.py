@@ -0,0 +1,58 @@
+from ontologymirror.core.lexical_index import LexicalIndex, tokenize, trigrams
+
+
+def test_tokenize_snake_and_camel():
+    assert tokenize("first_name") == ["first", "name"]
+    assert tokenize("dateCreated") == ["date", "created"]
+    assert tokenize("HTTPServer2url") == ["http", "server2url"]
+    assert trigrams(tokenize("first_name")) == trigrams(tokenize("firstName"))
+
+
+def test_exact_label_scores_one(mini_loader):
+    index = LexicalIndex.from_schema(mini_loader, kind="property")
+    hits = index.search("email", k=3)
+    assert hits[0][0].metadata["label"] == "email"
+    assert hits[0][1] == 1.0
+
+
+def test_partial_match_ranks_by_similarity(mini_loader):
+    index = LexicalIndex.from_schema(mini_loader, kind="property")
+    labels = [doc.metadata["label"] for doc, _ in index.search("created_at", k=3)]
+    assert labels[0] == "dateCreated"
+
+
+def test_allowed_labels_filter(mini_loader):
+    index = LexicalIndex.from_schema(mini_loader, kind="property")
+    hits = index.search("description", k=3, allowed_labels={"name", "url"})
+    assert all(doc.metadata["label"] in {"name", "url"} for doc, _ in hits)
+
+
+def test_store_skips_dense_when_lexical_is_confident(mini_store, monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("dense retrieval should not run")
+
+    monkeypatch.setattr(mini_store, "_dense_search_properties", fail)
+    [hits] = mini_store.search_properties(["url"], k=2)
+    assert hits[0][0].metadata["label"] == "url"
+
+
+def test_store_fuses_when_ambiguous(mini_store):
+    [hits] = mini_store.search_properties(["modified"], k=3, class_labels=["BlogPosting"])
+    labels = [doc.metadata["label"] for doc, _ in hits]
+    assert "dateModified" in labels
+
+
+def test_table_wording_does_not_retrieve_the_table_class(mini_store):
+    from ontologymirror.core.domain import RawTable, RawColumn
+    from ontologymirror.core.lexical_index import LexicalIndex
+    from ontologymirror.mappers.semantic_mapper import SemanticMapper
+
+    mini_store.loader.graph.append({
+        "@id": "schema:Table", "@type": "rdfs:Class", "rdfs:label": "Table",
+        "rdfs:comment": "A table on a Web page.", "rdfs:subClassOf": {"@id": "schema:CreativeWork"}})
+    mini_store._lexical["class"] = LexicalIndex.from_schema(mini_store.loader, kind="class")
+
+    mapper = SemanticMapper(vector_store=mini_store)
+    for name in ("users", "orders"):
+        table = RawTable(name=name, source_file="a.sql", columns=[RawColumn(name="id", original_type="INT")])
+        assert "Table" not in [c["class"] for c in mapper.prepare(table).candidates]
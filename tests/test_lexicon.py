@@ -0,0 +1,88 @@
+import os
+
+from ontologymirror.core.domain import RawTable, RawColumn
+from ontologymirror.core.llm_client import LLMClient
+from ontologymirror.mappers.bypass_policy import BypassPolicy
+from ontologymirror.mappers.evaluation import load_labelled_tables, evaluate_mapper
+from ontologymirror.mappers.lexicon import LexiconMapper
+from ontologymirror.mappers.semantic_mapper import SemanticMapper
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "labelled_tables.json")
+
+
+def test_match_kinds(mini_loader):
+    lexicon = LexiconMapper.from_loader(mini_loader)
+    assert lexicon.match("email") == ("email", "exact")
+    assert lexicon.match("given_name") == ("givenName", "normalized")
+    assert lexicon.match("first_name") == ("givenName", "synonym")
+    assert lexicon.match("createdAt") == ("dateCreated", "synonym")
+    assert lexicon.match("id") == ("identifier", "synonym")
+    assert lexicon.match("birthday") is None  # birthDate is not in the mini vocabulary
+    assert lexicon.match("email", allowed={"name"}) is None
+
+
+class RecordingLLM(LLMClient):
+    def __init__(self):
+        super().__init__()
+        self.prompts = []
+
+    def generate(self, system_prompt, user_prompt):
+        self.prompts.append(user_prompt)
+        return super().generate(system_prompt, user_prompt)
+
+
+def test_only_residual_columns_reach_the_prompt(mini_store):
+    llm = RecordingLLM()
+    mapper = SemanticMapper(vector_store=mini_store, llm=llm, bypass_policy=BypassPolicy(enabled=False))
+    table = RawTable(name="auth_user", source_file="a.sql", columns=[
+        RawColumn(name="id", original_type="INT", is_primary_key=True),
+        RawColumn(name="email", original_type="TEXT"),
+        RawColumn(name="username", original_type="TEXT"),
+    ])
+    result = mapper.map_table(table)
+
+    [prompt] = llm.prompts
+    assert '"name": "username"' in prompt
+    assert '"name": "email"' not in prompt
+    sources = {c.original_name: c.source for c in result.columns}
+    assert sources == {"id": "lexicon:synonym", "email": "lexicon:exact", "username": "llm"}
+    assert mapper.stats["prompt_columns"] == 1
+
+
+def test_evaluation_reports_lexicon_accuracy(mini_store):
+    mapper = SemanticMapper(vector_store=mini_store, llm=LLMClient(), bypass_policy=BypassPolicy(enabled=False))
+    report = evaluate_mapper(mapper, load_labelled_tables(FIXTURE))
+    assert report["lexicon_resolved_rate"] > 0.5
+    assert report["lexicon_accuracy"] == 1.0
+
+
+class FixedLLM:
+    """Always picks `schema_class` and maps nothing itself."""
+    model_name = "fixed"
+
+    def __init__(self, schema_class):
+        self.schema_class = schema_class
+
+    def generate(self, system_prompt, user_prompt):
+        return f'{{"schema_class": "{self.schema_class}", "rationale": "fixed", "mappings": []}}'
+
+
+def _map_with_class(mini_store, schema_class, column_names):
+    mapper = SemanticMapper(vector_store=mini_store, llm=FixedLLM(schema_class),
+                            bypass_policy=BypassPolicy(enabled=False))
+    table = RawTable(name="t", source_file="t.sql", columns=[
+        RawColumn(name=name, original_type="TEXT") for name in column_names
+    ])
+    return mapper.map_table(table)
+
+
+def test_lexicon_matches_must_fit_the_chosen_class(mini_store):
+    result = _map_with_class(mini_store, "Person", ["id", "email", "created_at"])
+    assert result.schema_class == "Person"
+    assert {c.original_name: c.schema_property for c in result.columns} == {"id": "identifier", "email": "email"}
+
+
+def test_lexicon_matches_are_dropped_for_a_generic_class(mini_store):
+    result = _map_with_class(mini_store, "Thing", ["id", "email", "price"])
+    assert result.schema_class == "Thing"
+    assert {c.original_name: c.schema_property for c in result.columns} == {"id": "identifier"}
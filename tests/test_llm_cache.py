@@ -0,0 +1,96 @@
+import time
+
+from ontologymirror.core.domain import RawTable, RawColumn
+from ontologymirror.core.llm_cache import MappingCache, table_signature, normalize_table_name
+from ontologymirror.core.llm_client import LLMClient
+from ontologymirror.mappers.bypass_policy import BypassPolicy
+from ontologymirror.mappers.semantic_mapper import SemanticMapper
+
+
+def _user_table(name="auth_user", email_col="email"):
+    return RawTable(name=name, source_file="a.sql", columns=[
+        RawColumn(name="username", original_type="VARCHAR(150)"),
+        RawColumn(name=email_col, original_type="VARCHAR(254)"),
+    ])
+
+
+def test_signature_is_normalized():
+    a = table_signature(_user_table("auth_user"), ["Person", "Thing"], "1", "m")
+    b = table_signature(_user_table('"public"."AuthUser"', "Email"), ["Thing", "Person"], "1", "m")
+    assert a == b
+    assert a != table_signature(_user_table(), ["Person"], "1", "m")
+    assert a != table_signature(_user_table(), ["Person", "Thing"], "2", "m")
+    assert normalize_table_name("django_session") == "django_session"
+
+
+def test_ttl_and_lru(tmp_path):
+    cache = MappingCache(path=str(tmp_path / "c.sqlite"), ttl_seconds=3600, max_entries=2)
+    cache.put("a", "1")
+    time.sleep(0.01)
+    cache.put("b", "2")
+    assert cache.get("a") == "1"  # "a" is now most recently used
+    cache.put("c", "3")
+    assert cache.get("b") is None
+    assert len(cache) == 2
+    assert cache.stats["evictions"] == 1
+
+    expired = MappingCache(path=str(tmp_path / "c.sqlite"), ttl_seconds=0)
+    time.sleep(0.01)
+    assert expired.get("a") is None
+    assert expired.stats["expired"] == 1
+
+
+def test_lru_bound_holds_across_processes_sharing_the_file(tmp_path):
+    # Two handles stand in for two worker processes on one cache file
+    path = str(tmp_path / "c.sqlite")
+    first, second = MappingCache(path=path, max_entries=3), MappingCache(path=path, max_entries=3)
+    first.put("a", "1")
+    first.put("b", "2")
+    second.put("c", "3")
+    second.put("d", "4")
+    assert len(first) == len(second) == 3
+    assert first.get("a") is None and second.get("d") == "4"
+
+
+def test_hits_are_written_in_batches(tmp_path):
+    path = str(tmp_path / "c.sqlite")
+    cache = MappingCache(path=path)
+    cache.TOUCH_BATCH = 3
+    for key in "abc":
+        cache.put(key, "1")
+    reader = MappingCache(path=path)
+    written = lambda: reader._conn.execute("SELECT MAX(last_access) FROM mapping_cache").fetchone()[0]
+    before = written()
+
+    time.sleep(0.01)
+    cache.get("a")
+    cache.get("b")
+    assert written() == before  # Buffered, nothing written yet
+    cache.get("c")
+    assert written() > before
+
+
+def test_bypass_skips_reads(tmp_path):
+    cache = MappingCache(path=str(tmp_path / "c.sqlite"), bypass=True)
+    cache.put("a", "1")
+    assert cache.get("a") is None
+    assert MappingCache(path=str(tmp_path / "c.sqlite")).get("a") == "1"
+
+
+def test_mapper_serves_repeat_tables_from_cache(tmp_path, mini_store):
+    cache = MappingCache(path=str(tmp_path / "c.sqlite"))
+    mapper = SemanticMapper(vector_store=mini_store, llm=LLMClient(),
+                            bypass_policy=BypassPolicy(enabled=False), cache=cache)
+
+    first = mapper.map_table(_user_table())
+    again = mapper.map_table(_user_table())
+    assert mapper.stats["llm_calls"] == 1
+    assert mapper.stats["cache_hits"] == 1
+    assert again == first
+
+    # A fresh mapper (new process) still hits the persistent cache
+    other = SemanticMapper(vector_store=mini_store, llm=LLMClient(),
+                           bypass_policy=BypassPolicy(enabled=False),
+                           cache=MappingCache(path=str(tmp_path / "c.sqlite")))
+    other.map_table(_user_table())
+    assert other.stats["llm_calls"] == 0
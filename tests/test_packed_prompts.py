@@ -0,0 +1,73 @@
+import json
+
+from ontologymirror.core.domain import RawTable, RawColumn
+from ontologymirror.core.llm_client import LLMClient
+from ontologymirror.core.mock_llm import LogicBasedMockLLM
+from ontologymirror.core.tokens import count_tokens
+from ontologymirror.mappers.bypass_policy import BypassPolicy
+from ontologymirror.mappers.semantic_mapper import SemanticMapper
+
+NO_BYPASS = BypassPolicy(enabled=False)
+
+
+def _tables():
+    return [
+        RawTable(name="blog_post", source_file="a.sql", columns=[
+            RawColumn(name="title", original_type="TEXT"), RawColumn(name="content", original_type="TEXT")]),
+        RawTable(name="auth_user", source_file="a.sql", columns=[
+            RawColumn(name="username", original_type="TEXT"), RawColumn(name="email", original_type="TEXT")]),
+        RawTable(name="widgets", source_file="a.sql", columns=[
+            RawColumn(name="blob", original_type="BLOB")]),
+    ]
+
+
+class DroppingLLM:
+    """Answers packed prompts via the mock but drops the given table from the answer."""
+    model_name = "stub"
+
+    def __init__(self, drop):
+        self.drop = drop
+        self.prompts = []
+        self.mock = LogicBasedMockLLM()
+
+    def generate(self, system_prompt, user_prompt):
+        self.prompts.append(user_prompt)
+        from langchain_core.messages import HumanMessage
+        text = self.mock.invoke([HumanMessage(content=user_prompt)]).content
+        data = json.loads(text)
+        if "tables" in data:
+            data["tables"] = [t for t in data["tables"] if t["table_name"] != self.drop]
+        return json.dumps(data)
+
+
+def test_packed_mapping_uses_one_call(mini_store):
+    mapper = SemanticMapper(vector_store=mini_store, llm=LLMClient(), bypass_policy=NO_BYPASS)
+    results = mapper.map_tables_packed(_tables(), token_budget=100_000)
+
+    assert [r.original_table for r in results] == ["blog_post", "auth_user", "widgets"]
+    assert results[0].schema_class == "BlogPosting"
+    assert results[1].schema_class == "Person"
+    assert mapper.stats["llm_calls"] == 1
+
+
+def test_pack_contexts_respects_budget(mini_store):
+    mapper = SemanticMapper(vector_store=mini_store, llm=LLMClient(), bypass_policy=NO_BYPASS)
+    contexts = [mapper.prepare(t) for t in _tables()]
+    overhead = count_tokens(mapper.PACKED_SYSTEM_PROMPT + mapper.PACKED_INSTRUCTIONS)
+    budget = overhead + max(count_tokens(json.dumps(mapper._packed_table_section(c), indent=1)) for c in contexts)
+
+    packs = mapper.pack_contexts(contexts, budget)
+    assert len(packs) == 3
+    assert len(mapper.pack_contexts(contexts, 100_000)) == 1
+
+
+def test_only_unparsed_tables_are_retried(mini_store):
+    llm = DroppingLLM(drop="auth_user")
+    mapper = SemanticMapper(vector_store=mini_store, llm=llm, bypass_policy=NO_BYPASS)
+    results = mapper.map_tables_packed(_tables(), token_budget=100_000)
+
+    assert results[1].original_table == "auth_user"
+    assert results[1].schema_class == "Person"
+    assert len(llm.prompts) == 2
+    # The retry is a single-table prompt for the missing table only
+    assert "auth_user" in llm.prompts[1] and "blog_post" not in llm.prompts[1]
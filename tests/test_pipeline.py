@@ -0,0 +1,112 @@
+import itertools
+import math
+import os
+import shutil
+import threading
+import time
+
+from git import Repo
+
+from ontologymirror.config.settings import settings
+from ontologymirror.core.llm_client import LLMClient
+from ontologymirror.extractors.git_loader import GitLoader
+from ontologymirror.mappers.bypass_policy import BypassPolicy
+from ontologymirror.mappers.semantic_mapper import SemanticMapper
+from ontologymirror.pipeline import Pipeline, Stage, build_repo_pipeline
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+def _sleeper(seconds):
+    def fn(item):
+        time.sleep(seconds)
+        return item
+    return fn
+
+
+def test_throughput_is_bound_by_slowest_stage():
+    stages = [Stage(name, _sleeper(0.05)) for name in ("a", "b", "c")]
+    start = time.monotonic()
+    out = list(Pipeline(stages, queue_size=4).run(range(12)))
+    elapsed = time.monotonic() - start
+
+    assert out == list(range(12))
+    # Sequential would be 12 * 3 * 0.05 = 1.8s; pipelined ~ (12 + 2) * 0.05
+    assert elapsed < 1.2
+
+
+def test_bounded_queues_apply_backpressure():
+    produced, consumed, lead = [0], [0], [0]
+    lock = threading.Lock()
+
+    def produce(item):
+        with lock:
+            produced[0] += 1
+            lead[0] = max(lead[0], produced[0] - consumed[0])
+        return item
+
+    def consume(item):
+        time.sleep(0.01)
+        with lock:
+            consumed[0] += 1
+        return item
+
+    out = list(Pipeline([Stage("fast", produce), Stage("slow", consume)], queue_size=2).run(range(40)))
+    assert len(out) == 40
+    # At most: slow stage's queue + the item it holds + the one fast is blocked on
+    assert lead[0] <= 2 + 1 + 1
+
+
+def test_failing_items_are_recorded_and_skipped():
+    def fragile(item):
+        if item == 3:
+            raise ValueError("bad item")
+        return item
+
+    pipeline = Pipeline([Stage("fragile", fragile, workers=2)])
+    assert sorted(pipeline.run(range(6))) == [0, 1, 2, 4, 5]
+    assert pipeline.stats["fragile"]["errors"] == 1
+    assert pipeline.errors[0][:2] == ("fragile", 3)
+
+
+def test_closing_the_iterator_cancels_the_pipeline():
+    pipeline = Pipeline([Stage("a", _sleeper(0.01), workers=2), Stage("b", _sleeper(0.01))], queue_size=2)
+    results = pipeline.run(itertools.count())
+    assert len({next(results) for _ in range(3)}) == 3
+    start = time.monotonic()
+    results.close()
+
+    assert pipeline.cancelled
+    assert time.monotonic() - start < 2
+    assert not [t for t in threading.enumerate() if t.name.startswith("pipeline-")]
+
+
+def test_process_stage_and_fan_out():
+    stages = [
+        Stage("sqrt", math.sqrt, workers=2, kind="process"),
+        Stage("split", lambda x: [x, -x], fan_out=True),
+    ]
+    assert sorted(Pipeline(stages).run([1.0, 4.0, 9.0])) == [-3.0, -2.0, -1.0, 1.0, 2.0, 3.0]
+
+
+def test_repo_pipeline_end_to_end(tmp_path, monkeypatch, mini_store):
+    origin = tmp_path / "origin" / "shop"
+    origin.mkdir(parents=True)
+    shutil.copy(os.path.join(FIXTURES, "test_schema.sql"), origin / "schema.sql")
+    repo = Repo.init(origin)
+    repo.index.add(["schema.sql"])
+    commit = repo.index.commit("schema").hexsha
+
+    monkeypatch.setattr(settings, "REPOS_DIR", tmp_path / "clones")
+    monkeypatch.setattr(settings, "PIPELINE_EXTRACT_WORKERS", 1)
+    mapper = SemanticMapper(vector_store=mini_store, llm=LLMClient(), bypass_policy=BypassPolicy(enabled=False))
+    written = []
+    pipeline = build_repo_pipeline(mapper, written.append, git_loader=GitLoader())
+
+    results = list(pipeline.run([str(origin)]))
+
+    assert not pipeline.errors
+    assert sorted(r.table.name for r in results) == ["auth_user", "blog_post"]
+    assert {(r.table.repo, r.table.commit) for r in results} == {("shop", commit)}
+    assert len(written) == 2
+    assert mapper.stats["tables"] == 2
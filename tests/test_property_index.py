@@ -0,0 +1,119 @@
+from ontologymirror.core.domain import RawTable, RawColumn
+
+
+def test_properties_for_classes_include_inherited(mini_loader):
+    allowed = mini_loader.get_properties_for_classes(["BlogPosting"])
+    # Own, CreativeWork-level and Thing-level properties
+    assert {"articleBody", "headline", "dateCreated", "name"} <= allowed
+    assert "email" not in allowed
+
+
+def test_property_index_built(mini_store):
+    assert mini_store.property_db._collection.count() == 13
+
+
+def test_search_properties_batched_and_restricted(mini_store):
+    results = mini_store.search_properties(["email", "first name", "price"], k=3, class_labels=["Person"])
+    assert len(results) == 3
+    allowed = mini_store.loader.get_properties_for_classes(["Person"])
+    for hits in results:
+        assert 0 < len(hits) <= 3
+        for doc, score in hits:
+            assert doc.metadata["label"] in allowed
+            assert isinstance(score, float)
+
+
+def test_search_properties_exact_text_ranks_first(mini_store):
+    # DeterministicFakeEmbedding hashes text, so an identical document is the nearest hit.
+    doc_text = mini_store.property_db._collection.get(where={"label": "email"})["documents"][0]
+    [hits] = mini_store.search_properties([doc_text], k=1)
+    assert hits[0][0].metadata["label"] == "email"
+
+
+def test_mapper_retrieves_candidates_per_column(mini_store):
+    from ontologymirror.mappers.semantic_mapper import SemanticMapper
+
+    mapper = SemanticMapper(vector_store=mini_store)
+    tables = [
+        RawTable(name="users", source_file="a.sql",
+                 columns=[RawColumn(name="email", original_type="TEXT"),
+                          RawColumn(name="first_name", original_type="TEXT")]),
+        RawTable(name="posts", source_file="a.sql",
+                 columns=[RawColumn(name="title", original_type="TEXT")]),
+    ]
+    per_table = mapper.retrieve_property_candidates(tables, ["Person", "BlogPosting"])
+    assert list(per_table[0]) == ["email", "first_name"]
+    assert list(per_table[1]) == ["title"]
+    assert all(per_table[0]["email"])
+
+
+def test_concurrent_prepare_sees_complete_class_hierarchy(mini_store, monkeypatch):
+    import threading
+    import time
+    from ontologymirror.mappers.schema_loader import SchemaOrgLoader
+    from ontologymirror.mappers.semantic_mapper import SemanticMapper
+
+    loader = mini_store.loader
+    loader.clear_caches()
+    # Slow the hierarchy build down so the threads overlap inside it
+    node_refs = loader.node_refs
+    monkeypatch.setattr(loader, "node_refs", lambda value: (time.sleep(0.005), node_refs(value))[1])
+
+    mapper = SemanticMapper(vector_store=mini_store)
+    tables = [RawTable(name=name, source_file="a.sql", columns=[RawColumn(name="title", original_type="TEXT")])
+              for name in ("blog_posts", "users", "products", "articles")] * 2
+    barrier = threading.Barrier(len(tables))
+
+    def worker(table):
+        barrier.wait()
+        mapper.prepare(table)
+
+    threads = [threading.Thread(target=worker, args=(t,)) for t in tables]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    # Every memoized set must match a single-threaded computation
+    reference = SchemaOrgLoader()
+    reference.graph = loader.graph
+    assert loader._properties_for
+    for key, allowed in loader._properties_for.items():
+        assert allowed == reference.get_properties_for_classes(key), sorted(key)
+
+
+def test_batch_paths_share_one_property_search(mini_store, monkeypatch):
+    import asyncio
+    from ontologymirror.core.llm_client import LLMClient
+    from ontologymirror.mappers.bypass_policy import BypassPolicy
+    from ontologymirror.mappers.semantic_mapper import SemanticMapper
+
+    mapper = SemanticMapper(vector_store=mini_store, llm=LLMClient(), bypass_policy=BypassPolicy(enabled=False))
+    tables = [
+        RawTable(name="blog_posts", source_file="a.sql", columns=[RawColumn(name="title", original_type="TEXT")]),
+        RawTable(name="products", source_file="a.sql", columns=[RawColumn(name="cost", original_type="DECIMAL")]),
+        RawTable(name="users", source_file="a.sql", columns=[RawColumn(name="nickname", original_type="TEXT")]),
+    ]
+    calls = []
+    search = mini_store.search_properties
+    monkeypatch.setattr(mini_store, "search_properties", lambda *a, **kw: (calls.append(a[0]), search(*a, **kw))[1])
+
+    contexts = mapper.prepare_many(tables)
+    assert len(calls) == 1 and len(calls[0]) == 3
+    for ctx in contexts:
+        allowed = mini_store.loader.get_properties_for_classes([c["class"] for c in ctx.candidates])
+        [hits] = ctx.column_candidates.values()
+        assert 0 < len(hits) <= mapper.PROPERTY_CANDIDATES_PER_COLUMN
+        assert all(h["property"] in allowed for h in hits)
+
+    calls.clear()
+    mapper.map_tables_packed(tables)
+    assert len(calls) == 1
+
+    calls.clear()
+
+    async def collect():
+        return [r async for r in mapper.map_tables(tables)]
+
+    assert len(asyncio.run(collect())) == 3
+    assert len(calls) == 1
@@ -0,0 +1,77 @@
+from ontologymirror.core.domain import RawTable, RawColumn
+from ontologymirror.mappers.bulk_runner import BulkMappingRunner
+from ontologymirror.mappers.results_store import ResultsStore
+from ontologymirror.mappers.semantic_mapper import MappedTable, MappedColumn
+from ontologymirror.pipeline import TableResult
+
+
+def _result(repo, name, schema_class, mapping, commit="c1"):
+    table = RawTable(name=name, source_file="schema.sql", repo=repo, commit=commit,
+                     columns=[RawColumn(name=c, original_type="TEXT") for c in [*mapping, "extra"]])
+    mapped = MappedTable(original_table=name, schema_class=schema_class, rationale="", columns=[
+        MappedColumn(original_name=c, schema_property=p, confidence=0.9, reason="") for c, p in mapping.items()
+    ])
+    return TableResult(table=table, result=mapped)
+
+
+def test_queries_across_repos(tmp_path):
+    store = ResultsStore(str(tmp_path / "results.sqlite"), batch_size=2)
+    count = store.add_results([
+        _result("shop", "auth_user", "Person", {"email": "email"}),
+        _result("blog", "members", "Person", {"mail": "email", "fname": "givenName"}),
+        _result("blog", "posts", "BlogPosting", {"title": "headline"}),
+    ])
+
+    assert count == 3
+    assert store.repos_for_class("Person") == ["blog", "shop"]
+    assert [(c["repo"], c["original_name"]) for c in store.columns_for_property("email")] == [
+        ("blog", "mail"), ("shop", "email")]
+    assert [t["raw_table"] for t in store.tables(repo="blog")] == ["members", "posts"]
+    table_id = store.tables(raw_table="members")[0]["id"]
+    assert {c["original_name"]: c["schema_property"] for c in store.columns(table_id)} == {
+        "mail": "email", "fname": "givenName", "extra": None}
+    assert store.class_counts()[0] == {"schema_class": "Person", "tables": 2, "repos": 2}
+
+
+def test_re_adding_a_table_replaces_it(tmp_path):
+    store = ResultsStore(str(tmp_path / "results.sqlite"))
+    store.add_results([_result("shop", "users", "Thing", {"email": "email"})])
+    store.add_results([_result("shop", "users", "Person", {"email": "email"})])
+    store.add_results([_result("shop", "users", "Person", {}, commit="c2")])
+
+    assert store.stats() == {"tables": 2, "columns": 3, "repos": 1}
+    assert [t["schema_class"] for t in store.tables(commit="c1")] == ["Person"]
+
+
+def test_lookups_use_indexes(tmp_path, monkeypatch):
+    store = ResultsStore(str(tmp_path / "results.sqlite"))
+    store.add_results(
+        _result(f"repo{i % 100}", f"t{i}", "Person" if i % 10 == 0 else "Thing", {f"c{j}": f"p{j}" for j in range(10)})
+        for i in range(500)
+    )
+    queries = []
+    query = store._query
+    monkeypatch.setattr(store, "_query", lambda sql, params=(): queries.append((sql, params)) or query(sql, params))
+
+    assert len(store.repos_for_class("Person")) == 10
+    assert len(store.columns_for_property("p3", limit=100)) == 100
+    plans = [" ".join(row["detail"] for row in query("EXPLAIN QUERY PLAN " + sql, params)) for sql, params in queries]
+    assert "idx_tables_class" in plans[0]
+    assert "idx_columns_property" in plans[1]
+
+
+class FixedMapper:
+    def map_table(self, table):
+        return MappedTable(original_table=table.name, schema_class="Person", rationale="", columns=[
+            MappedColumn(original_name="email", schema_property="email", confidence=1.0, reason="")])
+
+
+def test_bulk_runner_writes_to_store(tmp_path):
+    store = ResultsStore(str(tmp_path / "results.sqlite"))
+    tables = [RawTable(name=f"t{i}", source_file="a.sql", repo="shop", commit="c1",
+                       columns=[RawColumn(name="email", original_type="TEXT")]) for i in range(5)]
+    with BulkMappingRunner(FixedMapper(), str(tmp_path / "out.jsonl"), fsync_every=2, results_store=store) as runner:
+        runner.run(tables, repo="shop")
+
+    assert len(store.columns_for_property("email")) == 5
+    assert store.repos_for_class("Person") == ["shop"]
@@ -0,0 +1,96 @@
+import json
+
+import pytest
+
+from ontologymirror.core.domain import RawTable, RawColumn
+from ontologymirror.core.json_stream import IncrementalMappingParser, StreamParseError
+from ontologymirror.core.llm_client import LLMClient
+from ontologymirror.mappers.bypass_policy import BypassPolicy
+from ontologymirror.mappers.semantic_mapper import SemanticMapper
+
+ANSWER = json.dumps({
+    "schema_class": "BlogPosting",
+    "rationale": 'has {braces} and "quotes"',
+    "mappings": [
+        {"original_name": "title", "schema_property": "headline", "reason": "a [b]"},
+        {"original_name": "content", "schema_property": "articleBody", "reason": "x"},
+    ],
+})
+
+
+def _feed_in_chunks(parser, text, size):
+    emitted = []
+    for i in range(0, len(text), size):
+        emitted.append((i, [m["original_name"] for m in parser.feed(text[i:i + size])]))
+    return emitted
+
+
+@pytest.mark.parametrize("size", [1, 3, 7, 1000])
+def test_items_are_emitted_as_soon_as_they_close(size):
+    parser = IncrementalMappingParser()
+    text = "```json\n" + ANSWER + "\n```"
+    emitted = _feed_in_chunks(parser, text, size)
+
+    names = [n for _, batch in emitted for n in batch]
+    assert names == ["title", "content"]
+    # "title" is reported before the stream reaches "content"
+    first_at = next(i for i, batch in emitted if "title" in batch)
+    assert first_at < text.index('"content"', text.index("mappings"))
+    assert parser.finish()["schema_class"] == "BlogPosting"
+
+
+@pytest.mark.parametrize("broken", [
+    '{"schema_class": "X", "mappings": [{"original_name": "a", "schema_property": "b"}}',  # mismatched
+    '{"schema_class": "X", "mappings": [{"original_name": "a"}]}',                         # missing key
+    '{"schema_class": "X"} trailing words',                                                 # garbage
+    '{"schema_class": X}',                                                                  # bare word
+])
+def test_structural_errors_abort_early(broken):
+    parser = IncrementalMappingParser()
+    with pytest.raises(StreamParseError):
+        for ch in broken:
+            parser.feed(ch)
+        parser.finish()
+
+
+def test_truncated_stream_fails_on_finish():
+    parser = IncrementalMappingParser()
+    parser.feed(ANSWER[:40])
+    with pytest.raises(StreamParseError):
+        parser.finish()
+
+
+class FlakyStreamLLM(LLMClient):
+    """First stream is garbage after a valid prefix; later streams come from the mock."""
+
+    def __init__(self):
+        super().__init__()
+        self.streams = 0
+        self.chunks_sent = 0
+
+    def stream(self, system_prompt, user_prompt):
+        self.streams += 1
+        if self.streams == 1:
+            for chunk in ['{"schema_class": "Person", "mappings": [', '}', ' more never sent']:
+                self.chunks_sent += 1
+                yield chunk
+            return
+        yield from super().stream(system_prompt, user_prompt)
+
+
+def test_mapper_streams_columns_and_retries_broken_streams(mini_store):
+    llm = FlakyStreamLLM()
+    mapper = SemanticMapper(vector_store=mini_store, llm=llm, bypass_policy=BypassPolicy(enabled=False))
+    table = RawTable(name="blog_post", source_file="a.sql", columns=[
+        RawColumn(name="id", original_type="INT", is_primary_key=True),
+        RawColumn(name="title", original_type="TEXT"),
+        RawColumn(name="content", original_type="TEXT"),
+    ])
+    seen = []
+    result = mapper.map_table_streaming(table, on_column=lambda c: seen.append((c.original_name, c.source)))
+
+    assert llm.chunks_sent == 2  # aborted right at the mismatched bracket
+    assert mapper.stats["stream_aborts"] == 1
+    assert seen == [("id", "lexicon:synonym"), ("title", "llm"), ("content", "llm")]
+    assert result.schema_class == "BlogPosting"
+    assert [c.original_name for c in result.columns] == ["id", "title", "content"]
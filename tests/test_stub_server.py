@@ -0,0 +1,89 @@
+import json
+import time
+import urllib.error
+import urllib.request
+
+import pytest
+
+from ontologymirror.core.llm_client import LLMClient
+from ontologymirror.core.stub_server import StubLLMServer, StubServerConfig
+
+USER_PROMPT = "INPUT TABLE:\n{\"table_name\": \"blog_post\", \"columns\": [\"title\"]}\nCANDIDATE CLASSES: ..."
+
+
+def _post(server, payload):
+    request = urllib.request.Request(
+        server.base_url + "/chat/completions",
+        data=json.dumps(payload).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+    )
+    return urllib.request.urlopen(request, timeout=5)
+
+
+def _chat(stream=False):
+    return {"model": "stub-gpt", "stream": stream,
+            "messages": [{"role": "system", "content": "map"}, {"role": "user", "content": USER_PROMPT}]}
+
+
+@pytest.fixture
+def openai_client(monkeypatch):
+    def make(server):
+        monkeypatch.setenv("OPENAI_API_KEY", "stub")
+        monkeypatch.setenv("OPENAI_MODEL", "stub-gpt")
+        monkeypatch.setenv("OPENAI_BASE_URL", server.base_url)
+        client = LLMClient(provider="openai")
+        client.model.max_retries = 0
+        return client
+    return make
+
+
+def test_llm_client_talks_to_stub(openai_client):
+    with StubLLMServer() as server:
+        client = openai_client(server)
+        answer = json.loads(client.generate("map", USER_PROMPT))
+        streamed = "".join(client.stream("map", USER_PROMPT))
+
+    assert answer["schema_class"] == "BlogPosting"
+    assert json.loads(streamed) == answer
+    assert server.stats["streams"] == 1
+
+
+def test_latency_is_injected():
+    with StubLLMServer(StubServerConfig(latency_ms=150)) as server:
+        start = time.monotonic()
+        _post(server, _chat()).read()
+        assert time.monotonic() - start >= 0.15
+
+
+def test_rate_limit_returns_429_with_retry_after():
+    with StubLLMServer(StubServerConfig(requests_per_minute=2)) as server:
+        _post(server, _chat()).read()
+        _post(server, _chat()).read()
+        with pytest.raises(urllib.error.HTTPError) as exc:
+            _post(server, _chat())
+    assert exc.value.code == 429
+    assert float(exc.value.headers["Retry-After"]) > 0
+    assert server.stats["rate_limited"] == 1
+
+
+def test_fault_injection_is_seeded():
+    def run(seed):
+        config = StubServerConfig(error_rate=0.3, malformed_rate=0.3, seed=seed)
+        outcomes = []
+        with StubLLMServer(config) as server:
+            for _ in range(20):
+                try:
+                    content = json.loads(_post(server, _chat()).read())["choices"][0]["message"]["content"]
+                    try:
+                        json.loads(content)
+                        outcomes.append("ok")
+                    except json.JSONDecodeError:
+                        outcomes.append("malformed")
+                except urllib.error.HTTPError as e:
+                    assert e.code in (500, 502, 503)
+                    outcomes.append("5xx")
+        return outcomes
+
+    first = run(seed=7)
+    assert first == run(seed=7)
+    assert {"ok", "malformed", "5xx"} <= set(first)
@@ -0,0 +1,160 @@
+import json
+import os
+import threading
+import time
+
+import pytest
+
+from ontologymirror.core.domain import RawTable, RawColumn
+from ontologymirror.core.llm_client import LLMClient
+from ontologymirror.core import telemetry as telemetry_module
+from ontologymirror.core.telemetry import SamplingProfiler, Telemetry, run_collected
+from ontologymirror.extractors.sql_parser import SqlExtractor
+from ontologymirror.mappers.bypass_policy import BypassPolicy
+from ontologymirror.mappers.semantic_mapper import SemanticMapper
+from ontologymirror.pipeline import Pipeline, RepoSource, Stage, extract_repo
+
+
+@pytest.fixture
+def traced(monkeypatch):
+    """Swaps in an enabled process-wide Telemetry for the instrumented modules."""
+    instance = Telemetry(enabled=True)
+    for module in ("ontologymirror.core.telemetry", "ontologymirror.core.llm_client",
+                   "ontologymirror.core.vector_store", "ontologymirror.extractors.sql_parser",
+                   "ontologymirror.mappers.semantic_mapper", "ontologymirror.pipeline"):
+        monkeypatch.setattr(f"{module}.telemetry", instance)
+    return instance
+
+
+def test_disabled_telemetry_records_nothing_and_is_cheap():
+    t = Telemetry(enabled=False)
+    assert t.span("a") is t.span("b")  # One shared no-op object
+
+    start = time.perf_counter()
+    for _ in range(100_000):
+        with t.span("parse_file", file="x.sql"):
+            t.count("tables_extracted", 3)
+    assert time.perf_counter() - start < 0.5
+    assert t.spans == [] and t.counters == {} and t.histograms == {}
+
+
+def test_spans_counters_and_exports(tmp_path):
+    t = Telemetry(enabled=True, max_spans=2)
+    with t.span("llm_call", provider="mock") as span:
+        span.set(tokens=12)
+    with pytest.raises(ValueError):
+        with t.span("json_parse"):
+            raise ValueError("bad json")
+    with t.span("llm_call", provider="mock"):
+        pass
+    t.count("llm_tokens_in", 100, provider="mock")
+    t.count("llm_tokens_in", 50, provider="gemini")
+    t.observe("batch_size", 0.3)
+
+    assert t.counter_value("llm_tokens_in") == 150
+    assert t.counter_value("llm_tokens_in", provider="mock") == 100
+    assert t.dropped_spans == 1
+
+    t.write_trace(str(tmp_path / "trace.json"))
+    trace = json.loads((tmp_path / "trace.json").read_text())
+    events = trace["traceEvents"]
+    assert [e["name"] for e in events] == ["llm_call", "json_parse"]
+    assert events[0]["ph"] == "X" and events[0]["args"] == {"provider": "mock", "tokens": 12}
+    assert events[1]["args"]["error"] == "ValueError"
+    assert trace["otherData"]["dropped_spans"] == 1
+
+    t.write_prometheus(str(tmp_path / "metrics.prom"))
+    text = (tmp_path / "metrics.prom").read_text()
+    assert 'ontologymirror_llm_tokens_in_total{provider="mock"} 100' in text
+    assert "# TYPE ontologymirror_span_seconds histogram" in text
+    # All three spans are in the histogram, even the one dropped from the trace
+    assert 'ontologymirror_span_seconds_count{span="llm_call"} 2' in text
+    assert 'ontologymirror_span_seconds_bucket{span="json_parse",le="+Inf"} 1' in text
+    assert 'ontologymirror_batch_size_bucket{le="0.25"} 0' in text
+    assert 'ontologymirror_batch_size_bucket{le="0.5"} 1' in text
+
+
+def test_sampling_profiler_sees_busy_thread(tmp_path):
+    def busy_loop(stop):
+        while not stop.is_set():
+            sum(i * i for i in range(1000))
+
+    stop = threading.Event()
+    worker = threading.Thread(target=busy_loop, args=(stop,), name="busy")
+    profiler = SamplingProfiler(interval=0.002).start()
+    worker.start()
+    time.sleep(0.2)
+    profiler.stop()
+    stop.set()
+    worker.join()
+
+    assert any(stack.startswith("busy;") and "busy_loop" in stack for stack in profiler.samples)
+    profiler.write_folded(str(tmp_path / "profile.folded"))
+    line = (tmp_path / "profile.folded").read_text().splitlines()[0]
+    assert line.rsplit(" ", 1)[1].isdigit()
+
+
+def test_pipeline_components_are_instrumented(traced, mini_store):
+    tables = SqlExtractor().extract(os.path.join(os.path.dirname(__file__), "fixtures"))
+    mapper = SemanticMapper(vector_store=mini_store, llm=LLMClient(provider="mock"),
+                            bypass_policy=BypassPolicy(enabled=False))
+    mapper.map_table(RawTable(name="users", source_file="schema.sql", columns=[
+        RawColumn(name="id", original_type="INT"), RawColumn(name="mail_addr", original_type="TEXT")]))
+
+    names = {event["name"] for event in traced.trace()["traceEvents"]}
+    assert {"parse_file", "map_table", "retrieve", "vector_search", "llm_call", "json_parse"} <= names
+    assert traced.counter_value("tables_extracted") == len(tables)
+    assert traced.counter_value("mapper_tables") == 1
+    assert traced.counter_value("llm_tokens_in", provider="mock") > 0
+    assert traced.counter_value("llm_tokens_out") > 0
+
+
+def test_process_stage_telemetry_is_merged_into_parent(traced):
+    fixtures = os.path.join(os.path.dirname(__file__), "fixtures")
+    pipeline = Pipeline([Stage("extract", extract_repo, 2, kind="process", fan_out=True)])
+    tables = list(pipeline.run([RepoSource(url=fixtures, repo="fixtures", path=fixtures)]))
+
+    assert tables and traced.counter_value("tables_extracted") == len(tables)
+    assert traced.counter_value("files_parsed") > 0
+    events = traced.trace()["traceEvents"]
+    parse_spans = [e for e in events if e["name"] == "parse_file"]
+    [stage_span] = [e for e in events if e["name"] == "stage.extract"]
+    assert parse_spans and all(e["pid"] != os.getpid() for e in parse_spans)
+    # Worker spans land inside the parent's stage span on the shared timeline
+    for e in parse_spans:
+        assert stage_span["ts"] - 1000 <= e["ts"] <= stage_span["ts"] + stage_span["dur"] + 1000
+
+
+def test_collect_and_merge_roundtrip():
+    worker, parent = Telemetry(enabled=True), Telemetry(enabled=True)
+    with worker.span("parse_file"):
+        worker.count("files_parsed")
+    worker.observe("batch_size", 0.3)
+    parent.count("files_parsed", 2)
+
+    parent.merge(worker.collect())
+    assert worker.spans == [] and worker.counters == {}
+    assert parent.counter_value("files_parsed") == 3
+    assert parent.histograms["batch_size"][()].count == 1
+    assert [e["name"] for e in parent.trace()["traceEvents"]] == ["parse_file"]
+
+
+def test_failed_call_hands_over_its_partial_telemetry(traced):
+    import pickle
+
+    def fail():
+        with telemetry_module.telemetry.span("parse_file"):
+            telemetry_module.telemetry.count("files_parsed")
+        raise ValueError("broken file")
+
+    with pytest.raises(ValueError) as exc:
+        run_collected(True, fail)
+
+    # Nothing is left behind for the worker's next task...
+    assert traced.spans == [] and traced.counters == {}
+    # ...and what was recorded travels with the error, pickling included
+    error = pickle.loads(pickle.dumps(exc.value))
+    parent = Telemetry(enabled=True)
+    parent.merge(error.telemetry)
+    assert parent.counter_value("files_parsed") == 1
+    assert [e["name"] for e in parent.trace()["traceEvents"]] == ["parse_file"]